@@ -6,12 +6,471 @@ L'adresse est positionnée pour être visible à travers une fenêtre d'envelopp
 
 import sys
 import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
+import reportlab
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
 from reportlab.lib.pagesizes import A4
-from PyPDF2 import PdfReader, PdfWriter
-from io import BytesIO
+from reportlab.lib.rl_accel import escapePDF, fp_str
+from reportlab.pdfbase import pdfmetrics
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, EncodedStreamObject, FloatObject, IndirectObject, NameObject,
+    StreamObject
+)
+from incremental_pdf import IncrementalPdfWriter
+from metrics import GenerationMetrics
+from run_manifest import RunManifest, run_hash
+from text_layout import layout_text, measure_line
+from verso_cache import VersoCache, verso_cache_from_env
+from io import BytesIO, TextIOWrapper
+
+# Nombre de pages verso rendues dans un même canvas avant relecture
+VERSO_BATCH_SIZE = 500
+
+# Nombre d'entrées par tâche en mode parallèle (workers > 1)
+PARALLEL_CHUNK_SIZE = 64
+
+# Taille visée (octets) des morceaux de CSV lus en parallèle (workers > 1): les fichiers plus
+# gros sont découpés entre deux enregistrements, et plusieurs fichiers sont lus en même temps
+CSV_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Taille des blocs lus pour chercher les limites d'enregistrements d'un CSV
+CSV_SCAN_BLOCK_BYTES = 1024 * 1024
+
+# Nombre maximal de templates PDF analysés gardés en mémoire
+TEMPLATE_CACHE_SIZE = 8
+
+# Taille cumulée maximale (en octets de PDF source) des templates gardés en mémoire
+TEMPLATE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Estimation de la taille d'un dictionnaire de page dans le PDF écrit (découpage du PDF
+# unique par taille, voir parse_shard_size), en plus des flux de contenu
+SHARD_PAGE_OVERHEAD_BYTES = 200
+
+# Nombre maximal d'entrées distinctes mémorisées pour la déduplication des versos
+DEDUP_MAX_ENTRIES = 100000
+
+# Police du nom et de l'adresse sur les pages verso
+VERSO_FONT_NAME = "Helvetica"
+VERSO_FONT_SIZE = 10
+VERSO_LINE_HEIGHT_MM = 4
+
+# Nombre maximal de lignes de texte dont le découpage est mémorisé par zone lors d'une validation
+LAYOUT_LINE_CACHE_SIZE = 100000
+
+# Nombre maximal d'entrées détaillées (boîtes des lignes) dans un rapport de validation
+VALIDATION_MAX_ENTRIES = 1000
+
+# Nombre maximal de numéros de lignes listés dans overflowRows (les suivants ne sont que comptés)
+VALIDATION_MAX_OVERFLOW_ROWS = 1000
+
+# Zones par défaut du nom et de l'adresse sur le verso (mm): gauche, bas, largeur, hauteur
+NAME_ZONE_DEFAULTS = (20, 250, 80, 30)
+ADDRESS_ZONE_DEFAULTS = (95, 20, 100, 40)
+
+# Version du rendu des versos, à incrémenter quand le dessin change:
+# les versos déjà présents dans le cache disque (verso_cache.py) sont alors ignorés
+VERSO_RENDERER_VERSION = 1
+
+# Rendu des versos: 'reportlab' (un canvas par lot, relu avec PdfReader) ou 'direct'
+# (flux de contenu écrit sans ReportLab, voir render_verso_content)
+VERSO_BACKENDS = ('reportlab', 'direct')
+DEFAULT_VERSO_BACKEND = os.environ.get('VERSO_BACKEND', 'reportlab')
+
+# Contenu d'une page en mode overlay: la page du template, puis le nom et l'adresse par-dessus
+OVERLAY_PAGE_CONTENTS = b"q /Template Do Q\nq /Overlay Do Q"
+
+# Zone d'un texte du verso, en points: bornes gauche et droite des lignes (alignées à droite),
+# bas de la zone (ligne de base de la première ligne), largeur maximale d'une ligne et hauteur
+VersoZone = namedtuple('VersoZone', ['left', 'right', 'bottom', 'width', 'height'])
+
+# Taille maximale d'un morceau du PDF unique: nombre d'entrées et/ou octets (None: pas de limite)
+ShardSize = namedtuple('ShardSize', ['entries', 'bytes'])
+
+# Template PDF analysé: reader, pages, dimensions de la première page (en points)
+# et pages converties en Form XObjects pour le mode overlay (TemplateForms)
+ParsedTemplate = namedtuple('ParsedTemplate', ['digest', 'reader', 'pages', 'page_width', 'page_height', 'forms'])
+
+
+def _resolve_all_objects(root):
+    """
+    Résout récursivement tous les objets indirects atteignables depuis root.
+    
+    Une fois résolus, les objets sont servis depuis le cache du reader: la page peut
+    ensuite être copiée depuis plusieurs threads sans relire le flux du PDF.
+    """
+    seen = set()
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            if key in seen:
+                continue
+            seen.add(key)
+            obj = obj.get_object()
+        if isinstance(obj, DictionaryObject):
+            stack.extend(value for key, value in obj.items() if key != '/Parent')
+        elif isinstance(obj, ArrayObject):
+            stack.extend(obj)
+
+
+def page_form(page):
+    """
+    Crée une Form XObject (objet direct) qui dessine le contenu d'une page avec ses
+    ressources, pour le superposer à une autre page (voir add_overlay_page).
+    Un flux de contenu unique est repris tel quel, sans décodage.
+    """
+    form = EncodedStreamObject()
+    contents = page.raw_get('/Contents').get_object() if '/Contents' in page else None
+    if isinstance(contents, StreamObject):
+        form._data = contents._data
+        for key in ('/Filter', '/DecodeParms'):
+            if key in contents:
+                form[NameObject(key)] = contents.raw_get(key)
+    elif isinstance(contents, ArrayObject):
+        form._data = zlib.compress(b'\n'.join(part.get_object().get_data() for part in contents))
+        form[NameObject('/Filter')] = NameObject('/FlateDecode')
+    else:
+        form._data = b''
+    
+    form[NameObject('/Type')] = NameObject('/XObject')
+    form[NameObject('/Subtype')] = NameObject('/Form')
+    form[NameObject('/BBox')] = ArrayObject(FloatObject(value) for value in page.mediabox)
+    if '/Resources' in page:
+        form[NameObject('/Resources')] = page.raw_get('/Resources')
+    return form
+
+
+class TemplateForms:
+    """
+    Pages d'un template converties en Form XObjects pour le mode overlay, créées à la
+    première demande et gardées avec le template analysé.
+    
+    Les Form XObjects sont des objets indirects d'un conteneur propre au template
+    (un PdfWriter jamais écrit): comme les objets d'un reader, PyPDF2 ne les copie
+    qu'une fois dans chaque PdfWriter, quel que soit le nombre de pages qui les
+    dessinent. Le conteneur vit aussi longtemps que le template: son adresse n'est
+    pas réutilisée (voir forget_imported_objects).
+    """
+    
+    def __init__(self, pages):
+        self._pages = pages
+        self._container = PdfWriter()
+        self._forms = {}
+        self._lock = threading.Lock()
+        contents = DecodedStreamObject()
+        contents.set_data(OVERLAY_PAGE_CONTENTS)
+        self.contents = self._container._add_object(contents)
+    
+    def form(self, page_index):
+        """Référence de la Form XObject de la page page_index du template."""
+        with self._lock:
+            reference = self._forms.get(page_index)
+            if reference is None:
+                reference = self._container._add_object(page_form(self._pages[page_index]))
+                self._forms[page_index] = reference
+            return reference
+
+
+class TemplateCache:
+    """
+    Cache LRU des templates PDF analysés, indexé par le hash SHA-256 de leur contenu.
+    
+    Un même template uploadé sous plusieurs chemins n'est analysé qu'une fois.
+    Le hash d'un chemin n'est recalculé que si sa date de modification ou sa taille change.
+    Le cache est borné en nombre de templates et en taille cumulée des PDF sources;
+    les templates épinglés (pin=True, ex: template par défaut) ne sont jamais évincés.
+    """
+    
+    def __init__(self, max_entries=TEMPLATE_CACHE_SIZE, max_bytes=TEMPLATE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._sizes = {}
+        self._pinned = set()
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, pdf_path, pin=False):
+        """
+        Retourne le ParsedTemplate de pdf_path, en l'analysant si nécessaire.
+        Si pin est vrai, le template reste en mémoire quelle que soit l'éviction.
+        """
+        pdf_path = Path(pdf_path)
+        stat = pdf_path.stat()
+        stat_key = (str(pdf_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            digest = self._digests.get(stat_key)
+            if digest is not None and digest in self._templates:
+                self._templates.move_to_end(digest)
+                if pin:
+                    self._pinned.add(digest)
+                self.hits += 1
+                return self._templates[digest]
+        
+        data = pdf_path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        
+        with self._lock:
+            self._remember_digest(stat_key, digest)
+            template = self._templates.get(digest)
+            if template is not None:
+                self._templates.move_to_end(digest)
+                if pin:
+                    self._pinned.add(digest)
+                self.hits += 1
+                return template
+            self.misses += 1
+        
+        template = self._parse(digest, data)
+        
+        with self._lock:
+            self._templates[digest] = template
+            self._templates.move_to_end(digest)
+            self._sizes[digest] = len(data)
+            if pin:
+                self._pinned.add(digest)
+            self._evict()
+        return template
+    
+    def clear(self):
+        """Vide le cache (y compris les templates épinglés)."""
+        with self._lock:
+            self._templates.clear()
+            self._sizes.clear()
+            self._pinned.clear()
+            self._digests.clear()
+    
+    def stats(self):
+        """Statistiques du cache (pour le diagnostic)."""
+        with self._lock:
+            return {
+                'entries': len(self._templates),
+                'max_entries': self.max_entries,
+                'bytes': sum(self._sizes.values()),
+                'max_bytes': self.max_bytes,
+                'pinned': len(self._pinned),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+    
+    def _evict(self):
+        # Évince les templates non épinglés les moins récemment utilisés; le dernier
+        # template ajouté reste toujours en mémoire, même s'il dépasse max_bytes à lui seul
+        total_bytes = sum(self._sizes.values())
+        newest = next(reversed(self._templates))
+        for digest in list(self._templates):
+            if len(self._templates) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            if digest in self._pinned or digest == newest:
+                continue
+            del self._templates[digest]
+            total_bytes -= self._sizes.pop(digest)
+    
+    def _remember_digest(self, stat_key, digest):
+        self._digests[stat_key] = digest
+        self._digests.move_to_end(stat_key)
+        # Les chemins sont plus nombreux que les contenus (uploads temporaires)
+        while len(self._digests) > self.max_entries * 16:
+            self._digests.popitem(last=False)
+    
+    @staticmethod
+    def _parse(digest, data):
+        reader = PdfReader(BytesIO(data))
+        pages = list(reader.pages)
+        if not pages:
+            raise ValueError("Le PDF template ne contient aucune page")
+        for page in pages:
+            _resolve_all_objects(page)
+        first_page = pages[0]
+        return ParsedTemplate(
+            digest=digest,
+            reader=reader,
+            pages=pages,
+            page_width=float(first_page.mediabox.width),
+            page_height=float(first_page.mediabox.height),
+            forms=TemplateForms(pages),
+        )
+
+
+TEMPLATE_CACHE = TemplateCache()
+
+
+def load_template(pdf_path, pin=False):
+    """
+    Charge un template PDF via le cache partagé TEMPLATE_CACHE.
+    
+    Args:
+        pdf_path: Chemin vers le PDF template
+        pin: Si True, le template n'est jamais évincé du cache
+    
+    Returns:
+        ParsedTemplate (digest, reader, pages, page_width, page_height, forms)
+    """
+    return TEMPLATE_CACHE.get(pdf_path, pin)
+
+
+class TemplateStore:
+    """
+    Templates PDF enregistrés une fois pour toutes dans un dossier, chacun identifié
+    par le hash SHA-256 de son contenu (le même digest que TemplateCache).
+    
+    Un template enregistré est analysé et gardé en mémoire par TEMPLATE_CACHE:
+    les générations qui le référencent par son identifiant n'ont ni upload, ni copie,
+    ni analyse à refaire.
+    """
+    
+    def __init__(self, directory):
+        self.directory = Path(directory)
+    
+    def add(self, data):
+        """
+        Enregistre un template PDF (sans effet s'il est déjà enregistré).
+        
+        Args:
+            data: Contenu du PDF (bytes)
+        
+        Returns:
+            Tuple (template_id, ParsedTemplate)
+        
+        Raises:
+            ValueError: Si le contenu n'est pas un PDF utilisable
+        """
+        template_id = hashlib.sha256(data).hexdigest()
+        path = self.directory / f"{template_id}.pdf"
+        
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Écriture atomique: un autre thread ne voit jamais de fichier partiel
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        
+        try:
+            template = load_template(path)
+        except Exception as e:
+            path.unlink(missing_ok=True)
+            raise ValueError(f"PDF template invalide: {e}")
+        return template_id, template
+    
+    def path(self, template_id):
+        """Chemin du template template_id, ou None s'il n'est pas enregistré."""
+        if not re.fullmatch(r'[0-9a-f]{64}', template_id or ''):
+            return None
+        path = self.directory / f"{template_id}.pdf"
+        return path if path.exists() else None
+
+def _position_key(position):
+    return tuple(sorted(position.items())) if position else None
+
+def entry_key(name, address, name_position=None, address_position=None):
+    """
+    Clé de déduplication d'une entrée: nom et adresse normalisés et positions des zones.
+    Deux entrées de même clé ont exactement le même verso.
+    """
+    return (name, address, _position_key(name_position), _position_key(address_position))
+
+def verso_cache_key(name, address, name_position, address_position, page_width, page_height):
+    """
+    Clé du cache disque des versos: hash de tout ce qui détermine le contenu du verso
+    (entrée, positions, format de page, police et version du rendu).
+    """
+    parts = [
+        VERSO_RENDERER_VERSION, reportlab.Version, VERSO_FONT_NAME, VERSO_FONT_SIZE,
+        float(page_width), float(page_height),
+        name, address, _position_key(name_position), _position_key(address_position),
+    ]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def run_settings_hash(template, name_position, address_position, overlay, plan):
+    """
+    Hash des réglages d'un run en mode un PDF par entrée (voir run_manifest.py): tout ce
+    qui, en plus de l'entrée, détermine le contenu de ses PDFs (template, positions,
+    pages, police et version du rendu).
+    """
+    return run_hash([
+        VERSO_RENDERER_VERSION, reportlab.Version, VERSO_FONT_NAME, VERSO_FONT_SIZE, template.digest,
+        _position_key(name_position), _position_key(address_position), bool(overlay),
+        [list(step) for step in plan],
+    ])
+
+
+class VersoDedup:
+    """
+    Index des versos déjà rendus pendant un run, pour ne rendre qu'une fois
+    chaque entrée identique (même nom, même adresse, mêmes positions).
+    
+    Le rendu marque les clés nouvelles (mark_new); l'écriture enregistre ensuite
+    le résultat réutilisable de chaque clé (store): la page partagée en mode PDF
+    unique, ou le chemin du PDF écrit en mode un PDF par entrée. Au-delà de
+    max_entries clés, les plus anciennes sont oubliées (et seraient re-rendues).
+    """
+    
+    def __init__(self, name_position=None, address_position=None, max_entries=DEDUP_MAX_ENTRIES):
+        self.name_position = name_position
+        self.address_position = address_position
+        self.max_entries = max_entries
+        self.saved = 0
+        self._results = OrderedDict()
+    
+    def key(self, name, address):
+        return entry_key(name, address, self.name_position, self.address_position)
+    
+    def mark_new(self, entries):
+        """
+        Indique pour chaque entrée (row_num, name, address) si son verso doit être rendu.
+        Les doublons (d'une entrée précédente ou du même lot) sont comptés dans saved.
+        
+        Returns:
+            Liste de booléens, True pour les entrées à rendre
+        """
+        flags = []
+        for _, name, address in entries:
+            key = self.key(name, address)
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.saved += 1
+                flags.append(False)
+            else:
+                self._results[key] = None
+                flags.append(True)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+        return flags
+    
+    def get(self, name, address):
+        """Résultat enregistré pour cette entrée, ou None."""
+        return self._results.get(self.key(name, address))
+    
+    def store(self, name, address, result):
+        key = self.key(name, address)
+        self._results[key] = result
+        self._results.move_to_end(key)
+    
+    def forget_results(self):
+        """
+        Oublie les résultats enregistrés en gardant les clés: les doublons suivants ne
+        sont pas re-rendus d'avance, mais à l'écriture (ex: pages d'un PdfWriter libéré).
+        """
+        self._results = OrderedDict.fromkeys(self._results)
 
 def create_address_overlay(address_text, page_width, page_height, 
                           x_offset_mm=20, y_offset_mm=30, font_size=10, position='left', max_width_mm=None):
@@ -36,9 +495,11 @@ def create_address_overlay(address_text, page_width, page_height,
     # Convertir les mm en points (1 mm = 2.83465 points)
     if position == 'left':
         x_position = x_offset_mm * mm  # Depuis la gauche
+        x_position_right = None
     else:
-        # Pour la droite, on calcule la position de fin du texte (alignement à droite)
-        # x_position sera ajusté pour chaque ligne selon sa largeur
+        # Pour la droite, le texte est aligné à droite sur x_position_right
+        # La zone commence à 95mm depuis la gauche (9.5 cm): le texte ne la dépasse pas
+        x_position = 95 * mm
         x_position_right = page_width - (x_offset_mm * mm)  # Position de référence à droite
     
     y_position = y_offset_mm * mm
@@ -50,67 +511,177 @@ def create_address_overlay(address_text, page_width, page_height,
     else:
         max_width = max_width_mm * mm  # Largeur spécifiée
     
-    # Nettoyer et diviser l'adresse en lignes
-    lines = [line.strip() for line in address_text.split('\n') if line.strip()]
-    
-    if not lines:
-        can.save()
-        packet.seek(0)
-        return packet
+    # Découper et positionner les lignes: la dernière ligne de l'adresse est en bas
+    lines = layout_text(
+        address_text, max_width, y_position, line_height,
+        left_x=x_position, right_x=x_position_right,
+        font_name="Helvetica", font_size=font_size, reverse=True
+    )
     
-    # Dessiner chaque ligne de l'adresse (de bas en haut)
-    # Calculer la position de départ (première ligne en bas)
-    y = y_position
-    
-    # Parcourir les lignes dans l'ordre inverse pour les dessiner de bas en haut
-    for line in reversed(lines):
-        if line.strip():
-            # Découper la ligne si elle est trop longue
-            words = line.split()
-            current_line = []
-            
-            # Stocker les sous-lignes pour cette ligne
-            sub_lines = []
-            
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                can.setFont("Helvetica", font_size)
-                text_width = can.stringWidth(test_line, "Helvetica", font_size)
-                
-                if text_width > max_width and current_line:
-                    sub_lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    current_line.append(word)
-            
-            # Ajouter la dernière sous-ligne
-            if current_line:
-                sub_lines.append(' '.join(current_line))
-            
-            # Dessiner les sous-lignes de bas en haut
-            for sub_line in reversed(sub_lines):
-                can.setFont("Helvetica", font_size)
-                # Si position est 'right', aligner le texte à droite
-                if position == 'right':
-                    text_width = can.stringWidth(sub_line, "Helvetica", font_size)
-                    # Positionner le texte pour qu'il se termine à x_position_right
-                    x_pos = x_position_right - text_width
-                    # S'assurer que le texte ne dépasse pas de la zone autorisée
-                    # La zone commence à 95mm depuis la gauche (9.5 cm)
-                    min_x_pos = 95 * mm
-                    if x_pos < min_x_pos:
-                        x_pos = min_x_pos  # Commencer à la limite gauche de la zone
-                else:
-                    x_pos = x_position
-                # Dessiner le texte en noir pour s'assurer qu'il est visible
-                can.setFillColorRGB(0, 0, 0)  # Noir
-                can.drawString(x_pos, y, sub_line)
-                y += line_height
+    for line in lines:
+        can.setFont("Helvetica", font_size)
+        # Dessiner le texte en noir pour s'assurer qu'il est visible
+        can.setFillColorRGB(0, 0, 0)  # Noir
+        can.drawString(line.x, line.y, line.text)
     
     can.save()
     packet.seek(0)
     return packet
 
+def _verso_zone(page_width_pt, position, default_left, default_bottom, default_width, default_height):
+    """
+    Zone d'un texte (nom ou adresse) du verso, à partir de sa position en mm.
+    
+    Returns:
+        VersoZone (en points)
+    """
+    if position:
+        left_mm = position.get('left', default_left)
+        right_mm = position.get('right', 15)
+        bottom_mm = position.get('bottom', default_bottom)
+        zone_width_mm = position.get('width', default_width)
+        zone_height_mm = position.get('height', default_height)
+    else:
+        left_mm = default_left
+        right_mm = 15
+        bottom_mm = default_bottom
+        zone_width_mm = default_width
+        zone_height_mm = default_height
+    
+    return VersoZone(
+        left=left_mm * mm,
+        right=page_width_pt - right_mm * mm,
+        bottom=bottom_mm * mm,
+        width=zone_width_mm * mm,
+        height=zone_height_mm * mm
+    )
+
+def verso_zones(page_width_pt, name_position=None, address_position=None):
+    """Zones du nom et de l'adresse du verso: dictionnaire {'name': VersoZone, 'address': VersoZone}."""
+    return {
+        'name': _verso_zone(page_width_pt, name_position, *NAME_ZONE_DEFAULTS),
+        'address': _verso_zone(page_width_pt, address_position, *ADDRESS_ZONE_DEFAULTS)
+    }
+
+def _layout_in_zone(zone, text):
+    # Lignes alignées à droite, empilées vers le haut à partir du bas de la zone
+    return layout_text(
+        text, zone.width, zone.bottom, VERSO_LINE_HEIGHT_MM * mm,
+        left_x=zone.left, right_x=zone.right,
+        font_name=VERSO_FONT_NAME, font_size=VERSO_FONT_SIZE
+    )
+
+def _layout_verso_zones(page_width_pt, name, address, name_position=None, address_position=None):
+    """
+    Lignes positionnées du verso, zone par zone (nom puis adresse, si non vides).
+    Partagé par le rendu ReportLab (_draw_name_and_address), le rendu direct
+    (render_verso_content) et la validation (validate_entries_layout), qui placent
+    ainsi le texte exactement au même endroit.
+    
+    Returns:
+        Liste de listes de PositionedLine (voir text_layout.py), une par zone
+    """
+    zones = verso_zones(page_width_pt, name_position, address_position)
+    lines = []
+    if name:
+        lines.append(_layout_in_zone(zones['name'], name))
+    if address:
+        lines.append(_layout_in_zone(zones['address'], address))
+    return lines
+
+def _zone_overflow(zone, line_count, widest):
+    """
+    Débordements d'un texte de line_count lignes, dont la plus large mesure widest points.
+    
+    Le bas de la zone est la ligne de base de la première ligne: seul le haut des
+    lettres (ascendante de la police) de la dernière ligne est comparé au haut de la zone.
+    
+    Returns:
+        Tuple (overflow_x, overflow_y): une ligne est plus large que la zone (mot
+        impossible à couper) ou déborde à droite; le texte dépasse le haut de la zone
+    """
+    if not line_count:
+        return False, False
+    overflow_x = widest > min(zone.width, zone.right - zone.left)
+    top = zone.bottom + (line_count - 1) * VERSO_LINE_HEIGHT_MM * mm + _verso_font_ascent()
+    overflow_y = top > zone.bottom + zone.height
+    return overflow_x, overflow_y
+
+@lru_cache(maxsize=None)
+def _verso_font_ascent():
+    # Ascendante de la police du verso, en points
+    return pdfmetrics.getFont(VERSO_FONT_NAME).face.ascent * 0.001 * VERSO_FONT_SIZE
+
+def _measure_in_zone(zone, text, line_cache):
+    """
+    Nombre de lignes et largeur de la plus large de text mis en page dans zone, comme
+    _layout_in_zone mais sans positionner les lignes. Le découpage de chaque ligne du
+    texte est mémorisé dans line_cache (les mêmes lignes reviennent d'une entrée à l'autre).
+    """
+    line_count = 0
+    widest = 0
+    for line in text.split('\n'):
+        # Une ligne vide (ou d'espaces) compte pour (0, 0), comme dans _layout_in_zone
+        measure = line_cache.get(line)
+        if measure is None:
+            measure = line_cache[line] = measure_line(line, zone.width, VERSO_FONT_NAME, VERSO_FONT_SIZE)
+        line_count += measure[0]
+        if measure[1] > widest:
+            widest = measure[1]
+    return line_count, widest
+
+def _draw_name_and_address(can, page_width_pt, name, address, name_position=None, address_position=None):
+    """
+    Dessine le nom et l'adresse sur la page courante du canvas, chacun dans sa zone.
+    
+    Args:
+        can: Canvas ReportLab sur lequel dessiner
+        page_width_pt: Largeur de la page en points
+        name: Texte du nom
+        address: Texte de l'adresse
+        name_position: Dictionnaire de position du nom en mm (optionnel)
+        address_position: Dictionnaire de position de l'adresse en mm (optionnel)
+    """
+    can.setFillColorRGB(0, 0, 0)
+    
+    for lines in _layout_verso_zones(page_width_pt, name, address, name_position, address_position):
+        if lines:
+            can.setFont(VERSO_FONT_NAME, VERSO_FONT_SIZE)
+            for line in lines:
+                can.drawString(line.x, line.y, line.text)
+
+# Opérateurs écrits par ReportLab en tête de page (police par défaut du canvas: /F1,
+# Helvetica 12) puis par can.setFillColorRGB(0, 0, 0)
+_DIRECT_VERSO_HEADER = "1 0 0 1 0 0 cm  BT /F1 12 Tf 14.4 TL ET\n0 0 0 rg"
+
+def render_verso_content(page_width, name, address, name_position=None, address_position=None):
+    """
+    Écrit directement le flux de contenu d'une page verso (opérateurs BT ... Tj ET),
+    sans canvas ReportLab ni relecture de PDF. Le flux est identique, à l'octet près,
+    à celui que produit _draw_name_and_address; le texte utilise la police /F1
+    (Helvetica) des ressources de la page prototype (_verso_prototype).
+    
+    Returns:
+        Le flux de contenu non compressé (bytes), ou None si le texte contient un
+        caractère hors de l'encodage WinAnsi de Helvetica (ReportLab le dessine alors
+        avec une autre police: ce verso doit passer par le rendu ReportLab)
+    """
+    # Encodage de la police tel qu'utilisé par ReportLab (WinAnsi pour Helvetica)
+    encoding = pdfmetrics.getFont(VERSO_FONT_NAME).encName
+    operators = [_DIRECT_VERSO_HEADER]
+    font = f"BT /F1 {fp_str(VERSO_FONT_SIZE)} Tf {fp_str(VERSO_FONT_SIZE * 1.2)} TL ET"
+    for lines in _layout_verso_zones(float(page_width), name, address, name_position, address_position):
+        if not lines:
+            continue
+        operators.append(font)
+        for line in lines:
+            try:
+                text = line.text.encode(encoding)
+            except UnicodeEncodeError:
+                return None
+            operators.append(f"BT 1 0 0 1 {fp_str(line.x, line.y)} Tm ({escapePDF(text)}) Tj T* ET")
+    return '\n'.join(operators).encode('ascii') + b'\n \n'
+
 def create_blank_page_with_name_and_address(page_width, page_height, name, address, name_position=None, address_position=None):
     """
     Crée une page blanche avec le nom et l'adresse positionnés dans des zones définies séparément.
@@ -141,80 +712,7 @@ def create_blank_page_with_name_and_address(page_width, page_height, name, addre
     # Utiliser les dimensions exactes du recto pour le verso
     # Cela garantit que recto et verso ont exactement le même format
     can = canvas.Canvas(packet, pagesize=(page_width_pt, page_height_pt))
-    can.setFillColorRGB(0, 0, 0)
-    
-    # Fonction helper pour dessiner du texte dans une zone
-    def draw_text_in_zone(text, position, default_left, default_bottom, default_width, default_height):
-        if position:
-            left_mm = position.get('left', default_left)
-            right_mm = position.get('right', 15)
-            bottom_mm = position.get('bottom', default_bottom)
-            zone_width_mm = position.get('width', default_width)
-            zone_height_mm = position.get('height', default_height)
-        else:
-            left_mm = default_left
-            right_mm = 15
-            bottom_mm = default_bottom
-            zone_width_mm = default_width
-            zone_height_mm = default_height
-        
-        min_x_pt = left_mm * mm
-        x_offset_pt = right_mm * mm
-        y_offset_pt = bottom_mm * mm
-        zone_width_pt = zone_width_mm * mm
-        
-        x_position_right = page_width_pt - x_offset_pt
-        y_position = y_offset_pt
-        
-        font_size = 10
-        line_height = 4 * mm
-        max_width_pt = zone_width_pt
-        
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        
-        if lines:
-            can.setFont("Helvetica", font_size)
-            y = y_position
-            
-            for line in lines:
-                if not line.strip():
-                    continue
-                
-                words = line.strip().split()
-                current_line = []
-                
-                for word in words:
-                    test_line = ' '.join(current_line + [word])
-                    test_width = can.stringWidth(test_line, "Helvetica", font_size)
-                    
-                    if test_width > max_width_pt and current_line:
-                        line_text = ' '.join(current_line)
-                        line_width = can.stringWidth(line_text, "Helvetica", font_size)
-                        x_line = x_position_right - line_width
-                        if x_line < min_x_pt:
-                            x_line = min_x_pt
-                        can.drawString(x_line, y, line_text)
-                        y += line_height
-                        current_line = [word]
-                    else:
-                        current_line.append(word)
-                
-                if current_line:
-                    line_text = ' '.join(current_line)
-                    line_width = can.stringWidth(line_text, "Helvetica", font_size)
-                    x_line = x_position_right - line_width
-                    if x_line < min_x_pt:
-                        x_line = min_x_pt
-                    can.drawString(x_line, y, line_text)
-                    y += line_height
-    
-    # Dessiner le nom dans sa zone
-    if name:
-        draw_text_in_zone(name, name_position, 20, 250, 80, 30)
-    
-    # Dessiner l'adresse dans sa zone
-    if address:
-        draw_text_in_zone(address, address_position, 95, 20, 100, 40)
+    _draw_name_and_address(can, page_width_pt, name, address, name_position, address_position)
     
     can.save()
     packet.seek(0)
@@ -233,6 +731,230 @@ def create_blank_page_with_name_and_address(page_width, page_height, name, addre
     
     return verso_page
 
+def render_verso_pdf(page_width, page_height, entries, name_position=None, address_position=None):
+    """
+    Dessine les pages verso d'un lot d'entrées dans un seul canvas (une page par entrée).
+    
+    Args:
+        page_width: Largeur de la page EN POINTS (depuis PDF mediabox)
+        page_height: Hauteur de la page EN POINTS (depuis PDF mediabox)
+        entries: Itérable de tuples (name, address)
+        name_position: Dictionnaire de position du nom (optionnel)
+        address_position: Dictionnaire de position de l'adresse (optionnel)
+    
+    Returns:
+        Tuple (pdf_bytes, page_count); pdf_bytes vaut None si le lot est vide
+    """
+    packet = BytesIO()
+    page_width_pt = float(page_width)
+    page_height_pt = float(page_height)
+    
+    can = canvas.Canvas(packet, pagesize=(page_width_pt, page_height_pt))
+    page_count = 0
+    for name, address in entries:
+        _draw_name_and_address(can, page_width_pt, name, address, name_position, address_position)
+        can.showPage()
+        page_count += 1
+    
+    if page_count == 0:
+        return None, 0
+    
+    can.save()
+    return packet.getvalue(), page_count
+
+def _read_verso_pages(pdf_bytes, page_count):
+    """
+    Relit le PDF produit par render_verso_pdf et retourne ses pages.
+    """
+    if pdf_bytes is None:
+        return []
+    
+    verso_reader = PdfReader(BytesIO(pdf_bytes))
+    if len(verso_reader.pages) != page_count:
+        raise ValueError("Les pages verso n'ont pas été créées correctement")
+    
+    return list(verso_reader.pages)
+
+def create_verso_pages(page_width, page_height, entries, name_position=None, address_position=None, verso_cache=None,
+                       verso_backend=None):
+    """
+    Crée les pages verso d'un lot d'entrées dans un seul canvas (une page par entrée).
+    
+    Contrairement à create_blank_page_with_name_and_address, le PDF n'est sérialisé
+    et relu qu'une seule fois pour tout le lot. Avec le rendu 'direct', aucun PDF
+    n'est produit: le flux de contenu de chaque page est écrit directement.
+    
+    Args:
+        page_width: Largeur de la page EN POINTS (depuis PDF mediabox)
+        page_height: Hauteur de la page EN POINTS (depuis PDF mediabox)
+        entries: Itérable de tuples (name, address)
+        name_position: Dictionnaire de position du nom (optionnel)
+        address_position: Dictionnaire de position de l'adresse (optionnel)
+        verso_cache: VersoCache (optionnel); seuls les versos absents du cache sont
+                     rendus, puis ajoutés au cache
+        verso_backend: Rendu des versos, 'reportlab' ou 'direct' (par défaut:
+                       DEFAULT_VERSO_BACKEND, variable d'environnement VERSO_BACKEND)
+    
+    Returns:
+        Liste des pages verso, dans l'ordre des entrées
+    """
+    if verso_cache is None:
+        return _render_versos(page_width, page_height, entries, name_position, address_position, verso_backend)
+    
+    keys, cached, missing = _lookup_cached_versos(
+        verso_cache, entries, page_width, page_height, name_position, address_position
+    )
+    rendered = _render_versos(
+        page_width, page_height, [entry for _, entry in missing], name_position, address_position, verso_backend
+    )
+    _store_rendered_versos(verso_cache, [key for key, _ in missing], rendered)
+    return list(_merge_cached_versos(keys, cached, rendered, page_width, page_height))
+
+def _render_versos(page_width, page_height, entries, name_position, address_position, verso_backend=None):
+    """Rend les pages verso d'un lot d'entrées (name, address) avec le rendu choisi."""
+    verso_backend = verso_backend or DEFAULT_VERSO_BACKEND
+    if verso_backend not in VERSO_BACKENDS:
+        raise ValueError(f"Rendu des versos inconnu: {verso_backend} (valeurs possibles: {', '.join(VERSO_BACKENDS)})")
+    
+    if verso_backend == 'direct':
+        entries = list(entries)
+        contents = [
+            render_verso_content(page_width, name, address, name_position, address_position)
+            for name, address in entries
+        ]
+        # Entrées avec des caractères hors WinAnsi: rendues par ReportLab, dans un seul canvas
+        fallback = iter(_render_versos(
+            page_width, page_height,
+            [entry for entry, content in zip(entries, contents) if content is None],
+            name_position, address_position, 'reportlab'
+        ))
+        return [
+            next(fallback) if content is None
+            else _verso_page_from_data(b'/FlateDecode\n' + zlib.compress(content), page_width, page_height)
+            for content in contents
+        ]
+    
+    pdf_bytes, page_count = render_verso_pdf(page_width, page_height, entries, name_position, address_position)
+    return _read_verso_pages(pdf_bytes, page_count)
+
+def _serialize_verso_page(page):
+    """
+    Sérialise une page verso pour le cache disque: filtres et données encodées de son
+    flux de contenu, tels que produits par ReportLab (ni décodage ni réencodage).
+    Retourne None si la page n'a pas un flux de contenu unique.
+    """
+    contents = page.raw_get('/Contents').get_object() if '/Contents' in page else None
+    if not isinstance(contents, EncodedStreamObject):
+        return None
+    filters = contents.get('/Filter', ArrayObject())
+    if not isinstance(filters, ArrayObject):
+        filters = ArrayObject([filters])
+    return ' '.join(filters).encode('ascii') + b'\n' + contents._data
+
+@lru_cache(maxsize=None)
+def _verso_prototype(page_width, page_height):
+    """
+    Page verso de référence pour un format de page: ses entrées (MediaBox, ressources
+    avec la police...) servent de base aux versos reconstruits depuis le cache ou
+    écrits par le rendu 'direct', qui partagent ainsi la même police Helvetica.
+    Les prototypes ne sont jamais libérés: leur reader garde une adresse unique, ce
+    qui permet à PyPDF2 de n'importer qu'une fois leurs objets partagés (police).
+    Comme les pages du template, ils sont entièrement résolus (_resolve_all_objects)
+    et peuvent être partagés entre threads.
+    """
+    page = create_verso_pages(page_width, page_height, [("x", "x")], verso_backend='reportlab')[0]
+    _resolve_all_objects(page)
+    return page
+
+def _verso_page_from_data(data, page_width, page_height):
+    """
+    Construit une page verso à partir de sa forme sérialisée (_serialize_verso_page:
+    filtres puis flux de contenu encodé), sans analyser de PDF.
+    """
+    filters, stream_data = data.split(b'\n', 1)
+    contents = EncodedStreamObject()
+    contents._data = stream_data
+    if filters:
+        contents[NameObject('/Filter')] = ArrayObject(
+            NameObject(name) for name in filters.decode('ascii').split(' ')
+        )
+    
+    page = PageObject()
+    for key, value in _verso_prototype(float(page_width), float(page_height)).items():
+        if key not in ('/Contents', '/Parent'):
+            page[NameObject(key)] = value
+    page[NameObject('/Contents')] = contents
+    return page
+
+def _lookup_cached_versos(verso_cache, entries, page_width, page_height, name_position, address_position):
+    """
+    Cherche les versos d'un lot d'entrées (name, address) dans le cache disque.
+    
+    Returns:
+        Tuple (clés, {clé: données} des versos trouvés, liste de tuples (clé, entrée)
+        des versos à rendre, dans l'ordre des entrées)
+    """
+    entries = list(entries)
+    keys = [
+        verso_cache_key(name, address, name_position, address_position, page_width, page_height)
+        for name, address in entries
+    ]
+    cached = verso_cache.get_many(keys)
+    missing = [(key, entry) for key, entry in zip(keys, entries) if key not in cached]
+    return keys, cached, missing
+
+def _store_rendered_versos(verso_cache, keys, pages):
+    """Ajoute au cache disque les versos rendus (dans l'ordre de keys)."""
+    items = []
+    for key, page in zip(keys, pages):
+        data = _serialize_verso_page(page)
+        if data is not None:
+            items.append((key, data))
+    verso_cache.put_many(items)
+
+def _merge_cached_versos(keys, cached, rendered, page_width, page_height):
+    """
+    Produit les pages verso dans l'ordre de keys: reconstruites depuis le cache,
+    ou prises dans rendered (pages des clés absentes du cache, dans l'ordre).
+    """
+    rendered = iter(rendered)
+    for key in keys:
+        data = cached.get(key)
+        yield next(rendered) if data is None else _verso_page_from_data(data, page_width, page_height)
+
+def iter_entries_with_versos(entries, page_width, page_height, name_position=None, address_position=None, batch_size=None, dedup=None,
+                             verso_cache=None, verso_backend=None):
+    """
+    Associe chaque entrée à sa page verso, en rendant les versos par lots.
+    
+    Args:
+        entries: Itérable de tuples (row_num, name, address), consommé au fur et à mesure
+        page_width: Largeur de la page en points
+        page_height: Hauteur de la page en points
+        name_position: Dictionnaire de position du nom (optionnel)
+        address_position: Dictionnaire de position de l'adresse (optionnel)
+        batch_size: Nombre de versos par canvas (par défaut: VERSO_BATCH_SIZE)
+        dedup: VersoDedup (optionnel); les doublons ne sont pas rendus
+        verso_cache: VersoCache (optionnel); les versos déjà en cache ne sont pas rendus
+        verso_backend: Rendu des versos, 'reportlab' ou 'direct' (voir create_verso_pages)
+    
+    Yields:
+        Tuples ((row_num, name, address), verso_page), verso_page valant None
+        pour une entrée identique à une entrée précédente
+    """
+    if batch_size is None:
+        batch_size = VERSO_BATCH_SIZE
+    
+    for batch in iter_chunks(entries, batch_size):
+        flags = dedup.mark_new(batch) if dedup is not None else [True] * len(batch)
+        verso_pages = iter(create_verso_pages(
+            page_width, page_height,
+            [(name, address) for (_, name, address), new in zip(batch, flags) if new],
+            name_position, address_position, verso_cache, verso_backend
+        ))
+        for entry, new in zip(batch, flags):
+            yield entry, next(verso_pages) if new else None
+
 def create_blank_page_with_address(page_width, page_height, address, position=None):
     """
     Fonction de compatibilité pour l'ancienne API (seulement adresse, pas de nom séparé).
@@ -245,7 +967,8 @@ def add_address_to_pdf_verso(input_pdf_path, output_pdf_path, address, position=
     """
     add_name_and_address_to_pdf_verso(input_pdf_path, output_pdf_path, "", address, None, position)
 
-def add_name_and_address_to_pdf_verso(input_pdf_path, output_pdf_path, name, address, name_position=None, address_position=None):
+def add_name_and_address_to_pdf_verso(input_pdf_path, output_pdf_path, name, address, name_position=None, address_position=None,
+                                      page_map=None):
     """
     Ajoute une nouvelle page verso avec le nom et l'adresse après chaque page du PDF.
     Structure: Page 1 (recto) -> Page 2 (verso avec nom+adresse) -> ...
@@ -257,106 +980,465 @@ def add_name_and_address_to_pdf_verso(input_pdf_path, output_pdf_path, name, add
         address: Texte de l'adresse
         name_position: Dictionnaire avec les paramètres de position du nom (optionnel)
         address_position: Dictionnaire avec les paramètres de position de l'adresse (optionnel)
+        page_map: Pages suivies du verso (voir parse_page_map; par défaut: toutes)
     """
-    reader = PdfReader(input_pdf_path)
-    writer = PdfWriter()
+    template = load_template(input_pdf_path)
     
-    first_page = reader.pages[0]
-    page_width = float(first_page.mediabox.width)
-    page_height = float(first_page.mediabox.height)
-    
-    for page_num, page in enumerate(reader.pages):
-        writer.add_page(page)
-        verso_page = create_blank_page_with_name_and_address(
-            page_width, page_height, name, address, name_position, address_position
-        )
-        writer.add_page(verso_page)
+    verso_page = create_blank_page_with_name_and_address(
+        template.page_width, template.page_height, name, address, name_position, address_position
+    )
     
-    with open(output_pdf_path, 'wb') as output_file:
-        writer.write(output_file)
+    write_entry_pdf(template, verso_page, output_pdf_path, entry_page_plan(len(template.pages), page_map))
 
-def detect_column(fieldnames, possible_names):
+def add_shared_page(writer, page, shared_page=None):
     """
-    Détecte une colonne parmi plusieurs noms possibles (insensible à la casse).
+    Ajoute une copie de page au writer en partageant son contenu et ses ressources.
+    
+    Au premier appel (shared_page=None), la page est importée normalement et ses
+    /Contents et /Resources sont rendus indirects. Les appels suivants ne créent
+    qu'un nouveau dictionnaire de page qui référence ces mêmes objets: le contenu
+    du template n'est écrit qu'une seule fois dans le PDF final.
     
     Args:
-        fieldnames: Liste des noms de colonnes disponibles
-        possible_names: Liste des noms possibles à rechercher
+        writer: PdfWriter (ou IncrementalPdfWriter) de destination
+        page: Page à ajouter (ignorée si shared_page est fourni)
+        shared_page: Page partagée retournée par un appel précédent (optionnel)
     
     Returns:
-        Le nom exact de la colonne trouvée, ou None
+        La page partagée, à repasser aux appels suivants
     """
-    if not fieldnames:
-        return None
+    if isinstance(writer, IncrementalPdfWriter):
+        return writer.add_shared_page(page, shared_page)
+    if shared_page is None:
+        shared_page = writer.add_page(page)
+        for key in ('/Contents', '/Resources'):
+            value = shared_page.raw_get(key) if key in shared_page else None
+            if value is not None and not isinstance(value, IndirectObject):
+                shared_page[NameObject(key)] = writer._add_object(value)
+        return shared_page
     
-    for field in fieldnames:
-        if field and field.lower().strip() in [name.lower() for name in possible_names]:
-            return field
-    return None
+    page_copy = PageObject(writer)
+    for key, value in shared_page.items():
+        if key != '/Parent':
+            page_copy[NameObject(key)] = value
+    writer.add_page(page_copy)
+    return shared_page
 
-def read_and_concatenate_csvs(csv_paths):
+def forget_imported_objects(writer, reader):
     """
-    Lit plusieurs fichiers CSV et retourne les données concatenées.
-    Détecte automatiquement les colonnes 'name' et 'address' pour chaque CSV.
-    Normalise les données pour avoir des clés cohérentes.
+    Oublie la correspondance des objets déjà importés depuis reader dans writer.
+    
+    PyPDF2 indexe les objets importés par id(reader): si reader est libéré et qu'un
+    nouveau reader obtient la même adresse, ses pages réutiliseraient à tort les
+    objets du premier (un verso afficherait l'adresse d'une autre ligne). À appeler
+    une fois toutes les pages de reader ajoutées, tant que reader est encore référencé.
+    """
+    if isinstance(writer, IncrementalPdfWriter):
+        writer.forget_imported_objects(reader)
+        return
+    writer._id_translated.pop(id(reader), None)
+
+def parse_page_map(page_map, page_count):
+    """
+    Lit une sélection de pages du template (numérotées à partir de 1).
     
     Args:
-        csv_paths: Liste de chemins vers les fichiers CSV
+        page_map: Numéro de page, liste de numéros, ou chaîne "4", "1,3", "2-4", "last",
+                  "all" (éléments séparés par des virgules, combinables: "1,last")
+        page_count: Nombre de pages du template
     
     Returns:
-        Tuple (data_rows, name_column_label, address_column_label)
-        où data_rows est une liste de dictionnaires normalisés avec les clés 'name' et 'address'
+        Ensemble des index (à partir de 0) des pages sélectionnées
+    
+    Raises:
+        ValueError: Si la sélection est vide ou désigne une page inexistante
     """
-    all_data = []
-    detected_name_columns = []
-    detected_address_columns = []
+    if isinstance(page_map, int):
+        items = [page_map]
+    else:
+        items = page_map.split(',') if isinstance(page_map, str) else list(page_map)
+    indexes = set()
+    for item in items:
+        item = str(item).strip().lower()
+        if item == 'all':
+            indexes.update(range(page_count))
+            continue
+        if item == 'last':
+            first = last = page_count
+        else:
+            start, separator, end = item.partition('-')
+            try:
+                first = int(start)
+                last = int(end) if separator else first
+            except ValueError:
+                raise ValueError(f"Sélection de pages invalide: '{item}'")
+        if not 1 <= first <= last <= page_count:
+            raise ValueError(f"Pages '{item}' hors du template ({page_count} page(s))")
+        indexes.update(range(first - 1, last))
+    if not indexes:
+        raise ValueError("La sélection de pages est vide")
+    return indexes
+
+def parse_shard_size(shard_size):
+    """
+    Lit la taille maximale des morceaux du PDF unique.
+
+    Args:
+        shard_size: Nombre d'entrées (entier ou chaîne "1000"), taille en octets avec une
+                    unité ("50MB", "500k", "1Go", "200000o"), ou les deux séparés par une virgule
+                    ("1000,50MB": un morceau est fermé dès que l'une des limites est atteinte)
+
+    Returns:
+        ShardSize, ou None si shard_size est None ou vide
+
+    Raises:
+        ValueError: Si la taille est invalide ou nulle
+    """
+    if shard_size is None or shard_size == '':
+        return None
+    if isinstance(shard_size, ShardSize):
+        return shard_size
+    items = [shard_size] if isinstance(shard_size, int) else str(shard_size).split(',')
+    entries = size_bytes = None
+    for item in items:
+        match = re.fullmatch(r'(\d+)\s*([kmg]?)([bo]?)', str(item).strip().lower())
+        if match is None:
+            raise ValueError(f"Taille de morceau invalide: '{item}' (ex: 1000, 50MB, 1000,50MB)")
+        value, unit, suffix = int(match.group(1)), match.group(2), match.group(3)
+        if value <= 0:
+            raise ValueError(f"Taille de morceau invalide: '{item}' (doit être positive)")
+        if unit or suffix:
+            size_bytes = value * 1024 ** ('kmg'.index(unit) + 1 if unit else 0)
+        else:
+            entries = value
+    return ShardSize(entries, size_bytes)
+
+def entry_page_plan(page_count, page_map=None, single_file=False, overlay=False):
+    """
+    Pages produites pour chaque entrée, dans l'ordre: liste de tuples
+    (index de la page du template, True si elle reçoit le nom et l'adresse).
+    
+    Sans page_map, un PDF par entrée reprend toutes les pages du template avec un verso
+    après chacune (en mode overlay: l'adresse sur la première), et le PDF unique ne
+    reprend que la première page. Avec page_map (voir parse_page_map), toutes les pages
+    du template sont reprises et seules les pages choisies reçoivent l'adresse.
+    """
+    if page_map is not None:
+        indexes = parse_page_map(page_map, page_count)
+        return [(index, index in indexes) for index in range(page_count)]
+    if single_file:
+        return [(0, True)]
+    return [(index, not overlay or index == 0) for index in range(page_count)]
+
+def count_plan_pages(plan, overlay=False):
+    """Nombre de pages écrites par entrée pour un plan (voir entry_page_plan)."""
+    return len(plan) if overlay else len(plan) + sum(1 for _, with_address in plan if with_address)
+
+def add_entry_pages(writer, template, plan, verso_page, overlay=False, shared_pages=None, address_pages=None):
+    """
+    Ajoute au writer les pages d'une entrée selon plan (voir entry_page_plan): chaque
+    page du template suivie de la page verso si elle reçoit l'adresse ou, en mode
+    overlay, la page du template portant l'adresse (add_overlay_page).
+    
+    Args:
+        writer: PdfWriter de destination
+        template: ParsedTemplate (voir load_template)
+        plan: Liste de tuples (index de page, avec adresse)
+        verso_page: Page verso de l'entrée (ignorée si address_pages est fourni)
+        overlay: Si True, l'adresse est superposée aux pages choisies
+        shared_pages: Dictionnaire {index de page: page partagée} (PDF unique, optionnel):
+                      les pages du template sont alors partagées entre toutes les
+                      entrées (add_shared_page) et complété au fil des appels
+        address_pages: Pages portant l'adresse retournées par l'appel d'une entrée
+                       identique (optionnel): elles sont partagées au lieu d'être recréées
+    
+    Returns:
+        Liste des pages ajoutées portant l'adresse (à repasser en address_pages)
+    """
+    address_pages = list(address_pages or [])
+    address_slot = 0
+    for page_index, with_address in plan:
+        if not (overlay and with_address):
+            page = template.pages[page_index]
+            if shared_pages is None:
+                writer.add_page(page)
+            else:
+                shared_pages[page_index] = add_shared_page(writer, page, shared_pages.get(page_index))
+        if not with_address:
+            continue
+        
+        # Le même verso suit chaque page choisie; en overlay, chaque page porte sa copie
+        slot = address_slot if overlay else 0
+        address_slot += 1
+        if slot < len(address_pages):
+            add_shared_page(writer, None, address_pages[slot])
+        elif overlay:
+            address_pages.append(add_overlay_page(writer, template, verso_page, page_index))
+        else:
+            address_pages.append(writer.add_page(verso_page))
+    return address_pages
+
+def write_entry_pdf(template, verso_page, output_path, plan=None, overlay=False):
+    """
+    Écrit le PDF d'une entrée: par défaut chaque page du template suivie de la page
+    verso (même structure que add_name_and_address_to_pdf_verso).
+    
+    Args:
+        template: ParsedTemplate (voir load_template)
+        verso_page: Page verso de l'entrée
+        output_path: Chemin du PDF de sortie
+        plan: Pages de l'entrée (voir entry_page_plan; par défaut: un verso après chaque page)
+        overlay: Si True, l'adresse est superposée aux pages choisies au lieu d'un verso
+    """
+    if plan is None:
+        plan = entry_page_plan(len(template.pages), overlay=overlay)
+    writer = PdfWriter()
+    add_entry_pages(writer, template, plan, verso_page, overlay)
+    with open(output_path, 'wb') as output_file:
+        writer.write(output_file)
+
+def add_overlay_page(writer, template, overlay_page, page_index=0):
+    """
+    Ajoute au writer la page page_index du template avec le contenu d'overlay_page
+    (page verso rendue: nom et adresse) superposé, pour l'impression recto seul
+    dans une enveloppe à fenêtre.
+    
+    La page du template est dessinée par sa Form XObject (template.forms): son contenu
+    et ses ressources ne sont ni relus ni copiés pour chaque entrée, et ne sont écrits
+    qu'une fois par PDF. Chaque entrée n'ajoute que le contenu d'overlay_page et un
+    dictionnaire de page.
+    
+    Returns:
+        La page ajoutée (à repasser à add_shared_page pour une entrée identique)
+    """
+    if isinstance(writer, IncrementalPdfWriter):
+        overlay_form = writer.add_object(page_form(overlay_page))
+    else:
+        overlay_form = writer._add_object(page_form(overlay_page).clone(writer))
+    
+    page = PageObject()
+    for key, value in template.pages[page_index].items():
+        if key not in ('/Contents', '/Resources', '/Parent'):
+            page[NameObject(key)] = value
+    page[NameObject('/Resources')] = DictionaryObject({
+        NameObject('/XObject'): DictionaryObject({
+            NameObject('/Template'): template.forms.form(page_index),
+            NameObject('/Overlay'): overlay_form,
+        })
+    })
+    page[NameObject('/Contents')] = template.forms.contents
+    return writer.add_page(page)
+
+# Cache disque des versos et rendu choisi d'un processus de rendu (voir _init_worker)
+_WORKER_VERSO_CACHE = None
+_WORKER_VERSO_BACKEND = None
+
+def _init_worker(pdf_path, verso_cache=None, verso_backend=None):
+    """
+    Initialise un processus de rendu: le template n'y est chargé qu'une fois, et le
+    cache disque des versos (optionnel) y est rouvert avec sa propre connexion.
+    """
+    global _WORKER_VERSO_CACHE, _WORKER_VERSO_BACKEND
+    _WORKER_VERSO_CACHE = verso_cache
+    _WORKER_VERSO_BACKEND = verso_backend
+    if pdf_path is not None:
+        load_template(pdf_path)
+
+def _render_verso_chunk(chunk, page_width, page_height, name_position, address_position):
+    """
+    Tâche de processus: rend les versos d'un lot et retourne le PDF sérialisé.
+    """
+    return render_verso_pdf(
+        page_width, page_height,
+        [(name, address) for _, name, address in chunk],
+        name_position, address_position
+    )
+
+def _write_entries_chunk(chunk, pdf_path, name_position, address_position, output_dir, plan, overlay=False):
+    """
+    Tâche de processus: écrit le PDF de chaque entrée d'un lot (pages selon plan).
+    
+    Returns:
+        Liste de tuples (row_num, output_path, message_erreur ou None)
+    """
+    template = load_template(pdf_path)
+    results = []
+    for (row_num, name, address), verso_page in iter_entries_with_versos(
+        chunk, template.page_width, template.page_height, name_position, address_position,
+        verso_cache=_WORKER_VERSO_CACHE, verso_backend=_WORKER_VERSO_BACKEND
+    ):
+        output_path = Path(output_dir) / f"rescto_with_address_{row_num}.pdf"
+        try:
+            write_entry_pdf(template, verso_page, output_path, plan, overlay)
+            results.append((row_num, output_path, None))
+        except Exception as e:
+            results.append((row_num, output_path, str(e)))
+    return results
+
+def iter_chunks(items, chunk_size):
+    """
+    Découpe un itérable en listes d'au plus chunk_size éléments, sans le matérialiser.
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _ordered_map(executor, func, tagged_chunks, extra_args, max_pending):
+    """
+    Soumet func(chunk, *extra_args) pour chaque tuple (tag, chunk) et retourne les
+    résultats dans l'ordre des lots. Au plus max_pending lots sont en cours à la fois,
+    pour que la mémoire reste bornée même si l'itérable de lots est très long.
+    
+    Yields:
+        Tuples (tag, résultat)
+    """
+    pending = deque()
+    for tag, chunk in tagged_chunks:
+        pending.append((tag, executor.submit(func, chunk, *extra_args)))
+        if len(pending) >= max_pending:
+            tag, future = pending.popleft()
+            yield tag, future.result()
+    while pending:
+        tag, future = pending.popleft()
+        yield tag, future.result()
+
+def _iter_dedup_chunks(entries, dedup):
+    """
+    Découpe les entrées en lots pour les processus de rendu.
+    
+    Yields:
+        Tuples ((chunk, flags), entrées_à_rendre), flags venant de dedup.mark_new
+    """
+    for chunk in iter_chunks(entries, PARALLEL_CHUNK_SIZE):
+        flags = dedup.mark_new(chunk)
+        yield (chunk, flags), [entry for entry, new in zip(chunk, flags) if new]
+
+def detect_column(fieldnames, possible_names):
+    """
+    Détecte une colonne parmi plusieurs noms possibles (insensible à la casse).
+    
+    Args:
+        fieldnames: Liste des noms de colonnes disponibles
+        possible_names: Liste des noms possibles à rechercher
+    
+    Returns:
+        Le nom exact de la colonne trouvée, ou None
+    """
+    if not fieldnames:
+        return None
+    
+    for field in fieldnames:
+        if field and field.lower().strip() in [name.lower() for name in possible_names]:
+            return field
+    return None
+
+NAME_COLUMNS = ['name', 'nom', 'prenom', 'firstname', 'lastname']
+ADDRESS_COLUMNS = ['address', 'adresse', 'addr']
+
+def detect_csv_delimiter(csvfile):
+    """
+    Détecte le délimiteur d'un fichier CSV ouvert (en mode texte) à partir de son début.
+    Le fichier est replacé au début.
+    """
+    sample = csvfile.read(1024)
+    csvfile.seek(0)
+    
+    delimiter = ','
+    try:
+        sniffer = csv.Sniffer()
+        delimiter = sniffer.sniff(sample).delimiter
+    except:
+        for test_delim in [',', ';', '\t']:
+            csvfile.seek(0)
+            test_reader = csv.DictReader(csvfile, delimiter=test_delim)
+            try:
+                first_row = next(test_reader)
+                delimiter = test_delim
+                break
+            except:
+                continue
+        csvfile.seek(0)
+    
+    return delimiter
+
+def _open_csv_reader(csvfile):
+    """
+    Crée un csv.DictReader sur un fichier ouvert, en détectant son délimiteur.
+    """
+    return csv.DictReader(csvfile, delimiter=detect_csv_delimiter(csvfile))
+
+def _iter_normalized_rows(reader, name_col, address_col):
+    for row in reader:
+        yield {
+            'name': row.get(name_col, '') if name_col else '',
+            'address': row.get(address_col, '') if address_col else ''
+        }
+
+def iter_csv_files(csv_paths, log=print):
+    """
+    Parcourt les fichiers CSV un par un, sans les charger en mémoire.
+    Les colonnes 'name' et 'address' sont détectées sur l'en-tête de chaque fichier.
+    
+    Args:
+        csv_paths: Liste de chemins vers les fichiers CSV
+        log: Fonction recevant les messages (par défaut: print)
     
+    Yields:
+        Tuples (csv_path, name_column, address_column, rows) où rows est un itérateur
+        paresseux de dictionnaires normalisés avec les clés 'name' et 'address'.
+        Le fichier reste ouvert tant que rows n'a pas été consommé.
+    """
     for csv_path in csv_paths:
         csv_path = Path(csv_path)
         
         if not csv_path.exists():
-            print(f"Avertissement: Le fichier CSV '{csv_path}' n'existe pas, ignoré.")
+            log(f"Avertissement: Le fichier CSV '{csv_path}' n'existe pas, ignoré.")
             continue
         
         with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            # Détection du délimiteur
-            sample = csvfile.read(1024)
-            csvfile.seek(0)
-            
-            delimiter = ','
-            try:
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
-            except:
-                for test_delim in [',', ';', '\t']:
-                    csvfile.seek(0)
-                    test_reader = csv.DictReader(csvfile, delimiter=test_delim)
-                    try:
-                        first_row = next(test_reader)
-                        delimiter = test_delim
-                        break
-                    except:
-                        continue
-                csvfile.seek(0)
-            
-            reader = csv.DictReader(csvfile, delimiter=delimiter)
+            reader = _open_csv_reader(csvfile)
             
             # Détecter les colonnes name et address pour CE CSV
-            name_col = detect_column(reader.fieldnames, ['name', 'nom', 'prenom', 'firstname', 'lastname'])
-            address_col = detect_column(reader.fieldnames, ['address', 'adresse', 'addr'])
-            
-            if name_col:
-                detected_name_columns.append(name_col)
-            if address_col:
-                detected_address_columns.append(address_col)
+            name_col = detect_column(reader.fieldnames, NAME_COLUMNS)
+            address_col = detect_column(reader.fieldnames, ADDRESS_COLUMNS)
             
-            # Lire toutes les lignes et normaliser les clés
-            for row in reader:
-                normalized_row = {
-                    'name': row.get(name_col, '') if name_col else '',
-                    'address': row.get(address_col, '') if address_col else ''
-                }
-                all_data.append(normalized_row)
+            yield csv_path, name_col, address_col, _iter_normalized_rows(reader, name_col, address_col)
+
+def iter_csv_rows(csv_paths):
+    """
+    Itère paresseusement sur les lignes normalisées de tous les fichiers CSV, dans l'ordre.
+    """
+    for _, _, _, rows in iter_csv_files(csv_paths):
+        yield from rows
+
+def read_and_concatenate_csvs(csv_paths):
+    """
+    Lit plusieurs fichiers CSV et retourne les données concatenées.
+    Détecte automatiquement les colonnes 'name' et 'address' pour chaque CSV.
+    Normalise les données pour avoir des clés cohérentes.
+    
+    Args:
+        csv_paths: Liste de chemins vers les fichiers CSV
+    
+    Returns:
+        Tuple (data_rows, name_column_label, address_column_label)
+        où data_rows est une liste de dictionnaires normalisés avec les clés 'name' et 'address'
+    """
+    all_data = []
+    detected_name_columns = []
+    detected_address_columns = []
+    
+    for _, name_col, address_col, rows in iter_csv_files(csv_paths):
+        if name_col:
+            detected_name_columns.append(name_col)
+        if address_col:
+            detected_address_columns.append(address_col)
+        
+        # Lire toutes les lignes (déjà normalisées)
+        all_data.extend(rows)
     
     # Retourner le premier nom de colonne détecté comme label
     name_label = detected_name_columns[0] if detected_name_columns else None
@@ -364,27 +1446,770 @@ def read_and_concatenate_csvs(csv_paths):
     
     return all_data, name_label, address_label
 
-def process_csv_and_pdf(csv_paths, pdf_path, output_dir=None, single_file=False, name_position=None, address_position=None):
+def record_to_row(record):
     """
-    Traite plusieurs CSV et crée un PDF pour chaque entrée ou un seul PDF combiné.
+    Convertit un enregistrement JSON {"name": ..., "address": ...} en ligne normalisée
+    (valeurs converties en texte, None et champs absents donnant une chaîne vide).
+    """
+    def as_text(value):
+        return '' if value is None else str(value)
+    
+    return {'name': as_text(record.get('name')), 'address': as_text(record.get('address'))}
+
+def iter_ndjson_rows(lines, log=print):
+    """
+    Lit des enregistrements JSON Lines (un objet JSON par ligne) au fil de l'eau.
+    Les lignes vides sont ignorées; les lignes invalides sont ignorées avec un avertissement.
     
     Args:
-        csv_paths: Liste de chemins vers les fichiers CSV (peut être une string pour rétrocompatibilité)
-        pdf_path: Chemin vers le PDF template
+        lines: Itérable de lignes (bytes ou str), par exemple un flux binaire ouvert
+        log: Fonction recevant les messages (par défaut: print)
+    
+    Yields:
+        Dictionnaires normalisés avec les clés 'name' et 'address'
+    """
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            log(f"Avertissement: Ligne NDJSON {line_num} invalide ({e}), ignorée.")
+            continue
+        if not isinstance(record, dict):
+            log(f"Avertissement: Ligne NDJSON {line_num} n'est pas un objet JSON, ignorée.")
+            continue
+        yield record_to_row(record)
+
+def normalize_text(text):
+    """
+    Nettoie un nom ou une adresse: convertit les '\\n' littéraux en retours à la ligne
+    et supprime les espaces en début et fin de chaque ligne.
+    """
+    if not text:
+        return text
+    text = text.replace('\\n', '\n')
+    text = '\n'.join(line.strip() for line in text.split('\n'))
+    return text.strip()
+
+def iter_entries(rows, log=print):
+    """
+    Transforme des lignes normalisées en entrées (row_num, name, address).
+    Les lignes sans nom ni adresse sont ignorées (avec un avertissement).
+    
+    Args:
+        rows: Itérable de dictionnaires avec les clés 'name' et 'address'
+        log: Fonction recevant les messages (par défaut: print)
+    
+    Yields:
+        Tuples (row_num, name, address), row_num commençant à 1
+    """
+    for row_num, row in enumerate(rows, start=1):
+        name = normalize_text(row.get('name', ''))
+        address = normalize_text(row.get('address', ''))
+        
+        if not name and not address:
+            log(f"Avertissement: Ligne {row_num} - nom et adresse vides, ignorée.")
+            continue
+        
+        yield row_num, name, address
+
+def _iter_csv_rows_with_log(csv_paths, log=print, workers=1):
+    """
+    Comme iter_csv_rows, en signalant les colonnes détectées pour chaque fichier.
+    Les fichiers sans colonne 'name' ni 'address' sont ignorés.
+    Avec workers > 1, les fichiers sont lus en parallèle (voir iter_csv_rows_parallel),
+    sauf s'ils tiennent ensemble dans un seul morceau.
+    """
+    if _read_in_parallel(csv_paths, workers):
+        yield from iter_csv_rows_parallel(csv_paths, workers, log)
+        return
+    for csv_path, name_col, address_col, rows in iter_csv_files(csv_paths, log):
+        if not _log_csv_columns(csv_path, name_col, address_col, log):
+            continue
+        yield from rows
+
+def _read_in_parallel(csv_paths, workers):
+    # Démarrer des processus de lecture ne vaut que pour plus d'un morceau de CSV
+    if workers <= 1:
+        return False
+    total_bytes = sum(os.path.getsize(csv_path) for csv_path in csv_paths if os.path.exists(csv_path))
+    return total_bytes > CSV_CHUNK_BYTES
+
+def _log_csv_columns(csv_path, name_col, address_col, log):
+    # Signale les colonnes détectées; retourne False si le fichier est ignoré
+    if not name_col and not address_col:
+        log(f"Avertissement: Aucune colonne 'name' ou 'address' détectée dans '{csv_path.name}', ignoré.")
+        return False
+    log(f"✓ {csv_path.name}")
+    log(f"  Colonne nom: {name_col or '(non détectée)'}")
+    log(f"  Colonne adresse: {address_col or '(non détectée)'}")
+    return True
+
+def count_csv_rows(csv_paths, workers=1):
+    """
+    Compte les lignes qu'une génération lira dans ces CSV (mêmes fichiers ignorés que
+    _iter_csv_rows_with_log), pour connaître le total à afficher dans la progression.
+    Avec workers > 1, les morceaux des fichiers sont comptés en parallèle.
+    """
+    if _read_in_parallel(csv_paths, workers):
+        return sum(_map_csv_chunks(csv_paths, workers, lambda message: None, count_only=True))
+    total = 0
+    for _, name_col, address_col, rows in iter_csv_files(csv_paths, log=lambda message: None):
+        if name_col or address_col:
+            total += sum(1 for _ in rows)
+    return total
+
+# Colonnes d'un CSV pour la lecture par morceaux: délimiteur, noms des colonnes détectées
+# et leurs index dans les enregistrements (None si non détectées)
+CsvLayout = namedtuple('CsvLayout', ['delimiter', 'name_column', 'address_column', 'name_index', 'address_index'])
+
+def _csv_layout(csv_path):
+    """
+    Délimiteur et colonnes d'un CSV, détectés comme par iter_csv_files (même ouverture
+    du fichier, même en-tête).
+    """
+    with open(csv_path, 'r', encoding='utf-8') as csvfile:
+        reader = _open_csv_reader(csvfile)
+        fieldnames = reader.fieldnames or []
+        delimiter = reader.reader.dialect.delimiter
+    
+    name_col = detect_column(fieldnames, NAME_COLUMNS)
+    address_col = detect_column(fieldnames, ADDRESS_COLUMNS)
+    
+    def column_index(column):
+        # csv.DictReader garde la dernière colonne d'un nom répété
+        if column is None:
+            return None
+        return max(index for index, field in enumerate(fieldnames) if field == column)
+    
+    return CsvLayout(delimiter, name_col, address_col, column_index(name_col), column_index(address_col))
+
+def iter_csv_record_ranges(csv_path, chunk_bytes=CSV_CHUNK_BYTES):
+    """
+    Découpe un CSV en plages d'octets d'environ chunk_bytes, chacune commençant au début
+    d'un enregistrement: une coupure n'est faite qu'à un retour à la ligne situé hors
+    des guillemets (les adresses sur plusieurs lignes entre guillemets restent entières;
+    un guillemet doublé "" compte pour deux et ne change pas l'état).
+    
+    Yields:
+        Tuples (début, fin) en octets, la première plage commençant à 0 (en-tête inclus)
+    """
+    size = os.path.getsize(csv_path)
+    start = 0
+    target = chunk_bytes
+    in_quotes = False
+    position = 0
+    with open(csv_path, 'rb') as raw:
+        while target < size:
+            block = raw.read(CSV_SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            scanned = 0
+            search_from = max(target - position, 0)
+            while search_from < len(block):
+                newline = block.find(b'\n', search_from)
+                if newline < 0:
+                    break
+                in_quotes ^= block.count(b'"', scanned, newline) % 2 == 1
+                scanned = newline
+                if in_quotes:
+                    search_from = newline + 1
+                    continue
+                end = position + newline + 1
+                if end < size:
+                    yield start, end
+                    start = end
+                target = end + chunk_bytes
+                search_from = max(target - position, newline + 1)
+            in_quotes ^= block.count(b'"', scanned) % 2 == 1
+            position += len(block)
+    yield start, size
+
+def _parse_csv_chunk(task, count_only=False):
+    """
+    Lit les enregistrements d'une plage d'octets d'un CSV (voir iter_csv_record_ranges).
+    Exécuté dans les processus de lecture.
+    
+    Args:
+        task: Tuple (csv_path, début, fin, CsvLayout, is_first); la première plage
+              d'un fichier commence par l'en-tête, qui est sauté
+        count_only: Si True, retourne seulement le nombre de lignes
+    
+    Returns:
+        Liste de dictionnaires normalisés (clés 'name' et 'address'), ou nombre de lignes
+    """
+    csv_path, start, end, layout, is_first = task
+    with open(csv_path, 'rb') as raw:
+        raw.seek(start)
+        data = raw.read(end - start)
+    
+    # Mêmes retours à la ligne qu'un fichier ouvert en mode texte (iter_csv_files)
+    reader = csv.reader(TextIOWrapper(BytesIO(data), encoding='utf-8'), delimiter=layout.delimiter)
+    if is_first:
+        next(reader, None)
+    
+    # Comme csv.DictReader: enregistrements vides ignorés, champs manquants à None
+    records = (record for record in reader if record)
+    if count_only:
+        return sum(1 for _ in records)
+    
+    name_index = layout.name_index
+    address_index = layout.address_index
+    rows = []
+    for record in records:
+        field_count = len(record)
+        rows.append({
+            'name': (record[name_index] if name_index < field_count else None) if name_index is not None else '',
+            'address': (
+                (record[address_index] if address_index < field_count else None) if address_index is not None else ''
+            )
+        })
+    return rows
+
+def _map_csv_chunks(csv_paths, workers, log, count_only=False, chunk_bytes=CSV_CHUNK_BYTES):
+    """
+    Lit les CSV par morceaux dans workers processus et produit le résultat de
+    _parse_csv_chunk pour chaque morceau, dans l'ordre des fichiers et des lignes.
+    Les colonnes de chaque fichier sont signalées (log) au début de sa lecture, et les
+    fichiers ignorés à leur place dans l'ordre des fichiers.
+    """
+    # Messages des fichiers ignorés, émis avec le premier morceau du fichier suivant
+    skipped_messages = []
+    
+    def iter_tasks():
+        for csv_path in csv_paths:
+            csv_path = Path(csv_path)
+            if not csv_path.exists():
+                skipped_messages.append(f"Avertissement: Le fichier CSV '{csv_path}' n'existe pas, ignoré.")
+                continue
+            layout = _csv_layout(csv_path)
+            if not layout.name_column and not layout.address_column:
+                _log_csv_columns(csv_path, None, None, skipped_messages.append)
+                continue
+            for start, end in iter_csv_record_ranges(csv_path, chunk_bytes):
+                messages = None
+                if start == 0:
+                    messages = list(skipped_messages)
+                    skipped_messages.clear()
+                    _log_csv_columns(csv_path, layout.name_column, layout.address_column, messages.append)
+                yield messages, (csv_path, start, end, layout, start == 0)
+    
+    if workers <= 1:
+        for messages, task in iter_tasks():
+            for message in messages or ():
+                log(message)
+            yield _parse_csv_chunk(task, count_only)
+        for message in skipped_messages:
+            log(message)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for messages, result in _ordered_map(
+            executor, _parse_csv_chunk, iter_tasks(), (count_only,), max_pending=2 * workers
+        ):
+            for message in messages or ():
+                log(message)
+            yield result
+    for message in skipped_messages:
+        log(message)
+
+def iter_csv_rows_parallel(csv_paths, workers, log=print, chunk_bytes=CSV_CHUNK_BYTES):
+    """
+    Lit les CSV en parallèle: les gros fichiers sont découpés entre deux enregistrements
+    (voir iter_csv_record_ranges) et les morceaux de tous les fichiers sont lus par
+    workers processus. Les lignes sont produites dans l'ordre des fichiers et des lignes,
+    avec la même détection des colonnes et les mêmes fichiers ignorés que
+    _iter_csv_rows_with_log.
+    
+    Args:
+        csv_paths: Liste de chemins vers les fichiers CSV
+        workers: Nombre de processus de lecture (1: morceaux lus dans le processus courant)
+        log: Fonction recevant les messages (par défaut: print)
+        chunk_bytes: Taille visée des morceaux en octets
+    
+    Yields:
+        Dictionnaires normalisés avec les clés 'name' et 'address'
+    """
+    for rows in _map_csv_chunks(csv_paths, workers, log, chunk_bytes=chunk_bytes):
+        yield from rows
+
+class ConsoleProgress:
+    """
+    Affiche la progression d'une génération sur une seule ligne de la console,
+    réécrite uniquement quand le pourcentage change.
+    """
+    
+    def __init__(self):
+        self._last_percent = None
+    
+    def __call__(self, rows_done, rows_total):
+        percent = rows_done * 100 // rows_total if rows_total else 100
+        if percent == self._last_percent:
+            return
+        self._last_percent = percent
+        end = '\n' if rows_done >= rows_total else ''
+        print(f"\r  {rows_done}/{rows_total} ligne(s) ({percent}%)", end=end, flush=True)
+
+def _write_single_file(entries, template, output_dir, dedup, report, executor=None, workers=1, verso_cache=None,
+                       metrics=None, verso_backend=None, overlay=False, plan=None, shard_size=None,
+                       incremental=False):
+    """
+    Crée un seul PDF avec toutes les pages (recto + verso pour chaque entrée, ou en
+    mode overlay le recto portant le nom et l'adresse, voir add_overlay_page), selon
+    plan (voir entry_page_plan). Les pages du template ne sont stockées qu'une fois.
+    Avec un executor, les versos sont rendus par lots dans les processus puis
+    fusionnés dans l'ordre des lignes. Les entrées identiques partagent la même page verso.
+    report(row_num) est appelé après chaque entrée, report(None, message) pour les messages.
+    Les temps de rendu et d'écriture, les entrées et les pages sont comptés dans metrics.
+    
+    Avec shard_size (ShardSize, voir parse_shard_size), le PDF est découpé en morceaux
+    rescto_all_entries_0001.pdf, _0002.pdf, etc. Chaque morceau est écrit dès qu'il est
+    plein et son PdfWriter libéré: la mémoire dépend de la taille d'un morceau et non du
+    nombre d'entrées. La taille en octets d'un morceau est estimée avant son écriture
+    (d'après la taille des flux de contenu ajoutés, corrigée à chaque morceau écrit).
+    Un manifeste rescto_all_entries_manifest.json associe les lignes à chaque morceau.
+    
+    Avec incremental, les pages sont écrites dans le fichier au fur et à mesure
+    (IncrementalPdfWriter, voir incremental_pdf.py) au lieu d'être gardées dans un
+    PdfWriter jusqu'à la fin: la mémoire ne dépend plus du nombre d'entrées, et la
+    taille d'un morceau est mesurée au lieu d'être estimée.
+    
+    Yields:
+        Le chemin du PDF une fois écrit (de chaque morceau, puis du manifeste)
+    
+    Returns:
+        Nombre d'entrées écrites (valeur de retour du générateur)
+    """
+    if metrics is None:
+        metrics = GenerationMetrics()
+    
+    if executor is None:
+        # Les versos sont rendus par lots (un canvas par lot) puis associés à leur entrée
+        entries_with_versos = iter_entries_with_versos(
+            entries, template.page_width, template.page_height,
+            dedup.name_position, dedup.address_position, dedup=dedup, verso_cache=verso_cache,
+            verso_backend=verso_backend
+        )
+    else:
+        entries_with_versos = _iter_parallel_versos(executor, workers, entries, template, dedup, verso_cache)
+    
+    if plan is None:
+        plan = entry_page_plan(len(template.pages), single_file=True, overlay=overlay)
+    pages_per_entry = count_plan_pages(plan, overlay)
+    
+    shard = _ShardState(template, pages_per_entry) if shard_size is not None else None
+    writer = _new_single_file_writer(_single_file_path(output_dir, shard), incremental)
+    shared_pages = {}
+    verso_reader = None
+    entry_count = 0
+    
+    try:
+        for (row_num, name, address), verso_page in metrics.iterate(entries_with_versos, 'render'):
+            # Entrée identique à une précédente: réutiliser ses pages portant l'adresse
+            address_pages = dedup.get(name, address) if verso_page is None else None
+            
+            if shard is not None:
+                if incremental:
+                    # Taille déjà écrite: seule l'entrée suivante est estimée
+                    shard.estimated_bytes = writer.closed_size()
+                if shard.is_full(shard_size, shard.entry_bytes(verso_page if address_pages is None else None)):
+                    yield from _flush_shard(writer, shard, output_dir, metrics, report)
+                    # Nouveau morceau: les pages du morceau écrit ne sont plus réutilisables
+                    writer = _new_single_file_writer(_single_file_path(output_dir, shard), incremental)
+                    shared_pages = {}
+                    dedup.forget_results()
+                    address_pages = None
+            
+            if address_pages is None and verso_page is None:
+                with metrics.stage('render'):
+                    verso_page = _render_single_verso(template, name, address, dedup, verso_cache, verso_backend)
+            if shard is not None:
+                shard.add_entry(row_num, shard.entry_bytes(verso_page if address_pages is None else None))
+            
+            with metrics.stage('write'):
+                entry_count += 1
+                if address_pages is None:
+                    # Nouveau lot de versos: oublier les objets importés depuis le lot précédent
+                    # (les versos reconstruits depuis le cache disque n'ont pas de reader)
+                    if verso_page.pdf is not None and verso_page.pdf is not verso_reader:
+                        if verso_reader is not None:
+                            forget_imported_objects(writer, verso_reader)
+                        verso_reader = verso_page.pdf
+                
+                # Pages du template (partagées entre toutes les entrées) et pages portant l'adresse
+                dedup.store(name, address, add_entry_pages(
+                    writer, template, plan, verso_page, overlay, shared_pages, address_pages
+                ))
+            metrics.add_entry(pages=pages_per_entry)
+            report(row_num)
+    except BaseException:
+        # Génération interrompue: pas de PDF incomplet dans le dossier de sortie
+        if incremental:
+            writer.abort()
+        raise
+    
+    if entry_count == 0:
+        return 0
+    
+    if shard is not None:
+        yield from _flush_shard(writer, shard, output_dir, metrics, report)
+        manifest_path = output_dir / "rescto_all_entries_manifest.json"
+        with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump({
+                'entries': entry_count,
+                'pagesPerEntry': pages_per_entry,
+                'shardSize': {'entries': shard_size.entries, 'bytes': shard_size.bytes},
+                'shards': shard.manifest
+            }, manifest_file, ensure_ascii=False, indent=2)
+        report(None, f"\n✓ PDF unique découpé en {len(shard.manifest)} morceau(x), manifeste: {manifest_path}")
+        yield manifest_path
+        return entry_count
+    
+    output_path = _single_file_path(output_dir)
+    with metrics.stage('write'):
+        _save_single_file(writer, output_path)
+    metrics.add_output_bytes(output_path.stat().st_size)
+    
+    report(None, f"\n✓ PDF unique créé: {output_path}")
+    if overlay:
+        report(None, f"  Nombre de pages: {entry_count * pages_per_entry} (nom et adresse sur le recto)")
+    else:
+        report(None, f"  Nombre de pages: {entry_count * pages_per_entry} (recto + verso pour chaque entrée)")
+    yield output_path
+    return entry_count
+
+def _single_file_path(output_dir, shard=None):
+    """Chemin du PDF unique, ou du morceau en cours avec shard (_ShardState)."""
+    if shard is None:
+        return output_dir / "rescto_all_entries.pdf"
+    return output_dir / f"rescto_all_entries_{len(shard.manifest) + 1:04d}.pdf"
+
+def _new_single_file_writer(output_path, incremental=False):
+    """PdfWriter, ou IncrementalPdfWriter écrivant directement dans output_path."""
+    return IncrementalPdfWriter(output_path) if incremental else PdfWriter()
+
+def _save_single_file(writer, output_path):
+    """Écrit le PdfWriter dans output_path, ou termine l'IncrementalPdfWriter qui y écrit déjà."""
+    if isinstance(writer, IncrementalPdfWriter):
+        writer.close()
+        return
+    with open(output_path, 'wb') as output_file:
+        writer.write(output_file)
+
+class _ShardState:
+    """
+    Morceau en cours du PDF unique découpé (voir _write_single_file): lignes et taille
+    estimée des entrées ajoutées, et manifeste des morceaux déjà écrits.
+    """
+    
+    def __init__(self, template, pages_per_entry):
+        self.template_bytes = template.reader.stream.getbuffer().nbytes
+        self.pages_per_entry = pages_per_entry
+        # Rapport taille écrite / taille estimée, corrigé après chaque morceau écrit
+        self.scale = 1.0
+        self.manifest = []
+        self._reset()
+    
+    def _reset(self):
+        self.first_row = self.last_row = None
+        self.entries = 0
+        self.estimated_bytes = self.template_bytes
+    
+    def entry_bytes(self, verso_page):
+        """Taille estimée d'une entrée: dictionnaires de pages et flux du verso s'il est ajouté."""
+        page_bytes = self.pages_per_entry * SHARD_PAGE_OVERHEAD_BYTES
+        return page_bytes + (_page_content_bytes(verso_page) if verso_page is not None else 0)
+    
+    def is_full(self, shard_size, entry_bytes):
+        """True si le morceau (non vide) dépasserait shard_size avec une entrée de plus."""
+        if self.entries == 0:
+            return False
+        if shard_size.entries is not None and self.entries >= shard_size.entries:
+            return True
+        return shard_size.bytes is not None and (self.estimated_bytes + entry_bytes) * self.scale > shard_size.bytes
+    
+    def add_entry(self, row_num, entry_bytes):
+        if self.first_row is None:
+            self.first_row = row_num
+        self.last_row = row_num
+        self.entries += 1
+        self.estimated_bytes += entry_bytes
+    
+    def close(self, output_path):
+        """Enregistre le morceau écrit dans output_path dans le manifeste et en commence un nouveau."""
+        size = output_path.stat().st_size
+        self.manifest.append({
+            'file': output_path.name,
+            'firstRow': self.first_row,
+            'lastRow': self.last_row,
+            'entries': self.entries,
+            'pages': self.entries * self.pages_per_entry,
+            'bytes': size
+        })
+        self.scale = size / self.estimated_bytes
+        self._reset()
+        return size
+
+def _page_content_bytes(page):
+    """Taille (encodée) des flux de contenu d'une page."""
+    contents = page.get('/Contents')
+    if contents is None:
+        return 0
+    contents = contents.get_object()
+    streams = contents if isinstance(contents, ArrayObject) else [contents]
+    return sum(len(stream.get_object()._data) for stream in streams)
+
+def _flush_shard(writer, shard, output_dir, metrics, report):
+    """
+    Écrit le morceau en cours du PDF unique découpé et l'ajoute au manifeste.
+    
+    Yields:
+        Le chemin du morceau écrit
+    """
+    output_path = _single_file_path(output_dir, shard)
+    with metrics.stage('write'):
+        _save_single_file(writer, output_path)
+    first_row, last_row, entries = shard.first_row, shard.last_row, shard.entries
+    metrics.add_output_bytes(shard.close(output_path))
+    report(None, f"✓ Morceau créé: {output_path} (lignes {first_row} à {last_row}, {entries} entrée(s))")
+    yield output_path
+
+def _skip_current_entries(entries, run_manifest, report):
+    """
+    Retire les entrées dont le PDF est à jour d'après le manifeste du run précédent
+    (RunManifest.is_current); elles comptent comme traitées pour report.
+    """
+    for row_num, name, address in entries:
+        if run_manifest.is_current(row_num, name, address):
+            report(row_num)
+            continue
+        yield row_num, name, address
+
+def _iter_parallel_versos(executor, workers, entries, template, dedup, verso_cache=None):
+    """
+    Rend les versos par lots dans les processus de l'executor, dans l'ordre des lignes.
+    Comme iter_entries_with_versos, les doublons sont produits avec verso_page=None.
+    Avec verso_cache, le cache disque est consulté avant l'envoi de chaque lot:
+    seuls les versos absents du cache sont rendus par les processus.
+    """
+    tagged_chunks = _iter_dedup_chunks(entries, dedup)
+    if verso_cache is not None:
+        tagged_chunks = _iter_uncached_chunks(tagged_chunks, template, dedup, verso_cache)
+    results = _ordered_map(
+        executor, _render_verso_chunk, tagged_chunks,
+        (template.page_width, template.page_height, dedup.name_position, dedup.address_position),
+        max_pending=workers * 2
+    )
+    for tag, (pdf_bytes, page_count) in results:
+        verso_pages = _read_verso_pages(pdf_bytes, page_count)
+        if verso_cache is not None:
+            (chunk, flags), (keys, cached, missing) = tag
+            _store_rendered_versos(verso_cache, [key for key, _ in missing], verso_pages)
+            verso_pages = _merge_cached_versos(keys, cached, verso_pages, template.page_width, template.page_height)
+        else:
+            chunk, flags = tag
+        verso_pages = iter(verso_pages)
+        for entry, new in zip(chunk, flags):
+            yield entry, next(verso_pages) if new else None
+
+def _iter_uncached_chunks(tagged_chunks, template, dedup, verso_cache):
+    """
+    Retire des lots de _iter_dedup_chunks les versos déjà présents dans le cache disque.
+    
+    Yields:
+        Tuples ((tag, résultat de _lookup_cached_versos), entrées_à_rendre)
+    """
+    for tag, to_render in tagged_chunks:
+        lookup = _lookup_cached_versos(
+            verso_cache, [(name, address) for _, name, address in to_render],
+            template.page_width, template.page_height, dedup.name_position, dedup.address_position
+        )
+        missing = {key for key, _ in lookup[2]}
+        yield (tag, lookup), [
+            entry for entry, key in zip(to_render, lookup[0]) if key in missing
+        ]
+
+def _render_single_verso(template, name, address, dedup, verso_cache=None, verso_backend=None):
+    """
+    Rend le verso d'un doublon dont l'original n'est plus disponible
+    (écriture en échec ou clé oubliée par la déduplication). Le doublon, compté
+    comme rendu évité par mark_new, est retiré de dedup.saved.
+    """
+    dedup.saved -= 1
+    return create_verso_pages(
+        template.page_width, template.page_height, [(name, address)],
+        dedup.name_position, dedup.address_position, verso_cache, verso_backend
+    )[0]
+
+def _write_duplicate_entry(dedup, name, address, output_path):
+    """
+    Copie le PDF déjà écrit pour une entrée identique.
+    
+    Returns:
+        True si la copie a été faite, False si aucun PDF identique n'est disponible
+    """
+    source_path = dedup.get(name, address)
+    if source_path is None or not Path(source_path).exists():
+        return False
+    shutil.copyfile(source_path, output_path)
+    return True
+
+def _write_per_entry_files(entries, template, pdf_path, output_dir, dedup, report, executor=None, workers=1,
+                           verso_cache=None, metrics=None, verso_backend=None, overlay=False, plan=None,
+                           run_manifest=None):
+    """
+    Crée un PDF pour chaque entrée (rescto_with_address_{row_num}.pdf), avec ses pages
+    selon plan (par défaut: un verso après chaque page du template ou, en mode overlay,
+    le nom et l'adresse sur sa première page; voir entry_page_plan).
+    Avec un executor, chaque processus écrit directement les fichiers de ses lots
+    (l'attente de leurs résultats est comptée comme du rendu dans metrics).
+    Le PDF d'une entrée identique à une précédente est copié au lieu d'être rendu.
+    report(row_num) est appelé après chaque entrée, report(row_num, message) en cas d'erreur.
+    Chaque PDF écrit est enregistré dans run_manifest (RunManifest, optionnel).
+    
+    Yields:
+        Le chemin de chaque PDF dès qu'il est écrit
+    
+    Returns:
+        Nombre d'entrées traitées (valeur de retour du générateur)
+    """
+    if metrics is None:
+        metrics = GenerationMetrics()
+    if plan is None:
+        plan = entry_page_plan(len(template.pages), overlay=overlay)
+    pages_per_entry = count_plan_pages(plan, overlay)
+    entry_count = 0
+    
+    if executor is None:
+        entries_with_versos = iter_entries_with_versos(
+            entries, template.page_width, template.page_height,
+            dedup.name_position, dedup.address_position, dedup=dedup, verso_cache=verso_cache,
+            verso_backend=verso_backend
+        )
+        for (row_num, name, address), verso_page in metrics.iterate(entries_with_versos, 'render'):
+            output_path = output_dir / f"rescto_with_address_{row_num}.pdf"
+            entry_count += 1
+            
+            try:
+                with metrics.stage('write'):
+                    if verso_page is not None or not _write_duplicate_entry(dedup, name, address, output_path):
+                        if verso_page is None:
+                            with metrics.stage('render'):
+                                verso_page = _render_single_verso(template, name, address, dedup, verso_cache, verso_backend)
+                        write_entry_pdf(template, verso_page, output_path, plan, overlay)
+                        dedup.store(name, address, output_path)
+            except Exception as e:
+                report(row_num, f"✗ Erreur ligne {row_num}: {e}")
+                continue
+            metrics.add_entry(pages=pages_per_entry)
+            metrics.add_output_bytes(output_path.stat().st_size)
+            if run_manifest is not None:
+                run_manifest.record(row_num, name, address, output_path)
+            report(row_num)
+            yield output_path
+        return entry_count
+    
+    results = _ordered_map(
+        executor, _write_entries_chunk, _iter_dedup_chunks(entries, dedup),
+        (str(pdf_path), dedup.name_position, dedup.address_position, str(output_dir), plan, overlay),
+        max_pending=workers * 2
+    )
+    for (chunk, flags), chunk_results in metrics.iterate(results, 'render'):
+        chunk_results = iter(chunk_results)
+        for (row_num, name, address), new in zip(chunk, flags):
+            output_path = output_dir / f"rescto_with_address_{row_num}.pdf"
+            entry_count += 1
+            
+            if new:
+                _, output_path, error = next(chunk_results)
+                if error is None:
+                    dedup.store(name, address, output_path)
+            else:
+                try:
+                    error = None
+                    with metrics.stage('write'):
+                        if not _write_duplicate_entry(dedup, name, address, output_path):
+                            with metrics.stage('render'):
+                                verso_page = _render_single_verso(template, name, address, dedup, verso_cache, verso_backend)
+                            write_entry_pdf(template, verso_page, output_path, plan, overlay)
+                except Exception as e:
+                    error = str(e)
+            
+            if error is None:
+                metrics.add_entry(pages=pages_per_entry)
+                metrics.add_output_bytes(output_path.stat().st_size)
+                if run_manifest is not None:
+                    run_manifest.record(row_num, name, address, output_path)
+                report(row_num)
+                yield output_path
+            else:
+                report(row_num, f"✗ Erreur ligne {row_num}: {error}")
+    return entry_count
+
+def generate_entry_pdfs(entries, pdf_path, output_dir=None, single_file=False, name_position=None, address_position=None,
+                        workers=1, progress=None, log=print, rows_total=None, verso_cache=None, metrics=None,
+                        verso_backend=None, overlay=False, page_map=None, shard_size=None, incremental=False,
+                        resume=False, delta=False, run_manifest=False):
+    """
+    Génère les PDFs d'entrées déjà en mémoire (ou produites au fil de l'eau), sans
+    passer par un fichier CSV: produit le chemin de chaque PDF dès qu'il est écrit
+    (un par entrée, ou le PDF unique à la fin).
+    
+    Les entrées sont normalisées, rendues et écrites au fil de l'eau: en mode un PDF
+    par entrée, la mémoire utilisée ne dépend pas du nombre d'entrées.
+    Si le générateur est abandonné avant la fin, les processus de rendu sont arrêtés.
+    
+    Rien n'est affiché par ligne: les messages (avertissements, erreurs, résumé)
+    passent par log, et l'avancement par progress. Plusieurs générations peuvent
+    ainsi tourner en même temps dans un processus sans mélanger leurs messages.
+    
+    Args:
+        entries: Itérable de dictionnaires avec les clés 'name' et 'address'
+        pdf_path: Chemin vers le PDF template (analysé une seule fois grâce au cache)
         output_dir: Dossier de sortie (par défaut: output/)
         single_file: Si True, crée un seul PDF avec toutes les pages
         name_position: Dictionnaire avec les paramètres de position du nom (optionnel)
         address_position: Dictionnaire avec les paramètres de position de l'adresse (optionnel)
-    """
-    # Rétrocompatibilité: si csv_paths est une string, la convertir en liste
-    if isinstance(csv_paths, (str, Path)):
-        csv_paths = [csv_paths]
+        workers: Nombre de processus de rendu (1 = rendu séquentiel dans le processus courant)
+        progress: Fonction progress(rows_done, rows_total) appelée après chaque entrée (optionnel)
+        log: Fonction recevant les messages (par défaut: print)
+        rows_total: Nombre total d'entrées pour progress (par défaut: len(entries) si
+                    disponible, sinon None)
+        verso_cache: VersoCache (optionnel, voir verso_cache.py): cache disque des versos
+                     rendus, partagé entre les exécutions
+        metrics: GenerationMetrics (optionnel, voir metrics.py) recevant les compteurs et
+                 les temps par étape; celui qui le fournit appelle metrics.observe() à la fin.
+                 Par défaut, la génération est comptée sous l'endpoint 'local'
+        verso_backend: Rendu des versos, 'reportlab' ou 'direct' (par défaut:
+                       DEFAULT_VERSO_BACKEND, variable d'environnement VERSO_BACKEND)
+        overlay: Si True, le nom et l'adresse sont imprimés sur la première page du
+                 template au lieu d'une page verso ajoutée (impression recto seul)
+        page_map: Pages du template qui reçoivent le nom et l'adresse (verso ou overlay),
+                  ex: "4", "1,3", "last" ou [4] (voir parse_page_map). Toutes les pages du
+                  template sont alors reprises pour chaque entrée (optionnel)
+        shard_size: Avec single_file, découpe le PDF unique en morceaux d'au plus N entrées
+                    et/ou M octets, ex: 1000, "50MB" ou "1000,50MB" (voir parse_shard_size),
+                    avec un manifeste des lignes de chaque morceau (optionnel)
+        incremental: Avec single_file, écrit les pages dans le PDF au fur et à mesure
+                     (IncrementalPdfWriter) au lieu de garder tout le document en mémoire
+                     jusqu'à la fin (sans effet en mode un PDF par entrée, déjà écrit au fil de l'eau)
+        resume: En mode un PDF par entrée, ne regénère pas les lignes dont le PDF écrit par
+                un run précédent est à jour d'après le manifeste du run (voir run_manifest.py):
+                reprise d'un run interrompu
+        delta: Comme resume, et supprime les PDFs des lignes qui n'existent plus dans les
+               données (regénération après correction des données ou des réglages)
+        run_manifest: En mode un PDF par entrée, écrit le manifeste du run dans output_dir
+                      pour un prochain run avec resume ou delta (implicite avec ceux-ci);
+                      inutile pour un dossier de sortie temporaire (serveur, jobs)
     
-    csv_paths = [Path(p) for p in csv_paths]
+    Yields:
+        Chemins (Path) des PDFs créés (et du manifeste des morceaux avec shard_size)
+    """
     pdf_path = Path(pdf_path)
     
     if not pdf_path.exists():
-        print(f"Erreur: Le fichier PDF '{pdf_path}' n'existe pas.")
+        log(f"Erreur: Le fichier PDF '{pdf_path}' n'existe pas.")
         return
     
     if output_dir is None:
@@ -394,105 +2219,383 @@ def process_csv_and_pdf(csv_paths, pdf_path, output_dir=None, single_file=False,
     
     output_dir.mkdir(exist_ok=True)
     
-    # Lire et concaténer tous les CSV
-    print(f"Lecture de {len(csv_paths)} fichier(s) CSV...")
-    all_data, name_column, address_column = read_and_concatenate_csvs(csv_paths)
-    
-    if not all_data:
-        print("Erreur: Aucune donnée trouvée dans les fichiers CSV.")
+    verso_backend = verso_backend or DEFAULT_VERSO_BACKEND
+    if verso_backend not in VERSO_BACKENDS:
+        log(f"Erreur: rendu des versos inconnu '{verso_backend}' (valeurs possibles: {', '.join(VERSO_BACKENDS)}).")
         return
     
-    if not name_column and not address_column:
-        print("Erreur: Aucune colonne 'name' ou 'address' détectée dans les CSV.")
-        print(f"Colonnes disponibles: {', '.join(all_data[0].keys() if all_data else [])}")
-        return
+    owns_metrics = metrics is None
+    if owns_metrics:
+        metrics = GenerationMetrics()
     
-    print(f"✓ {len(all_data)} ligne(s) trouvée(s)")
-    print(f"  Colonne nom: {name_column or '(non détectée)'}")
-    print(f"  Colonne adresse: {address_column or '(non détectée)'}")
-    
-    # Lire le PDF template
-    template_reader = PdfReader(pdf_path)
-    template_page = template_reader.pages[0]
-    page_width = float(template_page.mediabox.width)
-    page_height = float(template_page.mediabox.height)
-    
-    # Préparer les données (name + address pour chaque ligne)
-    # Les données sont déjà normalisées avec les clés 'name' et 'address'
-    entries = []
-    for row_num, row in enumerate(all_data, start=1):
-        name = row.get('name', '')
-        address = row.get('address', '')
-        
-        # Nettoyer les données
-        if name:
-            name = name.replace('\\n', '\n')
-            name = '\n'.join(line.strip() for line in name.split('\n'))
-            name = name.strip()
-        
-        if address:
-            address = address.replace('\\n', '\n')
-            address = '\n'.join(line.strip() for line in address.split('\n'))
-            address = address.strip()
-        
-        if not name and not address:
-            print(f"Avertissement: Ligne {row_num} - nom et adresse vides, ignorée.")
-            continue
-        
-        entries.append((row_num, name, address))
+    # Lire le PDF template (analysé une seule fois grâce au cache)
+    with metrics.stage('parse'):
+        template = load_template(pdf_path)
     
-    if not entries:
-        print("Aucune entrée valide trouvée dans les CSV.")
+    try:
+        plan = entry_page_plan(len(template.pages), page_map, single_file, overlay)
+        shard_size = parse_shard_size(shard_size)
+    except ValueError as e:
+        log(f"Erreur: {e}")
+        if owns_metrics:
+            metrics.observe()
         return
     
-    if single_file:
-        # Créer un seul PDF avec toutes les pages (recto + verso pour chaque entrée)
-        writer = PdfWriter()
-        
-        for row_num, name, address in entries:
-            print(f"Traitement ligne {row_num}...")
-            if name:
-                print(f"  Nom: {name[:50]}...")
-            if address:
-                print(f"  Adresse: {address[:50]}...")
-            
-            # Ajouter la page template (recto)
-            template_page = template_reader.pages[0]
-            writer.add_page(template_page)
-            
-            # Créer et ajouter la page verso avec nom et adresse
-            verso_page = create_blank_page_with_name_and_address(
-                page_width, page_height, name, address, name_position, address_position
+    if shard_size is not None and not single_file:
+        log("Avertissement: le découpage en morceaux ne s'applique qu'au PDF unique, ignoré.")
+        shard_size = None
+    if (resume or delta) and single_file:
+        log("Avertissement: la reprise (--resume, --delta) ne s'applique qu'au mode un PDF par entrée, ignorée.")
+        resume = delta = False
+    
+    # Pipeline paresseux: entrées normalisées -> rendu -> écriture
+    if rows_total is None and hasattr(entries, '__len__'):
+        rows_total = len(entries)
+    entries = metrics.iterate(iter_entries(entries, log), 'parse')
+    
+    def report(row_num, message=None):
+        if message is not None:
+            log(message)
+        if row_num is not None and progress is not None:
+            progress(row_num, rows_total)
+    
+    # Manifeste du run (un PDF par entrée, dossier de sortie conservé): avec resume ou
+    # delta, les lignes déjà à jour ne sont pas regénérées
+    manifest = None
+    if not single_file and (run_manifest or resume or delta):
+        manifest = RunManifest(
+            output_dir, run_settings_hash(template, name_position, address_position, overlay, plan),
+            reuse=resume or delta
+        )
+        if manifest.reuse:
+            entries = _skip_current_entries(entries, manifest, report)
+    
+    workers = max(1, int(workers or 1))
+    if workers > 1 and single_file and verso_backend == 'direct':
+        # Le rendu direct coûte moins que l'envoi des versos entre processus
+        log("Rendu direct des versos: les versos du PDF unique sont rendus dans ce processus.")
+        workers = 1
+    executor = None
+    if workers > 1:
+        log(f"Rendu parallèle sur {workers} processus...")
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(None if single_file else str(pdf_path), verso_cache, verso_backend)
+        )
+    
+    # Les entrées identiques ne sont rendues qu'une fois
+    dedup = VersoDedup(name_position, address_position)
+    
+    try:
+        if single_file:
+            entry_count = yield from _write_single_file(
+                entries, template, output_dir, dedup, report, executor, workers, verso_cache, metrics,
+                verso_backend, overlay, plan, shard_size, incremental
             )
-            writer.add_page(verso_page)
-        
-        output_path = output_dir / "rescto_all_entries.pdf"
-        with open(output_path, 'wb') as output_file:
-            writer.write(output_file)
+        else:
+            entry_count = yield from _write_per_entry_files(
+                entries, template, pdf_path, output_dir, dedup, report, executor, workers, verso_cache, metrics,
+                verso_backend, overlay, plan, manifest
+            )
+            if manifest is not None:
+                removed = manifest.finish(remove_stale=delta)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if manifest is not None:
+            manifest.close()
+        if owns_metrics:
+            metrics.observe()
+    
+    # Les dernières lignes ignorées (vides) comptent aussi comme traitées
+    if rows_total is not None:
+        report(rows_total)
+    
+    if manifest is not None and manifest.reuse:
+        log(f"Lignes à jour non regénérées: {manifest.skipped}")
+        if delta:
+            log(f"PDFs supprimés (lignes disparues des données): {removed}")
+    
+    if entry_count == 0:
+        if manifest is None or not manifest.skipped:
+            log("Aucune entrée valide trouvée.")
+        return
+    
+    log(f"\nTerminé! {entry_count} entrée(s) traitée(s), fichiers créés dans: {output_dir}")
+    log(f"  Versos rendus: {entry_count - dedup.saved}, rendus évités (entrées identiques): {dedup.saved}")
+    if verso_cache is not None:
+        stats = verso_cache.stats()
+        log(f"  Cache des versos: {stats['entries']} verso(s), {stats['hits']} hit(s), "
+            f"{stats['misses']} miss(es) depuis sa création")
+
+def process_entries(entries, pdf_path, output_dir=None, single_file=False, name_position=None, address_position=None,
+                    workers=1, progress=None, log=print, verso_cache=None, metrics=None, verso_backend=None,
+                    overlay=False, page_map=None, shard_size=None, incremental=False, resume=False, delta=False,
+                    run_manifest=False):
+    """
+    Crée un PDF pour chaque entrée ou un seul PDF combiné, à partir d'entrées en mémoire.
+    
+    Args:
+        entries: Itérable de dictionnaires avec les clés 'name' et 'address'
+        pdf_path: Chemin vers le PDF template
+        output_dir: Dossier de sortie (par défaut: output/)
+        single_file: Si True, crée un seul PDF avec toutes les pages
+        name_position: Dictionnaire avec les paramètres de position du nom (optionnel)
+        address_position: Dictionnaire avec les paramètres de position de l'adresse (optionnel)
+        workers: Nombre de processus de rendu (1 = rendu séquentiel dans le processus courant)
+        progress: Fonction progress(rows_done, rows_total) appelée après chaque entrée (optionnel)
+        log: Fonction recevant les messages (par défaut: print)
+        verso_cache: VersoCache (optionnel): cache disque des versos rendus
+        metrics: GenerationMetrics (optionnel), voir generate_entry_pdfs
+        verso_backend: Rendu des versos, 'reportlab' ou 'direct' (optionnel)
+        overlay: Si True, nom et adresse sur la première page du template (voir generate_entry_pdfs)
+        page_map: Pages du template qui reçoivent le nom et l'adresse (voir generate_entry_pdfs)
+        shard_size: Découpage du PDF unique en morceaux (voir generate_entry_pdfs)
+        incremental: Écriture du PDF unique au fil de l'eau (voir generate_entry_pdfs)
+        resume: Reprise d'un run interrompu (voir generate_entry_pdfs)
+        delta: Regénération des seules lignes modifiées (voir generate_entry_pdfs)
+        run_manifest: Écriture du manifeste du run (voir generate_entry_pdfs)
+    """
+    for _ in generate_entry_pdfs(
+        entries, pdf_path, output_dir, single_file, name_position, address_position, workers,
+        progress, log, verso_cache=verso_cache, metrics=metrics, verso_backend=verso_backend, overlay=overlay,
+        page_map=page_map, shard_size=shard_size, incremental=incremental, resume=resume, delta=delta,
+        run_manifest=run_manifest
+    ):
+        pass
+
+def generate_pdfs(csv_paths, pdf_path, output_dir=None, single_file=False, name_position=None, address_position=None, workers=1,
+                  progress=None, log=print, verso_cache=None, metrics=None, verso_backend=None, overlay=False,
+                  page_map=None, shard_size=None, incremental=False, resume=False, delta=False,
+                  run_manifest=False):
+    """
+    Version générateur de process_csv_and_pdf: lit les CSV au fil de l'eau et
+    produit le chemin de chaque PDF dès qu'il est écrit (voir generate_entry_pdfs).
+    
+    Args:
+        csv_paths: Liste de chemins vers les fichiers CSV (peut être une string pour rétrocompatibilité)
+        pdf_path: Chemin vers le PDF template
+        output_dir: Dossier de sortie (par défaut: output/)
+        single_file: Si True, crée un seul PDF avec toutes les pages
+        name_position: Dictionnaire avec les paramètres de position du nom (optionnel)
+        address_position: Dictionnaire avec les paramètres de position de l'adresse (optionnel)
+        workers: Nombre de processus de rendu (1 = rendu séquentiel dans le processus courant);
+                 avec workers > 1, les CSV sont aussi lus en parallèle (iter_csv_rows_parallel)
+        progress: Fonction progress(rows_done, rows_total) appelée après chaque ligne (optionnel);
+                  le total est compté par une lecture préalable des CSV
+        log: Fonction recevant les messages (par défaut: print)
+        verso_cache: VersoCache (optionnel): cache disque des versos rendus
+        metrics: GenerationMetrics (optionnel), voir generate_entry_pdfs
+        verso_backend: Rendu des versos, 'reportlab' ou 'direct' (optionnel)
+        overlay: Si True, nom et adresse sur la première page du template (voir generate_entry_pdfs)
+        page_map: Pages du template qui reçoivent le nom et l'adresse (voir generate_entry_pdfs)
+        shard_size: Découpage du PDF unique en morceaux (voir generate_entry_pdfs)
+        incremental: Écriture du PDF unique au fil de l'eau (voir generate_entry_pdfs)
+        resume: Reprise d'un run interrompu (voir generate_entry_pdfs)
+        delta: Regénération des seules lignes modifiées (voir generate_entry_pdfs)
+        run_manifest: Écriture du manifeste du run (voir generate_entry_pdfs)
+    
+    Yields:
+        Chemins (Path) des PDFs créés
+    """
+    # Rétrocompatibilité: si csv_paths est une string, la convertir en liste
+    if isinstance(csv_paths, (str, Path)):
+        csv_paths = [csv_paths]
+    
+    csv_paths = [Path(p) for p in csv_paths]
+    
+    owns_metrics = metrics is None
+    if owns_metrics:
+        metrics = GenerationMetrics()
+    
+    try:
+        log(f"Lecture de {len(csv_paths)} fichier(s) CSV...")
+        with metrics.stage('parse'):
+            rows_total = count_csv_rows(csv_paths, workers) if progress is not None else None
         
-        print(f"\n✓ PDF unique créé: {output_path}")
-        print(f"  Nombre de pages: {len(entries) * 2} (recto + verso pour chaque entrée)")
-    else:
-        # Créer un PDF pour chaque entrée
-        for row_num, name, address in entries:
-            output_filename = f"rescto_with_address_{row_num}.pdf"
-            output_path = output_dir / output_filename
-            
-            print(f"Traitement ligne {row_num}...")
-            if name:
-                print(f"  Nom: {name[:50]}...")
-            if address:
-                print(f"  Adresse: {address[:50]}...")
-            
-            try:
-                add_name_and_address_to_pdf_verso(
-                    pdf_path, output_path, name, address, name_position, address_position
-                )
-                print(f"  ✓ Créé: {output_path}")
-            except Exception as e:
-                print(f"  ✗ Erreur: {e}")
+        return (yield from generate_entry_pdfs(
+            _iter_csv_rows_with_log(csv_paths, log, workers), pdf_path, output_dir, single_file,
+            name_position, address_position, workers, progress, log, rows_total, verso_cache, metrics,
+            verso_backend, overlay, page_map, shard_size, incremental, resume, delta, run_manifest
+        ))
+    finally:
+        if owns_metrics:
+            metrics.observe()
+
+def process_csv_and_pdf(csv_paths, pdf_path, output_dir=None, single_file=False, name_position=None, address_position=None, workers=1,
+                        progress=None, log=print, verso_cache=None, metrics=None, verso_backend=None, overlay=False,
+                        page_map=None, shard_size=None, incremental=False, resume=False, delta=False,
+                        run_manifest=False):
+    """
+    Traite plusieurs CSV et crée un PDF pour chaque entrée ou un seul PDF combiné.
     
-    print(f"\nTerminé! Fichiers créés dans: {output_dir}")
+    Args:
+        csv_paths: Liste de chemins vers les fichiers CSV (peut être une string pour rétrocompatibilité)
+        pdf_path: Chemin vers le PDF template
+        output_dir: Dossier de sortie (par défaut: output/)
+        single_file: Si True, crée un seul PDF avec toutes les pages
+        name_position: Dictionnaire avec les paramètres de position du nom (optionnel)
+        address_position: Dictionnaire avec les paramètres de position de l'adresse (optionnel)
+        workers: Nombre de processus de rendu (1 = rendu séquentiel dans le processus courant)
+        progress: Fonction progress(rows_done, rows_total) appelée après chaque ligne (optionnel)
+        log: Fonction recevant les messages (par défaut: print)
+        verso_cache: VersoCache (optionnel): cache disque des versos rendus
+        metrics: GenerationMetrics (optionnel), voir generate_entry_pdfs
+        verso_backend: Rendu des versos, 'reportlab' ou 'direct' (optionnel)
+        overlay: Si True, nom et adresse sur la première page du template (voir generate_entry_pdfs)
+        page_map: Pages du template qui reçoivent le nom et l'adresse (voir generate_entry_pdfs)
+        shard_size: Découpage du PDF unique en morceaux (voir generate_entry_pdfs)
+        incremental: Écriture du PDF unique au fil de l'eau (voir generate_entry_pdfs)
+        resume: Reprise d'un run interrompu (voir generate_entry_pdfs)
+        delta: Regénération des seules lignes modifiées (voir generate_entry_pdfs)
+        run_manifest: Écriture du manifeste du run (voir generate_entry_pdfs)
+    """
+    for _ in generate_pdfs(
+        csv_paths, pdf_path, output_dir, single_file, name_position, address_position, workers,
+        progress, log, verso_cache, metrics, verso_backend, overlay, page_map, shard_size, incremental,
+        resume, delta, run_manifest
+    ):
+        pass
+
+def _points_to_mm(value):
+    return round(value / mm, 2)
+
+def _zone_inside_page(zone, page_width, page_height):
+    return (
+        0 <= zone.left < zone.right <= page_width
+        and 0 <= zone.bottom and zone.bottom + zone.height <= page_height
+    )
+
+def _zone_report(zone, page_width, page_height):
+    return {
+        'left': _points_to_mm(zone.left),
+        'right': _points_to_mm(zone.right),
+        'bottom': _points_to_mm(zone.bottom),
+        'width': _points_to_mm(zone.width),
+        'height': _points_to_mm(zone.height),
+        'insidePage': _zone_inside_page(zone, page_width, page_height)
+    }
+
+def _line_boxes(lines):
+    # Boîte de chaque ligne en mm: de la descendante à l'ascendante de la police
+    face = pdfmetrics.getFont(VERSO_FONT_NAME).face
+    ascent = face.ascent * 0.001 * VERSO_FONT_SIZE
+    descent = face.descent * 0.001 * VERSO_FONT_SIZE
+    return [
+        {
+            'text': line.text,
+            'x': _points_to_mm(line.x),
+            'y': _points_to_mm(line.y + descent),
+            'width': _points_to_mm(line.width),
+            'height': _points_to_mm(ascent - descent)
+        }
+        for line in lines
+    ]
+
+def validate_entries_layout(entries, pdf_path, name_position=None, address_position=None, details=False,
+                            max_entries=VALIDATION_MAX_ENTRIES, log=print,
+                            max_overflow_rows=VALIDATION_MAX_OVERFLOW_ROWS):
+    """
+    Validation à blanc: met en page le nom et l'adresse de chaque entrée, comme pour
+    les versos (et l'overlay), sans créer de PDF, et signale le texte qui sort de sa zone.
+    
+    Args:
+        entries: Itérable de dictionnaires avec les clés 'name' et 'address'
+        pdf_path: Chemin vers le PDF template (seules les dimensions de la page sont utilisées)
+        name_position: Dictionnaire de position du nom en mm (optionnel)
+        address_position: Dictionnaire de position de l'adresse en mm (optionnel)
+        details: Si True, les lignes de toutes les entrées sont retournées, sinon
+                 seulement celles des entrées qui débordent
+        max_entries: Nombre maximal d'entrées détaillées (les suivantes ne sont que comptées)
+        log: Fonction recevant les messages (par défaut: print)
+        max_overflow_rows: Nombre maximal de numéros de lignes dans overflowRows
+                           (le total est dans rowsWithOverflow)
+    
+    Returns:
+        Rapport (dictionnaire sérialisable en JSON): zones en mm (et si elles tiennent
+        dans la page), nombre d'entrées, numéros des premières lignes qui débordent
+        (overflowRows, overflowRowsTruncated) et, par entrée détaillée, boîtes des
+        lignes en mm et indicateurs overflowX / overflowY par zone
+    """
+    template = load_template(pdf_path)
+    zones = verso_zones(template.page_width, name_position, address_position)
+    
+    # Seules les entrées rapportées sont positionnées ligne par ligne; pour les autres,
+    # le découpage de chaque ligne est mesuré une fois par zone (name_cache, address_cache)
+    name_zone, address_zone = zones['name'], zones['address']
+    name_cache, address_cache = {}, {}
+    rows_checked = 0
+    overflow_count = 0
+    overflow_rows = []
+    reported = []
+    for row_num, name, address in iter_entries(entries, log):
+        rows_checked += 1
+        if len(name_cache) >= LAYOUT_LINE_CACHE_SIZE:
+            name_cache.clear()
+        if len(address_cache) >= LAYOUT_LINE_CACHE_SIZE:
+            address_cache.clear()
+        flags = {
+            'name': _zone_overflow(name_zone, *_measure_in_zone(name_zone, name, name_cache)),
+            'address': _zone_overflow(address_zone, *_measure_in_zone(address_zone, address, address_cache))
+        }
+        overflow = flags['name'] != (False, False) or flags['address'] != (False, False)
+        if overflow:
+            overflow_count += 1
+            if len(overflow_rows) < max_overflow_rows:
+                overflow_rows.append(row_num)
+        if (overflow or details) and len(reported) < max_entries:
+            texts = {'name': name, 'address': address}
+            reported.append({
+                'row': row_num,
+                'overflow': overflow,
+                **{
+                    key: {
+                        'lines': _line_boxes(_layout_in_zone(zones[key], text) if text else []),
+                        'overflowX': flags[key][0],
+                        'overflowY': flags[key][1]
+                    }
+                    for key, text in texts.items()
+                }
+            })
+    
+    zone_reports = {
+        key: _zone_report(zone, template.page_width, template.page_height) for key, zone in zones.items()
+    }
+    for key, zone_report in zone_reports.items():
+        if not zone_report['insidePage']:
+            log(f"Avertissement: La zone '{key}' sort de la page.")
+    log(f"{rows_checked} entrée(s) vérifiée(s), {overflow_count} débordement(s).")
+    return {
+        'valid': not overflow_count and all(zone_report['insidePage'] for zone_report in zone_reports.values()),
+        'pageWidth': _points_to_mm(template.page_width),
+        'pageHeight': _points_to_mm(template.page_height),
+        'zones': zone_reports,
+        'rows': rows_checked,
+        'rowsWithOverflow': overflow_count,
+        'overflowRows': overflow_rows,
+        'overflowRowsTruncated': len(overflow_rows) < overflow_count,
+        'entries': reported,
+        'entriesTruncated': len(reported) < (rows_checked if details else overflow_count)
+    }
+
+def validate_csv_layout(csv_paths, pdf_path, name_position=None, address_position=None, details=False,
+                        max_entries=VALIDATION_MAX_ENTRIES, log=print,
+                        max_overflow_rows=VALIDATION_MAX_OVERFLOW_ROWS):
+    """
+    validate_entries_layout sur les lignes de fichiers CSV (mêmes fichiers et lignes
+    que generate_pdfs).
+    
+    Args:
+        csv_paths: Liste de chemins vers les fichiers CSV (ou un chemin)
+        Autres arguments: voir validate_entries_layout
+    """
+    if isinstance(csv_paths, (str, Path)):
+        csv_paths = [csv_paths]
+    csv_paths = [Path(p) for p in csv_paths]
+    return validate_entries_layout(
+        _iter_csv_rows_with_log(csv_paths, log), pdf_path, name_position, address_position, details,
+        max_entries, log, max_overflow_rows
+    )
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
@@ -500,10 +2603,33 @@ if __name__ == "__main__":
         print("\nOptions:")
         print("  [dossier_sortie]     Dossier de sortie (par défaut: output/)")
         print("  --single             Crée un seul PDF avec toutes les pages")
+        print("  --overlay            Imprime nom et adresse sur la première page du template (pas de verso)")
+        print("  --page-map PAGES     Pages du template qui reçoivent nom et adresse (ex: 4, 1,3, last, all);")
+        print("                       toutes les pages du template sont alors reprises")
+        print("  --shard-size TAILLE  Avec --single, découpe le PDF en morceaux de N entrées et/ou M octets")
+        print("                       (ex: 1000, 50MB, 1000,50MB), avec un manifeste JSON des lignes")
+        print("  --incremental        Avec --single, écrit les pages dans le PDF au fur et à mesure (mémoire constante)")
+        print("  --resume             Reprend un run interrompu: les PDFs déjà écrits et à jour ne sont pas regénérés")
+        print("  --delta              Ne regénère que les lignes modifiées (données ou réglages) et supprime")
+        print("                       les PDFs des lignes disparues (manifeste rescto_run_manifest.jsonl)")
+        print("  --workers N          Nombre de processus de rendu (par défaut: 1)")
+        print("  --verso-cache FICHIER  Cache disque des versos rendus (par défaut: $VERSO_CACHE_PATH)")
+        print("  --verso-backend NOM  Rendu des versos: reportlab ou direct (par défaut: $VERSO_BACKEND ou reportlab)")
+        print("  --dry-run            Vérifie seulement la mise en page (rapport JSON, aucun PDF créé)")
         print("\nExemples:")
         print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf")
         print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf output/")
         print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --single")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --single --workers 8")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --verso-cache ~/.cache/versos.sqlite")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --single --verso-backend direct")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --single --overlay")
+        print("  python add_addresses_to_pdf.py addresses.csv mailer.pdf --single --page-map last")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --single --shard-size 1000,50MB")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --single --incremental")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf output/ --resume")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf output/ --delta")
+        print("  python add_addresses_to_pdf.py addresses.csv rescto.pdf --dry-run > validation.json")
         sys.exit(1)
     
     csv_file = sys.argv[1]
@@ -511,12 +2637,55 @@ if __name__ == "__main__":
     
     # Parser les arguments
     single_file = "--single" in sys.argv
+    overlay = "--overlay" in sys.argv
+    dry_run = "--dry-run" in sys.argv
+    incremental = "--incremental" in sys.argv
+    resume = "--resume" in sys.argv
+    delta = "--delta" in sys.argv
     output_directory = None
+    workers = 1
+    verso_cache = verso_cache_from_env()
+    verso_backend = None
+    page_map = None
+    shard_size = None
     
-    for arg in sys.argv[3:]:
-        if arg != "--single":
+    args = iter(sys.argv[3:])
+    for arg in args:
+        if arg in ("--single", "--overlay", "--dry-run", "--incremental", "--resume", "--delta"):
+            continue
+        if arg == "--workers":
+            workers = int(next(args, 1))
+        elif arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+        elif arg == "--verso-cache":
+            verso_cache = VersoCache(os.path.expanduser(next(args)))
+        elif arg.startswith("--verso-cache="):
+            verso_cache = VersoCache(os.path.expanduser(arg.split("=", 1)[1]))
+        elif arg == "--verso-backend":
+            verso_backend = next(args, None)
+        elif arg.startswith("--verso-backend="):
+            verso_backend = arg.split("=", 1)[1]
+        elif arg == "--page-map":
+            page_map = next(args, None)
+        elif arg.startswith("--page-map="):
+            page_map = arg.split("=", 1)[1]
+        elif arg == "--shard-size":
+            shard_size = next(args, None)
+        elif arg.startswith("--shard-size="):
+            shard_size = arg.split("=", 1)[1]
+        elif output_directory is None:
             output_directory = arg
-            break
     
-    process_csv_and_pdf(csv_file, pdf_file, output_directory, single_file)
+    if dry_run:
+        # Rapport JSON sur la sortie standard, messages sur la sortie d'erreur
+        report = validate_csv_layout(csv_file, pdf_file, log=partial(print, file=sys.stderr))
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        sys.exit(0 if report['valid'] else 2)
+    
+    process_csv_and_pdf(
+        csv_file, pdf_file, output_directory, single_file, workers=workers, progress=ConsoleProgress(),
+        verso_cache=verso_cache, verso_backend=verso_backend, overlay=overlay, page_map=page_map,
+        shard_size=shard_size, incremental=incremental, resume=resume, delta=delta, run_manifest=True
+    )
 
@@ -1,19 +1,29 @@
 #!/usr/bin/env python3
 """Serveur local pour générer des PDFs avec adresses."""
 
-import csv
+import io
 import json
 import os
 import shutil
 import tempfile
+import time
 import zipfile
-from io import BytesIO
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, g, jsonify, request, send_file
 from werkzeug.utils import secure_filename
 
-from add_addresses_to_pdf import process_csv_and_pdf, read_and_concatenate_csvs
+from add_addresses_to_pdf import (
+    TEMPLATE_CACHE, VALIDATION_MAX_ENTRIES, TemplateStore, generate_entry_pdfs, generate_pdfs, iter_ndjson_rows,
+    load_template, parse_page_map, parse_shard_size, record_to_row, validate_csv_layout, validate_entries_layout
+)
+from jobs import JOB_DONE, JOB_ERROR, JobManager, JobQueueFullError
+import metrics
+from metrics import GenerationMetrics
+from preview_cache import PREVIEW_CACHE_SIZE, PREVIEW_CACHE_TTL, PreviewCache
+from verso_cache import verso_cache_from_env
 from functools import wraps
 
 app = Flask(__name__, static_folder='.', static_url_path='')
@@ -22,6 +32,112 @@ app = Flask(__name__, static_folder='.', static_url_path='')
 API_KEY = os.environ.get('API_KEY', None)  # Définir une clé API via variable d'environnement
 REQUIRE_API_KEY = os.environ.get('REQUIRE_API_KEY', 'False').lower() == 'true'
 
+# Nombre maximal de processus de rendu par requête (champ "workers")
+MAX_WORKERS = int(os.environ.get('MAX_WORKERS', os.cpu_count() or 1))
+
+# Taille des morceaux envoyés au client lors de l'envoi d'un PDF en flux
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Types de contenu acceptés pour les données JSON Lines (un enregistrement par ligne)
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+
+# Intervalle (secondes) entre deux vérifications de la progression d'un job pour le flux SSE
+SSE_POLL_INTERVAL = 0.5
+
+# Template recto par défaut (recto.pdf, ou rescto.pdf), analysé une seule fois au démarrage
+DEFAULT_TEMPLATE_PATH = Path(__file__).parent / 'recto.pdf'
+if not DEFAULT_TEMPLATE_PATH.exists():
+    DEFAULT_TEMPLATE_PATH = Path(__file__).parent / 'rescto.pdf'
+if DEFAULT_TEMPLATE_PATH.exists():
+    load_template(DEFAULT_TEMPLATE_PATH, pin=True)
+
+# Templates enregistrés via /api/templates, référencés ensuite par "templateId"
+TEMPLATE_STORE = TemplateStore(
+    os.environ.get('TEMPLATE_STORE_DIR', os.path.join(tempfile.gettempdir(), 'pdf_templates'))
+)
+
+# Cache disque des versos rendus, partagé entre les requêtes et les redémarrages
+# (activé par VERSO_CACHE_PATH, taille maximale VERSO_CACHE_MAX_MB)
+VERSO_CACHE = verso_cache_from_env()
+
+# Jobs en arrière-plan (/api/jobs): jobs simultanés, jobs non terminés acceptés,
+# et durée de conservation des résultats en secondes
+JOB_MANAGER = JobManager(
+    max_concurrent=int(os.environ.get('JOB_MAX_CONCURRENT', 2)),
+    max_pending=int(os.environ.get('JOB_MAX_PENDING', 100)),
+    result_ttl=int(os.environ.get('JOB_RESULT_TTL', 3600))
+)
+
+# Prévisualisation des CSV (/preview): lignes par page (par défaut et maximum), et uploads
+# analysés gardés en cache pour les pages suivantes (nombre, durée en secondes depuis le dernier accès)
+PREVIEW_DEFAULT_LIMIT = 100
+PREVIEW_MAX_LIMIT = 1000
+PREVIEW_CACHE = PreviewCache(
+    max_entries=int(os.environ.get('PREVIEW_CACHE_SIZE', PREVIEW_CACHE_SIZE)),
+    ttl=int(os.environ.get('PREVIEW_CACHE_TTL', PREVIEW_CACHE_TTL))
+)
+
+# Préfixes des dossiers temporaires des requêtes et des jobs (disque mesuré par /metrics)
+TEMP_DIR_PREFIXES = ('csv_preview_', 'pdf_addresses_', 'api_pdf_', 'api_job_')
+
+REQUEST_SECONDS = metrics.Histogram(
+    'http_request_duration_seconds',
+    "Durée des requêtes HTTP, jusqu'à la fin de l'envoi de la réponse.",
+    ['endpoint', 'method', 'status']
+)
+REQUESTS_IN_FLIGHT = metrics.Gauge(
+    'http_requests_in_flight', "Requêtes HTTP en cours (réponse pas encore entièrement envoyée).", ['endpoint']
+)
+TEMP_DIR_BYTES = metrics.Gauge(
+    'pdf_temp_dir_bytes', "Espace disque occupé par les dossiers temporaires des requêtes et des jobs."
+)
+
+
+def temp_dir_usage():
+    """Taille totale (octets) des dossiers temporaires des requêtes et des jobs."""
+    total = 0
+    temp_root = tempfile.gettempdir()
+    for entry in os.scandir(temp_root):
+        if not entry.name.startswith(TEMP_DIR_PREFIXES) or not entry.is_dir(follow_symlinks=False):
+            continue
+        for dirpath, _, filenames in os.walk(entry.path):
+            for filename in filenames:
+                try:
+                    total += os.stat(os.path.join(dirpath, filename)).st_size
+                except OSError:
+                    # Fichier supprimé pendant le parcours (fin d'une requête)
+                    pass
+    return total
+
+
+TEMP_DIR_BYTES.set_function(temp_dir_usage)
+
+
+def _request_endpoint():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc(endpoint=_request_endpoint())
+
+
+@app.after_request
+def finish_request_metrics(response):
+    """Mesure la requête quand sa réponse est fermée (après un éventuel envoi en flux)."""
+    endpoint = _request_endpoint()
+    start = g.get('request_start', time.perf_counter())
+    method = request.method
+    status = response.status_code
+    
+    def observe():
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint, method=method, status=status)
+        REQUESTS_IN_FLIGHT.dec(endpoint=endpoint)
+    
+    response.call_on_close(observe)
+    return response
+
 
 def require_api_key(f):
     """Décorateur pour protéger les endpoints avec une API key."""
@@ -43,6 +159,382 @@ def require_api_key(f):
     return decorated_function
 
 
+def parse_preview_page(raw_offset, raw_limit):
+    """Convertit les champs "offset" et "limit" de /preview (limit borné à PREVIEW_MAX_LIMIT)."""
+    try:
+        offset = int(raw_offset) if raw_offset not in (None, '') else 0
+        limit = int(raw_limit) if raw_limit not in (None, '') else PREVIEW_DEFAULT_LIMIT
+    except (TypeError, ValueError):
+        raise ValueError(f'Pagination invalide: offset={raw_offset!r}, limit={raw_limit!r}')
+    if offset < 0 or limit < 1:
+        raise ValueError(f'Pagination invalide: offset={offset}, limit={limit}')
+    return offset, min(limit, PREVIEW_MAX_LIMIT)
+
+
+def parse_workers(raw_value):
+    """Convertit le champ "workers" d'une requête, borné entre 1 et MAX_WORKERS."""
+    try:
+        workers = int(raw_value) if raw_value not in (None, '') else 1
+    except (TypeError, ValueError):
+        raise ValueError(f'Champ "workers" invalide: {raw_value!r}')
+    return max(1, min(workers, MAX_WORKERS))
+
+
+class _ZipStreamBuffer:
+    """
+    Flux d'écriture non positionnable pour zipfile.ZipFile.
+    Les octets écrits sont récupérés avec drain() et envoyés au client au fur et à mesure.
+    """
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_file_chunks(path):
+    with open(path, 'rb') as stream:
+        while True:
+            chunk = stream.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _iter_zip_stream(pdf_paths, generation_metrics=None):
+    """
+    Écrit un ZIP entrée par entrée et produit ses octets dès que chaque PDF y est ajouté.
+    Le temps d'ajout au ZIP est compté dans l'étape 'zip' de generation_metrics (optionnel).
+    """
+    if generation_metrics is None:
+        generation_metrics = GenerationMetrics()
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for pdf_path in pdf_paths:
+            with generation_metrics.stage('zip'):
+                zipf.write(pdf_path, pdf_path.name)
+            # Le PDF est dans le ZIP: inutile de le garder sur le disque
+            pdf_path.unlink()
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def stream_generated_pdfs(pdf_paths, temp_dir, zip_name, pdf_name=None, generation_metrics=None):
+    """
+    Démarre la génération et retourne une réponse envoyée en flux au client.
+    
+    Le premier PDF est produit avant de répondre, pour pouvoir encore renvoyer une
+    erreur JSON si rien n'est généré. Ensuite chaque PDF est ajouté au ZIP (ou le PDF
+    unique est lu par morceaux) au fur et à mesure; temp_dir est supprimé à la fin
+    de l'envoi, ou si le client se déconnecte.
+    
+    Args:
+        pdf_paths: Générateur des PDFs créés (voir generate_pdfs)
+        temp_dir: Dossier temporaire de la requête
+        zip_name: Nom du ZIP téléchargé
+        pdf_name: Si fourni et qu'un seul PDF est généré, il est envoyé directement sous ce nom
+        generation_metrics: GenerationMetrics passé à la génération (optionnel); ses temps
+                            par étape sont enregistrés à la fin de l'envoi
+    
+    Returns:
+        Une Response Flask, ou None si aucun PDF n'a été généré
+    """
+    if generation_metrics is None:
+        generation_metrics = GenerationMetrics()
+    pdf_iterator = iter(pdf_paths)
+    first_pdf = next(pdf_iterator, None)
+    if first_pdf is None:
+        generation_metrics.observe()
+        return None
+    
+    download_name, mimetype = zip_name, 'application/zip'
+    if pdf_name is not None:
+        second_pdf = next(pdf_iterator, None)
+        if second_pdf is None:
+            body = _iter_file_chunks(first_pdf)
+            download_name, mimetype = pdf_name, 'application/pdf'
+        else:
+            body = _iter_zip_stream(chain([first_pdf, second_pdf], pdf_iterator), generation_metrics)
+    else:
+        body = _iter_zip_stream(chain([first_pdf], pdf_iterator), generation_metrics)
+    
+    def generate():
+        try:
+            yield from body
+        finally:
+            pdf_paths.close()
+            generation_metrics.observe()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    return Response(
+        generate(),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={download_name}'}
+    )
+
+
+def resolve_template(template_id, pdf_file, temp_dir):
+    """
+    Chemin du template d'une requête: template enregistré (templateId), PDF uploadé
+    (enregistré dans temp_dir) ou template par défaut.
+    
+    Raises:
+        ValueError: Si templateId ne correspond à aucun template enregistré
+    """
+    if template_id:
+        pdf_path = TEMPLATE_STORE.path(template_id)
+        if pdf_path is None:
+            raise ValueError(f'Template inconnu: {template_id!r} (voir POST /api/templates)')
+        return pdf_path
+    if pdf_file:
+        pdf_path = os.path.join(temp_dir, secure_filename(pdf_file.filename) or 'recto.pdf')
+        pdf_file.save(pdf_path)
+        return pdf_path
+    return DEFAULT_TEMPLATE_PATH
+
+
+def _parse_positions(values):
+    """Lit namePosition et addressPosition (chaînes JSON) d'un formulaire ou de la query string."""
+    name_position_raw = values.get('namePosition')
+    address_position_raw = values.get('addressPosition')
+    try:
+        name_position = json.loads(name_position_raw) if name_position_raw else None
+        address_position = json.loads(address_position_raw) if address_position_raw else None
+    except json.JSONDecodeError as exc:
+        raise ValueError(f'Position invalide: {exc}')
+    return name_position, address_position
+
+
+def _iter_file_lines(path):
+    """Lit un fichier ligne par ligne (ouvert seulement au début de la lecture)."""
+    with open(path, 'rb') as stream:
+        yield from stream
+
+
+def parse_generation_request(temp_dir, spool_body=False):
+    """
+    Lit une requête de génération (JSON, JSON Lines ou form-data, voir /api/generate)
+    et enregistre ses fichiers dans temp_dir.
+    
+    Args:
+        temp_dir: Dossier temporaire de la requête
+        spool_body: Si True, un corps JSON Lines est d'abord copié dans temp_dir (pour une
+                    génération qui continue après la fin de la requête); sinon il est lu
+                    au fil de l'eau pendant la génération
+    
+    Returns:
+        Dictionnaire pour start_generation: 'entries' (données JSON, gardées en
+        mémoire), 'ndjson' (lignes JSON Lines, lues au fil de l'eau) ou 'csv_paths'
+        (CSV uploadés), plus le template et les options
+    
+    Raises:
+        ValueError: Si la requête est invalide (réponse 400)
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        # Mode JSON Lines: un enregistrement par ligne, options dans la query string
+        name_position, address_position = _parse_positions(request.args)
+        single_file = request.args.get('singleFile', 'false').lower() == 'true'
+        overlay = request.args.get('overlay', 'false').lower() == 'true'
+        page_map = request.args.get('pageMap') or None
+        shard_size = parse_shard_size(request.args.get('shardSize'))
+        incremental = request.args.get('incremental', 'false').lower() == 'true'
+        workers = parse_workers(request.args.get('workers'))
+        
+        if spool_body:
+            ndjson_path = os.path.join(temp_dir, 'data.ndjson')
+            with open(ndjson_path, 'wb') as ndjson_file:
+                shutil.copyfileobj(request.stream, ndjson_file, STREAM_CHUNK_SIZE)
+            source = {'ndjson': _iter_file_lines(ndjson_path)}
+        else:
+            source = {'ndjson': request.stream}
+        
+        pdf_path = resolve_template(request.args.get('templateId'), None, temp_dir)
+        
+    elif request.is_json:
+        # Mode JSON: données directes
+        data = request.get_json()
+        
+        if not data or 'data' not in data:
+            raise ValueError('Le champ "data" est requis')
+        
+        entries = data.get('data', [])
+        name_position = data.get('namePosition')
+        address_position = data.get('addressPosition')
+        single_file = data.get('singleFile', False)
+        overlay = bool(data.get('overlay', False))
+        page_map = data.get('pageMap')
+        shard_size = parse_shard_size(data.get('shardSize'))
+        incremental = bool(data.get('incremental', False))
+        workers = parse_workers(data.get('workers'))
+        
+        # Les données JSON sont passées directement au générateur, sans CSV temporaire
+        source = {'entries': [record_to_row(entry) for entry in entries]}
+        
+        # Template enregistré (templateId) ou recto.pdf par défaut
+        pdf_path = resolve_template(data.get('templateId'), None, temp_dir)
+        
+    else:
+        # Mode form-data: CSV uploadés
+        csv_files = request.files.getlist('csvFiles')
+        pdf_file = request.files.get('pdfFile')
+        
+        if not csv_files:
+            raise ValueError('Aucun fichier CSV ou données fournis')
+        
+        name_position, address_position = _parse_positions(request.form)
+        single_file = request.form.get('singleFile', 'false').lower() == 'true'
+        overlay = request.form.get('overlay', 'false').lower() == 'true'
+        page_map = request.form.get('pageMap') or None
+        shard_size = parse_shard_size(request.form.get('shardSize'))
+        incremental = request.form.get('incremental', 'false').lower() == 'true'
+        workers = parse_workers(request.form.get('workers'))
+        
+        # Sauvegarder tous les CSV
+        csv_paths = []
+        for i, csv_file in enumerate(csv_files):
+            csv_path = os.path.join(temp_dir, secure_filename(csv_file.filename) or f'data_{i}.csv')
+            csv_file.save(csv_path)
+            csv_paths.append(csv_path)
+        source = {'csv_paths': csv_paths}
+        
+        # PDF recto: template enregistré, fichier uploadé ou recto.pdf par défaut
+        pdf_path = resolve_template(request.form.get('templateId'), pdf_file, temp_dir)
+    
+    if page_map is not None:
+        # Pages inexistantes signalées avant la génération (template déjà analysé par le cache)
+        parse_page_map(page_map, len(load_template(pdf_path).pages))
+    
+    return dict(
+        source,
+        pdf_path=pdf_path,
+        single_file=single_file,
+        overlay=overlay,
+        page_map=page_map,
+        shard_size=shard_size,
+        incremental=incremental,
+        name_position=name_position,
+        address_position=address_position,
+        workers=workers
+    )
+
+
+def start_generation(generation, output_dir, **options):
+    """
+    Crée le générateur de PDFs d'une requête analysée par parse_generation_request:
+    generate_entry_pdfs pour des données JSON ou JSON Lines, generate_pdfs pour des
+    CSV uploadés.
+    
+    Args:
+        generation: Dictionnaire retourné par parse_generation_request
+        output_dir: Dossier de sortie
+        **options: progress, log, metrics (voir generate_entry_pdfs)
+    """
+    generation = dict(generation, output_dir=output_dir, verso_cache=VERSO_CACHE, **options)
+    if 'ndjson' in generation:
+        rows = iter_ndjson_rows(generation.pop('ndjson'), generation.get('log', print))
+        return generate_entry_pdfs(rows, **generation)
+    if 'entries' in generation:
+        return generate_entry_pdfs(generation.pop('entries'), **generation)
+    return generate_pdfs(generation.pop('csv_paths'), **generation)
+
+
+def start_validation(generation, **options):
+    """
+    Valide la mise en page d'une requête analysée par parse_generation_request
+    (validate_entries_layout ou validate_csv_layout), sans créer de PDF.
+    
+    Args:
+        generation: Dictionnaire retourné par parse_generation_request
+        **options: details, max_entries, log (voir validate_entries_layout)
+    
+    Returns:
+        Rapport de validation
+    """
+    layout = dict(
+        pdf_path=generation['pdf_path'],
+        name_position=generation['name_position'],
+        address_position=generation['address_position'],
+        **options
+    )
+    if 'ndjson' in generation:
+        rows = iter_ndjson_rows(generation['ndjson'], layout.get('log', print))
+        return validate_entries_layout(rows, **layout)
+    if 'entries' in generation:
+        return validate_entries_layout(generation['entries'], **layout)
+    return validate_csv_layout(generation['csv_paths'], **layout)
+
+
+def _move_to_zip(zipf, pdf_path):
+    zipf.write(pdf_path, pdf_path.name)
+    pdf_path.unlink()
+
+
+def run_generation_job(job, generation):
+    """
+    Génère les PDFs d'un job dans son dossier temporaire.
+    
+    Comme /api/generate, un PDF unique est gardé tel quel, sinon les PDFs sont
+    ajoutés à un ZIP au fur et à mesure de leur création.
+    
+    Returns:
+        (chemin du résultat, nom de téléchargement, type MIME)
+    """
+    output_dir = Path(job.temp_dir) / 'output'
+    output_dir.mkdir(exist_ok=True)
+    zip_path = Path(job.temp_dir) / 'generated_pdfs.zip'
+    job.progress.update(pdfsGenerated=0, rowsDone=0, rowsTotal=None)
+    
+    def progress(rows_done, rows_total):
+        job.progress.update(rowsDone=rows_done, rowsTotal=rows_total)
+    
+    generation_metrics = GenerationMetrics('/api/jobs')
+    first_pdf = None
+    zipf = None
+    try:
+        for pdf_path in start_generation(
+            generation, str(output_dir), progress=progress, log=job.log.append, metrics=generation_metrics
+        ):
+            if pdf_path.suffix == '.pdf':
+                job.progress['pdfsGenerated'] += 1
+            if first_pdf is None:
+                first_pdf = pdf_path
+                continue
+            with generation_metrics.stage('zip'):
+                if zipf is None:
+                    zipf = zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED)
+                    _move_to_zip(zipf, first_pdf)
+                _move_to_zip(zipf, pdf_path)
+    finally:
+        if zipf is not None:
+            with generation_metrics.stage('zip'):
+                zipf.close()
+        generation_metrics.observe()
+    
+    if first_pdf is None:
+        raise ValueError("Aucun PDF n'a été généré.")
+    if zipf is None:
+        return first_pdf, 'generated.pdf', 'application/pdf'
+    return zip_path, 'generated_pdfs.zip', 'application/zip'
+
+
+def _job_response(job):
+    result = job.to_dict()
+    result['statusUrl'] = f'/api/jobs/{job.id}'
+    if job.status == JOB_DONE:
+        result['resultUrl'] = f'/api/jobs/{job.id}/result'
+    return result
+
+
 @app.route('/')
 def index():
     """Serve la page principale."""
@@ -60,11 +552,21 @@ def health():
             'web': '/',
             'preview': '/preview',
             'upload': '/upload',
-            'api': '/api/generate'
+            'api': '/api/generate',
+            'jobs': '/api/jobs',
+            'validate': '/api/validate',
+            'templates': '/api/templates',
+            'metrics': '/metrics'
         }
     })
 
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Métriques au format texte Prometheus - accessible sans API key, comme /health."""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
 @app.route('/api/status')
 def api_status():
     """Status de l'API - pour vérifier la configuration."""
@@ -73,58 +575,77 @@ def api_status():
         'api_key_required': REQUIRE_API_KEY,
         'host': request.host,
         'remote_addr': request.remote_addr,
-        'user_agent': request.headers.get('User-Agent')
+        'user_agent': request.headers.get('User-Agent'),
+        'template_cache': TEMPLATE_CACHE.stats(),
+        'preview_cache': PREVIEW_CACHE.stats(),
+        'verso_cache': VERSO_CACHE.stats() if VERSO_CACHE is not None else None,
+        'jobs': JOB_MANAGER.stats()
     })
 
 
 @app.route('/preview', methods=['POST'])
 def preview():
-    """Prévisualise les données des CSV uploadés (concatenés)."""
+    """
+    Prévisualise une page des données des CSV uploadés (concatenés).
+
+    Champs (formulaire ou query string): csvFiles (fichiers CSV) ou uploadId (upload
+    déjà prévisualisé, encore en cache), offset et limit (page demandée), exactTotal
+    (true pour compter toutes les lignes au lieu d'estimer le total).
+    """
     csv_files = request.files.getlist('csvFiles')
-    
-    if not csv_files:
+    upload_id = request.values.get('uploadId')
+
+    if not csv_files and not upload_id:
         return jsonify({'error': 'Aucun fichier CSV fourni.'}), 400
-    
-    temp_dir = tempfile.mkdtemp(prefix='csv_preview_')
-    
+
     try:
-        # Sauvegarder temporairement tous les CSV
-        csv_paths = []
-        for i, csv_file in enumerate(csv_files):
-            csv_path = os.path.join(temp_dir, secure_filename(csv_file.filename) or f'file_{i}.csv')
-            csv_file.save(csv_path)
-            csv_paths.append(csv_path)
-        
-        # Lire et concaténer les CSV
-        all_data, name_column, address_column = read_and_concatenate_csvs(csv_paths)
-        
-        if not all_data:
-            return jsonify({'error': 'Aucune donnée trouvée dans les fichiers CSV.'}), 400
-        
-        # Préparer les données pour la prévisualisation
-        # Les données sont déjà normalisées avec les clés 'name' et 'address'
-        preview_data = []
-        for i, row in enumerate(all_data, start=1):
-            name = row.get('name', '')
-            address = row.get('address', '')
-            preview_data.append({
-                'row': i,
-                'name': name,
-                'address': address
-            })
-        
-        return jsonify({
-            'success': True,
-            'total': len(preview_data),
-            'nameColumn': name_column,
-            'addressColumn': address_column,
-            'data': preview_data
-        })
-        
+        offset, limit = parse_preview_page(request.values.get('offset'), request.values.get('limit'))
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    exact_total = request.values.get('exactTotal', 'false').lower() == 'true'
+
+    if csv_files:
+        temp_dir = tempfile.mkdtemp(prefix='csv_preview_')
+        try:
+            # Enregistrer les CSV (ou retrouver le même upload en cache, d'après son hash)
+            upload = PREVIEW_CACHE.add(
+                csv_files, temp_dir,
+                lambda i, csv_file: f'{i}_{secure_filename(csv_file.filename) or "file.csv"}'
+            )
+        except Exception as exc:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return jsonify({'error': str(exc)}), 500
+    else:
+        upload = PREVIEW_CACHE.get(upload_id)
+        if upload is None:
+            return jsonify({'error': 'Upload inconnu ou expiré, renvoyez les fichiers CSV.'}), 404
+
+    try:
+        page = upload.page(offset, limit, exact_total=exact_total)
     except Exception as exc:
         return jsonify({'error': str(exc)}), 500
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if not upload.rows:
+        return jsonify({'error': 'Aucune donnée trouvée dans les fichiers CSV.'}), 400
+
+    # Les données sont déjà normalisées avec les clés 'name' et 'address'
+    preview_data = [
+        {'row': i, 'name': row.get('name', ''), 'address': row.get('address', '')}
+        for i, row in enumerate(page['rows'], start=offset + 1)
+    ]
+
+    return jsonify({
+        'success': True,
+        'uploadId': upload.id,
+        'offset': offset,
+        'limit': limit,
+        'total': page['total'],
+        'totalExact': page['totalExact'],
+        'hasMore': page['hasMore'],
+        'nameColumn': upload.name_column,
+        'addressColumn': upload.address_column,
+        'data': preview_data
+    })
 
 
 @app.route('/upload', methods=['POST'])
@@ -132,11 +653,14 @@ def upload():
     """Traite les CSV et le PDF envoyés et renvoie un ZIP."""
     csv_files = request.files.getlist('csvFiles')
     pdf_file = request.files.get('pdfFile')
+    template_id = request.form.get('templateId')
     name_position_raw = request.form.get('namePosition')
     address_position_raw = request.form.get('addressPosition')
+    overlay = request.form.get('overlay', 'false').lower() == 'true'
+    page_map = request.form.get('pageMap') or None
 
-    if not csv_files or not pdf_file:
-        return jsonify({'error': 'Les fichiers CSV et PDF sont requis.'}), 400
+    if not csv_files or not (pdf_file or template_id):
+        return jsonify({'error': 'Les fichiers CSV et PDF (ou un templateId) sont requis.'}), 400
 
     try:
         name_position = json.loads(name_position_raw) if name_position_raw else None
@@ -144,7 +668,13 @@ def upload():
     except json.JSONDecodeError as exc:
         return jsonify({'error': f'Position invalide: {exc}'}), 400
 
+    try:
+        workers = parse_workers(request.form.get('workers'))
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+
     temp_dir = tempfile.mkdtemp(prefix='pdf_addresses_')
+    streaming = False
 
     try:
         # Sauvegarder tous les CSV
@@ -154,50 +684,48 @@ def upload():
             csv_file.save(csv_path)
             csv_paths.append(csv_path)
         
-        pdf_path = os.path.join(temp_dir, secure_filename(pdf_file.filename) or 'template.pdf')
-        pdf_file.save(pdf_path)
+        try:
+            pdf_path = resolve_template(template_id, pdf_file, temp_dir)
+        except ValueError as exc:
+            return jsonify({'error': str(exc)}), 400
 
         output_dir = os.path.join(temp_dir, 'output')
         os.makedirs(output_dir, exist_ok=True)
 
-        import io
-        import contextlib
-
+        # Messages propres à cette requête (sans toucher à sys.stdout)
         log_buffer = io.StringIO()
-        with contextlib.redirect_stdout(log_buffer):
-            process_csv_and_pdf(
-                csv_paths, pdf_path, output_dir, 
-                single_file=False, 
-                name_position=name_position, 
-                address_position=address_position
-            )
-        process_log = log_buffer.getvalue()
-
-        zip_buffer = BytesIO()
-        pdf_files = sorted(Path(output_dir).glob('*.pdf'))
+        generation_metrics = GenerationMetrics('/upload')
+        pdf_paths = generate_pdfs(
+            csv_paths, pdf_path, output_dir, 
+            single_file=False, 
+            name_position=name_position, 
+            address_position=address_position,
+            workers=workers,
+            log=partial(print, file=log_buffer),
+            verso_cache=VERSO_CACHE,
+            metrics=generation_metrics,
+            overlay=overlay,
+            page_map=page_map
+        )
+        response = stream_generated_pdfs(
+            pdf_paths, temp_dir, zip_name='pdfs_with_addresses.zip', generation_metrics=generation_metrics
+        )
 
-        if not pdf_files:
+        if response is None:
             return jsonify({
                 'error': "Aucun PDF n'a été généré.",
                 'message': "Vérifiez que votre CSV contient une colonne 'adresse' et que votre PDF est valide.",
-                'log': process_log
+                'log': log_buffer.getvalue()
             }), 400
 
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for pdf_generated in pdf_files:
-                zipf.write(pdf_generated, pdf_generated.name)
-
-        zip_buffer.seek(0)
-        return send_file(
-            zip_buffer,
-            as_attachment=True,
-            download_name='pdfs_with_addresses.zip',
-            mimetype='application/zip'
-        )
+        # Le dossier temporaire sera supprimé à la fin de l'envoi
+        streaming = True
+        return response
     except Exception as exc:  # pylint: disable=broad-except
         return jsonify({'error': str(exc)}), 500
     finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        if not streaming:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 @app.route('/api/generate', methods=['POST'])
@@ -212,133 +740,102 @@ def api_generate():
          "data": [{"name": "...", "address": "..."}, ...],
          "namePosition": {"left": 20, "bottom": 250, "width": 80, "height": 30},
          "addressPosition": {"left": 95, "bottom": 20, "width": 100, "height": 40},
-         "singleFile": false (optionnel)
+         "singleFile": false (optionnel),
+         "overlay": false (optionnel, nom et adresse sur le recto au lieu d'un verso),
+         "pageMap": "last" (optionnel, pages du template qui reçoivent nom et adresse),
+         "shardSize": "1000,50MB" (optionnel, avec singleFile: PDF découpé en morceaux
+                      d'au plus 1000 entrées et/ou 50 Mo, renvoyés dans un ZIP avec
+                      leur manifeste rescto_all_entries_manifest.json),
+         "incremental": false (optionnel, avec singleFile: pages écrites dans le PDF au fur
+                        et à mesure, mémoire du serveur constante),
+         "workers": 4 (optionnel, nombre de processus de rendu)
        }
     
     2. Form-data avec csvFiles (comme /upload)
     
-    Si aucun PDF recto n'est fourni, utilise 'recto.pdf' par défaut.
+    3. JSON Lines (Content-Type: application/x-ndjson), un enregistrement par ligne:
+       {"name": "...", "address": "..."}
+       Les options (singleFile, overlay, pageMap, shardSize, incremental, namePosition, addressPosition, workers) passent
+       par la query string. Le corps est lu au fil de l'eau: les premiers PDFs
+       sont envoyés avant la fin de l'upload.
+    
+    Le recto peut être un template enregistré via /api/templates ("templateId" dans
+    le JSON, le form-data ou la query string). Si aucun PDF recto n'est fourni,
+    utilise 'recto.pdf' par défaut (analysé une seule fois au démarrage).
     """
     temp_dir = tempfile.mkdtemp(prefix='api_pdf_')
+    streaming = False
     
     try:
-        # Vérifier si c'est une requête JSON ou form-data
-        if request.is_json:
-            # Mode JSON: données directes
-            data = request.get_json()
-            
-            if not data or 'data' not in data:
-                return jsonify({'error': 'Le champ "data" est requis'}), 400
-            
-            entries = data.get('data', [])
-            name_position = data.get('namePosition')
-            address_position = data.get('addressPosition')
-            single_file = data.get('singleFile', False)
-            
-            # Créer un CSV temporaire à partir des données JSON
-            csv_path = os.path.join(temp_dir, 'data.csv')
-            with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=['name', 'address'])
-                writer.writeheader()
-                for entry in entries:
-                    writer.writerow({
-                        'name': entry.get('name', ''),
-                        'address': entry.get('address', '')
-                    })
-            
-            csv_paths = [csv_path]
-            
-            # Utiliser recto.pdf par défaut
-            default_pdf = Path(__file__).parent / 'recto.pdf'
-            if not default_pdf.exists():
-                default_pdf = Path(__file__).parent / 'rescto.pdf'
-            
-            pdf_path = os.path.join(temp_dir, 'recto.pdf')
-            shutil.copy(str(default_pdf), pdf_path)
-            
-        else:
-            # Mode form-data: CSV uploadés
-            csv_files = request.files.getlist('csvFiles')
-            pdf_file = request.files.get('pdfFile')
-            
-            if not csv_files:
-                return jsonify({'error': 'Aucun fichier CSV ou données fournis'}), 400
-            
-            name_position_raw = request.form.get('namePosition')
-            address_position_raw = request.form.get('addressPosition')
-            single_file = request.form.get('singleFile', 'false').lower() == 'true'
-            
-            try:
-                name_position = json.loads(name_position_raw) if name_position_raw else None
-                address_position = json.loads(address_position_raw) if address_position_raw else None
-            except json.JSONDecodeError as exc:
-                return jsonify({'error': f'Position invalide: {exc}'}), 400
-            
-            # Sauvegarder tous les CSV
-            csv_paths = []
-            for i, csv_file in enumerate(csv_files):
-                csv_path = os.path.join(temp_dir, secure_filename(csv_file.filename) or f'data_{i}.csv')
-                csv_file.save(csv_path)
-                csv_paths.append(csv_path)
-            
-            # PDF recto: utiliser le fichier uploadé ou recto.pdf par défaut
-            if pdf_file:
-                pdf_path = os.path.join(temp_dir, secure_filename(pdf_file.filename) or 'recto.pdf')
-                pdf_file.save(pdf_path)
-            else:
-                default_pdf = Path(__file__).parent / 'recto.pdf'
-                if not default_pdf.exists():
-                    default_pdf = Path(__file__).parent / 'rescto.pdf'
-                pdf_path = os.path.join(temp_dir, 'recto.pdf')
-                shutil.copy(str(default_pdf), pdf_path)
+        try:
+            generation = parse_generation_request(temp_dir)
+        except ValueError as exc:
+            return jsonify({'error': str(exc)}), 400
         
         # Générer les PDFs
         output_dir = os.path.join(temp_dir, 'output')
         os.makedirs(output_dir, exist_ok=True)
         
-        import io
-        import contextlib
-        
+        # Messages propres à cette requête (sans toucher à sys.stdout)
         log_buffer = io.StringIO()
-        with contextlib.redirect_stdout(log_buffer):
-            process_csv_and_pdf(
-                csv_paths, pdf_path, output_dir,
-                single_file=single_file,
-                name_position=name_position,
-                address_position=address_position
-            )
-        process_log = log_buffer.getvalue()
-        
-        pdf_files = sorted(Path(output_dir).glob('*.pdf'))
+        generation_metrics = GenerationMetrics('/api/generate')
+        pdf_paths = start_generation(
+            generation, output_dir, log=partial(print, file=log_buffer), metrics=generation_metrics
+        )
+        # Si un seul fichier est généré, il est retourné directement, sinon dans un ZIP
+        response = stream_generated_pdfs(
+            pdf_paths, temp_dir, zip_name='generated_pdfs.zip', pdf_name='generated.pdf',
+            generation_metrics=generation_metrics
+        )
         
-        if not pdf_files:
+        if response is None:
             return jsonify({
                 'error': "Aucun PDF n'a été généré.",
-                'log': process_log
+                'log': log_buffer.getvalue()
             }), 400
         
-        # Si un seul fichier généré, le retourner directement
-        if len(pdf_files) == 1:
-            return send_file(
-                pdf_files[0],
-                as_attachment=True,
-                download_name='generated.pdf',
-                mimetype='application/pdf'
-            )
+        # Le dossier temporaire sera supprimé à la fin de l'envoi
+        streaming = True
+        return response
         
-        # Sinon, créer un ZIP
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for pdf_file in pdf_files:
-                zipf.write(pdf_file, pdf_file.name)
+    except Exception as exc:
+        return jsonify({'error': str(exc)}), 500
+    finally:
+        if not streaming:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@app.route('/api/validate', methods=['POST'])
+@require_api_key
+def api_validate():
+    """
+    Validation à blanc: mêmes données que /api/generate, mais seule la mise en page
+    est calculée (aucun PDF n'est créé). Retourne un rapport JSON: zones, lignes qui
+    débordent de leur zone (overflowRows) et boîtes des lignes des entrées concernées.
+    
+    Options (JSON, form-data ou query string): "details" (true: boîtes des lignes de
+    toutes les entrées) et "maxEntries" (nombre maximal d'entrées détaillées).
+    """
+    temp_dir = tempfile.mkdtemp(prefix='api_pdf_')
+    
+    try:
+        try:
+            generation = parse_generation_request(temp_dir)
+            options = request.get_json() if request.is_json else request.values
+            details = str(options.get('details', 'false')).lower() == 'true'
+            try:
+                max_entries = int(options.get('maxEntries', VALIDATION_MAX_ENTRIES))
+            except (TypeError, ValueError):
+                raise ValueError(f'Champ "maxEntries" invalide: {options.get("maxEntries")!r}')
+        except ValueError as exc:
+            return jsonify({'error': str(exc)}), 400
         
-        zip_buffer.seek(0)
-        return send_file(
-            zip_buffer,
-            as_attachment=True,
-            download_name='generated_pdfs.zip',
-            mimetype='application/zip'
+        log_buffer = io.StringIO()
+        report = start_validation(
+            generation, details=details, max_entries=max_entries, log=partial(print, file=log_buffer)
         )
+        report['log'] = log_buffer.getvalue()
+        return jsonify(report)
         
     except Exception as exc:
         return jsonify({'error': str(exc)}), 500
@@ -346,6 +843,141 @@ def api_generate():
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+def _template_info(template_id, template):
+    return {
+        'templateId': template_id,
+        'pageCount': len(template.pages),
+        'pageWidth': template.page_width,
+        'pageHeight': template.page_height
+    }
+
+
+@app.route('/api/templates', methods=['POST'])
+@require_api_key
+def api_register_template():
+    """
+    Enregistre un PDF recto côté serveur et retourne son identifiant (hash SHA-256
+    du contenu), à passer ensuite dans le champ "templateId" des générations.
+    
+    Accepte un form-data avec pdfFile, ou le PDF brut (Content-Type: application/pdf).
+    Enregistrer deux fois le même PDF retourne le même identifiant.
+    """
+    pdf_file = request.files.get('pdfFile')
+    data = pdf_file.read() if pdf_file else request.get_data()
+    if not data:
+        return jsonify({'error': 'Aucun PDF fourni (pdfFile ou corps application/pdf).'}), 400
+    
+    try:
+        template_id, template = TEMPLATE_STORE.add(data)
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    
+    return jsonify(_template_info(template_id, template)), 201
+
+
+@app.route('/api/templates/<template_id>')
+@require_api_key
+def api_template_info(template_id):
+    """Informations sur un template enregistré."""
+    pdf_path = TEMPLATE_STORE.path(template_id)
+    if pdf_path is None:
+        return jsonify({'error': 'Template introuvable'}), 404
+    return jsonify(_template_info(template_id, load_template(pdf_path)))
+
+
+@app.route('/api/jobs', methods=['POST'])
+@require_api_key
+def api_create_job():
+    """
+    Lance une génération en arrière-plan et retourne immédiatement son identifiant.
+    
+    Accepte les mêmes données que /api/generate (JSON ou form-data). L'état du job
+    se suit avec GET /api/jobs/<id>, le résultat se télécharge avec
+    GET /api/jobs/<id>/result une fois le job terminé.
+    """
+    temp_dir = tempfile.mkdtemp(prefix='api_job_')
+    
+    try:
+        generation = parse_generation_request(temp_dir, spool_body=True)
+        job = JOB_MANAGER.submit(lambda job: run_generation_job(job, generation), temp_dir)
+    except ValueError as exc:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return jsonify({'error': str(exc)}), 400
+    except JobQueueFullError as exc:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return jsonify({'error': str(exc)}), 503
+    except Exception as exc:  # pylint: disable=broad-except
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return jsonify({'error': str(exc)}), 500
+    
+    return jsonify(_job_response(job)), 202, {'Location': f'/api/jobs/{job.id}'}
+
+
+@app.route('/api/jobs/<job_id>')
+@require_api_key
+def api_job_status(job_id):
+    """État et progression d'un job."""
+    job = JOB_MANAGER.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job introuvable ou expiré'}), 404
+    return jsonify(_job_response(job))
+
+
+@app.route('/api/jobs/<job_id>/events')
+@require_api_key
+def api_job_events(job_id):
+    """
+    Flux Server-Sent Events de la progression d'un job.
+    
+    Un événement "progress" est envoyé à chaque changement (status, rowsDone,
+    rowsTotal, pdfsGenerated), puis un événement "end" avec l'état final du job.
+    """
+    job = JOB_MANAGER.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job introuvable ou expiré'}), 404
+    
+    def format_event(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    def generate():
+        last_state = None
+        while job.status not in (JOB_DONE, JOB_ERROR):
+            state = dict(job.progress, status=job.status)
+            if state != last_state:
+                last_state = state
+                yield format_event('progress', state)
+            time.sleep(SSE_POLL_INTERVAL)
+        yield format_event('progress', dict(job.progress, status=job.status))
+        yield format_event('end', _job_response(job))
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/jobs/<job_id>/result')
+@require_api_key
+def api_job_result(job_id):
+    """Télécharge le résultat d'un job terminé (PDF unique ou ZIP)."""
+    job = JOB_MANAGER.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job introuvable ou expiré'}), 404
+    if job.status != JOB_DONE:
+        return jsonify({
+            'error': "Le job n'est pas terminé avec succès.",
+            'status': job.status,
+            'jobError': job.error
+        }), 409
+    return send_file(
+        job.result_path,
+        mimetype=job.mimetype,
+        as_attachment=True,
+        download_name=job.download_name
+    )
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8002))
     host = os.environ.get('HOST', '0.0.0.0')  # 0.0.0.0 = accessible depuis n'importe quelle IP
@@ -364,6 +996,7 @@ if __name__ == '__main__':
     print(f"   Local:    http://localhost:{port}")
     print(f"   Network:  http://<YOUR_IP>:{port}")
     print(f"   API:      http://<YOUR_IP>:{port}/api/generate")
+    print(f"   Jobs:     http://<YOUR_IP>:{port}/api/jobs")
     print("\n⚠️  ATTENTION: Serveur accessible depuis l'extérieur!")
     print("   Assurez-vous d'avoir une sécurité appropriée.\n")
     
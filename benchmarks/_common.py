@@ -0,0 +1,92 @@
+"""
+Utilitaires partagés par les scripts de benchmark: données synthétiques, chronométrage
+et export du code d'une révision git.
+"""
+
+import csv
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Rendre les modules du dépôt importables depuis benchmarks/
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+TEMPLATES = {
+    'recto': ROOT_DIR / 'recto.pdf',
+    'rescto': ROOT_DIR / 'rescto.pdf',
+}
+
+# Fichiers du dépôt copiés par export_revision (modules et templates par défaut)
+REPO_FILES = (
+    'app.py', 'add_addresses_to_pdf.py', 'incremental_pdf.py', 'run_manifest.py', 'text_layout.py', 'jobs.py',
+    'verso_cache.py', 'metrics.py', 'preview_cache.py', 'recto.pdf', 'rescto.pdf'
+)
+
+SHORT_ADDRESS = "{i} Rue de la République\n75001 Paris\nFrance"
+LONG_ADDRESS = (
+    "Bâtiment {i}, Résidence des Grands Chênes, Escalier C, Appartement 42, "
+    "Entrée par la cour intérieure après le portail vert\n"
+    "{i} Boulevard du Maréchal de Lattre de Tassigny Prolongé\n"
+    "Zone d'Activités Commerciales du Val de Seine Nord\n"
+    "75001 Paris Cedex 01\nFrance"
+)
+
+
+def make_entries(count, long_addresses=False):
+    """
+    Génère des tuples (name, address) synthétiques.
+    
+    Args:
+        count: Nombre d'entrées
+        long_addresses: Si True, utilise des adresses longues (plusieurs retours à la ligne)
+    """
+    template = LONG_ADDRESS if long_addresses else SHORT_ADDRESS
+    return [(f"Destinataire {i}", template.format(i=i)) for i in range(1, count + 1)]
+
+
+def write_csv(path, count, delimiter=',', long_addresses=False):
+    """
+    Écrit un CSV synthétique avec les colonnes 'name' et 'address'.
+    
+    Returns:
+        Le chemin du fichier écrit
+    """
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile, delimiter=delimiter)
+        writer.writerow(['name', 'address'])
+        for name, address in make_entries(count, long_addresses):
+            writer.writerow([name, address])
+    return path
+
+
+def timed(func, *args, **kwargs):
+    """
+    Exécute func et retourne (résultat, durée en secondes).
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def rows_per_sec(rows, seconds):
+    """Débit en lignes par seconde (0 si la durée est nulle)."""
+    return rows / seconds if seconds > 0 else 0.0
+
+
+def export_revision(revision, target_dir):
+    """
+    Copie dans target_dir les fichiers du dépôt tels qu'ils étaient à une révision git
+    (les fichiers absents à cette révision sont ignorés).
+    """
+    for filename in REPO_FILES:
+        result = subprocess.run(
+            ['git', 'show', f'{revision}:{filename}'],
+            cwd=ROOT_DIR, capture_output=True
+        )
+        if result.returncode == 0:
+            (Path(target_dir) / filename).write_bytes(result.stdout)
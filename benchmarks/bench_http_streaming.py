@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Mesure le temps jusqu'au premier octet (TTFB), la durée totale et le pic mémoire (RSS)
+d'une requête /upload ou /api/generate, via le client de test Flask.
+
+Chaque mesure tourne dans un processus séparé. Avec --ref, la même mesure est faite sur
+app.py et add_addresses_to_pdf.py tels qu'ils étaient à une révision git donnée.
+
+Usage: python benchmarks/bench_http_streaming.py [--rows N] [--ref REVISION]
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from _common import ROOT_DIR, TEMPLATES, export_revision, write_csv
+
+SCENARIOS = [
+    ('/upload', {}),
+    ('/api/generate', {'singleFile': 'false'}),
+    ('/api/generate', {'singleFile': 'true'}),
+]
+
+
+def measure(code_dir, endpoint, form, csv_path, template_path, queue):
+    sys.path.insert(0, str(code_dir))
+    import app as app_module
+
+    client = app_module.app.test_client()
+    data = dict(form)
+    data['csvFiles'] = (open(csv_path, 'rb'), 'data.csv')
+    data['pdfFile'] = (open(template_path, 'rb'), 'template.pdf')
+
+    start = time.perf_counter()
+    response = client.post(endpoint, data=data, buffered=False)
+    chunks = iter(response.response)
+    first_chunk = next(chunks, b'')
+    ttfb = time.perf_counter() - start
+    size = len(first_chunk) + sum(len(chunk) for chunk in chunks)
+    total = time.perf_counter() - start
+    response.close()
+
+    # ru_maxrss est en kilo-octets sous Linux
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((response.status_code, ttfb, total, size, peak_kb))
+
+
+def run_scenarios(label, code_dir, csv_path, template_path):
+    context = get_context('spawn')
+    for endpoint, form in SCENARIOS:
+        queue = context.Queue()
+        process = context.Process(
+            target=measure, args=(code_dir, endpoint, form, csv_path, template_path, queue)
+        )
+        process.start()
+        status, ttfb, total, size, peak_kb = queue.get()
+        process.join()
+        mode = 'single' if form.get('singleFile') == 'true' else 'zip'
+        print(f"{label:>10} {endpoint:<14} {mode:<6} HTTP {status} "
+              f"TTFB {ttfb:>7.2f}s total {total:>7.2f}s "
+              f"{size / 1024:>9.0f} Ko pic RSS {peak_kb / 1024:>6.1f} Mo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=300)
+    parser.add_argument('--ref', help="Révision git à comparer (ex: HEAD~1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_http_') as temp_dir:
+        csv_path = write_csv(Path(temp_dir) / 'data.csv', args.rows)
+        template_path = TEMPLATES['rescto']
+
+        run_scenarios('actuel', ROOT_DIR, csv_path, template_path)
+        if args.ref:
+            ref_dir = Path(temp_dir) / 'ref'
+            ref_dir.mkdir()
+            export_revision(args.ref, ref_dir)
+            run_scenarios(args.ref, ref_dir, csv_path, template_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compare le pic mémoire (RSS) et le débit du PDF unique écrit par PdfWriter (tout le
+document en mémoire jusqu'à la fin) et par IncrementalPdfWriter (option incremental:
+pages écrites au fur et à mesure). Avec incremental, le pic doit rester à peu près
+stable quand le nombre de lignes augmente.
+
+Chaque mesure est faite dans un processus séparé pour que les pics ne s'additionnent pas.
+
+Usage: python benchmarks/bench_incremental_writer.py [nombre_de_lignes ...]
+"""
+
+import contextlib
+import io
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from _common import TEMPLATES, rows_per_sec, write_csv
+
+
+def run_and_measure(csv_path, template_path, output_dir, incremental, queue):
+    from add_addresses_to_pdf import process_csv_and_pdf
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_csv_and_pdf([csv_path], template_path, output_dir, single_file=True, incremental=incremental)
+    elapsed = time.perf_counter() - start
+    output_size = (Path(output_dir) / "rescto_all_entries.pdf").stat().st_size
+    # ru_maxrss est en kilo-octets sous Linux
+    queue.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, elapsed, output_size))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2000, 8000, 20000]
+    template_path = TEMPLATES['rescto']
+    context = get_context('spawn')
+
+    print(f"{'lignes':>7} {'writer':>12} {'pic RSS (Mo)':>13} {'lignes/s':>9} {'taille (o)':>11}")
+    with tempfile.TemporaryDirectory(prefix='bench_incremental_') as temp_dir:
+        for size in sizes:
+            csv_path = write_csv(Path(temp_dir) / f"data_{size}.csv", size)
+            for incremental in (False, True):
+                output_dir = Path(temp_dir) / f"out_{size}_{incremental}"
+                queue = context.Queue()
+                process = context.Process(
+                    target=run_and_measure, args=(csv_path, template_path, output_dir, incremental, queue)
+                )
+                process.start()
+                peak_kb, elapsed, output_size = queue.get()
+                process.join()
+                label = 'incremental' if incremental else 'PdfWriter'
+                print(f"{size:>7} {label:>12} {peak_kb / 1024:>13.1f} {rows_per_sec(size, elapsed):>9.0f} "
+                      f"{output_size:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Mesure la latence de /api/generate en mode JSON pour des requêtes de 1, 100 et 10 000 entrées.
+
+Deux mesures par taille:
+- la préparation des entrées seule: passage par un CSV temporaire (écriture, Sniffer,
+  détection des colonnes, relecture) comparé aux données JSON passées directement;
+- la requête complète (PDF unique), via le client de test Flask, dans un processus
+  séparé. Avec --ref, la même requête est mesurée sur le code d'une révision git.
+
+Usage: python benchmarks/bench_json_latency.py [--sizes 1,100,10000] [--repeat N] [--ref REVISION]
+"""
+
+import argparse
+import csv
+import statistics
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from _common import ROOT_DIR, export_revision, make_entries
+
+
+def make_payload(size):
+    return {
+        'data': [{'name': name, 'address': address} for name, address in make_entries(size)],
+        'singleFile': True
+    }
+
+
+def prepare_via_csv(data, temp_dir):
+    from add_addresses_to_pdf import _iter_csv_rows_with_log, iter_entries
+
+    csv_path = Path(temp_dir) / 'data.csv'
+    with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['name', 'address'])
+        writer.writeheader()
+        for entry in data:
+            writer.writerow({'name': entry.get('name', ''), 'address': entry.get('address', '')})
+    log = lambda message: None
+    return sum(1 for _ in iter_entries(_iter_csv_rows_with_log([csv_path], log), log))
+
+
+def prepare_direct(data):
+    from add_addresses_to_pdf import iter_entries
+
+    rows = [{'name': entry.get('name', ''), 'address': entry.get('address', '')} for entry in data]
+    return sum(1 for _ in iter_entries(rows, lambda message: None))
+
+
+def median_time(func, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def measure_requests(code_dir, sizes, repeat, queue):
+    sys.path.insert(0, str(code_dir))
+    import app as app_module
+
+    client = app_module.app.test_client()
+
+    def request(payload):
+        response = client.post('/api/generate', json=payload)
+        size = len(response.data)
+        response.close()
+        return size
+
+    # Première requête: imports et analyse du template hors mesure
+    request(make_payload(1))
+    results = {}
+    for size in sizes:
+        payload = make_payload(size)
+        results[size] = median_time(lambda: request(payload), repeat)
+    queue.put(results)
+
+
+def run_requests(code_dir, sizes, repeat):
+    context = get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=measure_requests, args=(code_dir, sizes, repeat, queue))
+    process.start()
+    results = queue.get()
+    process.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1,100,10000')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--ref', help="Révision git à comparer (ex: HEAD~1)")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print("Préparation des entrées (médiane):")
+    with tempfile.TemporaryDirectory(prefix='bench_json_') as temp_dir:
+        for size in sizes:
+            data = make_payload(size)['data']
+            via_csv = median_time(lambda: prepare_via_csv(data, temp_dir), args.repeat)
+            direct = median_time(lambda: prepare_direct(data), args.repeat)
+            print(f"{size:>7} entrées: CSV temporaire {via_csv * 1000:>9.2f} ms, "
+                  f"direct {direct * 1000:>9.2f} ms")
+
+        print("\nRequête /api/generate complète (médiane):")
+        labels = [('actuel', ROOT_DIR)]
+        if args.ref:
+            ref_dir = Path(temp_dir) / 'ref'
+            ref_dir.mkdir()
+            export_revision(args.ref, ref_dir)
+            labels.append((args.ref, ref_dir))
+        for label, code_dir in labels:
+            results = run_requests(code_dir, sizes, args.repeat)
+            for size in sizes:
+                print(f"{label:>10} {size:>7} entrées: {results[size] * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
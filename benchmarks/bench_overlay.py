@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compare le mode overlay (nom et adresse imprimés sur la première page du template,
+add_overlay_page) à l'ajout d'une page verso après le recto (mode par défaut).
+
+Deux mesures par template et par nombre de lignes:
+- écriture: construction et écriture du PDF unique à partir de versos déjà rendus;
+- bout en bout: process_entries en mode PDF unique.
+
+Usage: python benchmarks/bench_overlay.py [nombre_de_lignes ...]
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import TEMPLATES, make_entries, rows_per_sec, timed
+
+from PyPDF2 import PdfWriter
+from add_addresses_to_pdf import (
+    VERSO_BATCH_SIZE, add_overlay_page, add_shared_page, create_verso_pages, iter_chunks, load_template,
+    process_entries
+)
+
+
+def render_versos(template, entries):
+    return [
+        page
+        for batch in iter_chunks(entries, VERSO_BATCH_SIZE)
+        for page in create_verso_pages(template.page_width, template.page_height, batch)
+    ]
+
+
+def write_single_file(template, verso_pages, overlay):
+    writer = PdfWriter()
+    shared_recto = None
+    for verso_page in verso_pages:
+        if overlay:
+            add_overlay_page(writer, template, verso_page)
+        else:
+            shared_recto = add_shared_page(writer, template.pages[0], shared_recto)
+            writer.add_page(verso_page)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.tell()
+
+
+def generate(template_path, rows, output_dir, overlay):
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_entries(rows, template_path, output_dir, single_file=True, overlay=overlay)
+    return (Path(output_dir) / "rescto_all_entries.pdf").stat().st_size
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+
+    print(f"{'template':>8} {'lignes':>7} {'mesure':>12} {'verso (l/s)':>12} {'overlay (l/s)':>14} "
+          f"{'gain':>6} {'verso (o)':>10} {'overlay (o)':>12}")
+    with tempfile.TemporaryDirectory(prefix='bench_overlay_') as temp_dir:
+        for label, template_path in TEMPLATES.items():
+            template = load_template(template_path)
+            for size in sizes:
+                entries = make_entries(size)
+                verso_pages = render_versos(template, entries)
+                rows = [{'name': name, 'address': address} for name, address in entries]
+
+                measures = {}
+                for overlay in (False, True):
+                    write_size, write_time = timed(write_single_file, template, verso_pages, overlay)
+                    output_dir = Path(temp_dir) / f"{label}_{size}_{overlay}"
+                    output_size, total_time = timed(generate, template_path, rows, output_dir, overlay)
+                    measures[overlay] = {
+                        'écriture': (rows_per_sec(size, write_time), write_size),
+                        'bout en bout': (rows_per_sec(size, total_time), output_size),
+                    }
+
+                for measure in ('écriture', 'bout en bout'):
+                    (verso_rate, verso_size), (overlay_rate, overlay_size) = (
+                        measures[False][measure], measures[True][measure]
+                    )
+                    print(f"{label:>8} {size:>7} {measure:>12} {verso_rate:>12.0f} {overlay_rate:>14.0f} "
+                          f"{overlay_rate / verso_rate:>5.2f}x {verso_size:>10} {overlay_size:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks reproductible du pipeline de génération, étape par étape.
+
+Étapes mesurées, sur des CSV synthétiques (1k, 10k et 100k lignes par défaut,
+adresses courtes et longues):
+- read_csv: read_and_concatenate_csvs, pour chaque délimiteur (',', ';', tabulation);
+- read_csv_parallel: iter_csv_rows_parallel (fichier découpé en morceaux lus par plusieurs
+  processus), à comparer à read_csv;
+- layout: découpage et positionnement du nom et de l'adresse (text_layout.layout_text);
+- render_verso: create_blank_page_with_name_and_address (un canvas par ligne);
+- render_verso_batch: create_verso_pages (un canvas par lot, chemin de production);
+- render_verso_direct: create_verso_pages avec le rendu 'direct' (flux de contenu écrit
+  sans ReportLab), à comparer à render_verso_batch;
+- pdf_write: PdfWriter.write d'un PDF unique (recto + verso par ligne), par template;
+- zip: empaquetage ZIP des PDFs par ligne tel que fait par app.py (_iter_zip_stream);
+- end_to_end: process_csv_and_pdf en mode PDF unique et un PDF par ligne, avec une page verso
+  ajoutée ou en mode overlay (nom et adresse sur le recto), par template.
+
+Chaque scénario tourne dans un processus séparé: le pic mémoire (RSS) mesuré est le sien.
+Les scénarios qui écrivent un fichier par ligne (end_to_end par ligne, zip) sont limités
+à --per-file-max-rows lignes (chaque PDF par ligne contient tout le recto).
+
+Les résultats (lignes/s, durée, pic RSS) sont écrits en JSON; la commande compare signale
+les scénarios plus lents (ou plus gourmands en mémoire) qu'une référence enregistrée.
+
+Usage:
+    python benchmarks/bench_pipeline.py run [--sizes 1000,10000,100000] [--stages read_csv,layout]
+                                            [--output resultats.json]
+    python benchmarks/bench_pipeline.py compare reference.json resultats.json [--threshold 0.10]
+"""
+
+import argparse
+import io
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+from _common import ROOT_DIR, TEMPLATES, make_entries, rows_per_sec, write_csv
+
+DELIMITERS = {'comma': ',', 'semicolon': ';', 'tab': '\t'}
+LENGTHS = {'short': False, 'long': True}
+MODES = ('single', 'per_row', 'single_overlay', 'per_row_overlay')
+STAGES = (
+    'read_csv', 'read_csv_parallel', 'layout', 'render_verso', 'render_verso_batch', 'render_verso_direct', 'pdf_write', 'zip',
+    'end_to_end'
+)
+
+# Processus de lecture mesurés par read_csv_parallel
+PARALLEL_READ_WORKERS = (1, 4)
+
+DEFAULT_SIZES = '1000,10000,100000'
+DEFAULT_PER_FILE_MAX_ROWS = 1000
+DEFAULT_THRESHOLD = 0.10
+
+
+def _quiet(message):
+    pass
+
+
+def _template_size(template_name):
+    from add_addresses_to_pdf import load_template
+
+    template = load_template(TEMPLATES[template_name])
+    return template.page_width, template.page_height
+
+
+# Étapes: chaque fonction reçoit les paramètres du scénario et son dossier de travail,
+# et retourne (lignes traitées, durée en secondes, informations supplémentaires)
+
+def stage_read_csv(params, work_dir):
+    from add_addresses_to_pdf import read_and_concatenate_csvs
+
+    start = time.perf_counter()
+    rows, _, _ = read_and_concatenate_csvs([params['csv_path']])
+    return len(rows), time.perf_counter() - start, {}
+
+
+def stage_read_csv_parallel(params, work_dir):
+    from add_addresses_to_pdf import CSV_CHUNK_BYTES, iter_csv_rows_parallel
+
+    start = time.perf_counter()
+    # Morceaux plus petits que par défaut pour que les petits CSV soient aussi découpés
+    row_count = sum(1 for _ in iter_csv_rows_parallel(
+        [params['csv_path']], params['workers'], _quiet, chunk_bytes=min(CSV_CHUNK_BYTES, 256 * 1024)
+    ))
+    return row_count, time.perf_counter() - start, {}
+
+
+def stage_layout(params, work_dir):
+    from reportlab.lib.units import mm
+    from text_layout import layout_text
+
+    entries = make_entries(params['rows'], LENGTHS[params['length']])
+    start = time.perf_counter()
+    line_count = 0
+    for name, address in entries:
+        # Mêmes zones par défaut que _draw_name_and_address sur A4 (nom 80 mm, adresse 100 mm)
+        line_count += len(layout_text(name, 80 * mm, 250 * mm, 4 * mm, 20 * mm, 195 * mm))
+        line_count += len(layout_text(address, 100 * mm, 20 * mm, 4 * mm, 95 * mm, 195 * mm))
+    return len(entries), time.perf_counter() - start, {'lines': line_count}
+
+
+def stage_render_verso(params, work_dir):
+    from add_addresses_to_pdf import create_blank_page_with_name_and_address
+
+    page_width, page_height = _template_size(params['template'])
+    entries = make_entries(params['rows'], LENGTHS[params['length']])
+    start = time.perf_counter()
+    for name, address in entries:
+        create_blank_page_with_name_and_address(page_width, page_height, name, address)
+    return len(entries), time.perf_counter() - start, {}
+
+
+def _render_verso_batches(params, verso_backend):
+    from add_addresses_to_pdf import VERSO_BATCH_SIZE, create_verso_pages, iter_chunks
+
+    page_width, page_height = _template_size(params['template'])
+    entries = make_entries(params['rows'], LENGTHS[params['length']])
+    start = time.perf_counter()
+    for batch in iter_chunks(entries, VERSO_BATCH_SIZE):
+        create_verso_pages(page_width, page_height, batch, verso_backend=verso_backend)
+    return len(entries), time.perf_counter() - start, {}
+
+
+def stage_render_verso_batch(params, work_dir):
+    return _render_verso_batches(params, 'reportlab')
+
+
+def stage_render_verso_direct(params, work_dir):
+    return _render_verso_batches(params, 'direct')
+
+
+def stage_pdf_write(params, work_dir):
+    from PyPDF2 import PdfWriter
+    from add_addresses_to_pdf import (
+        VERSO_BATCH_SIZE, add_shared_page, create_verso_pages, forget_imported_objects, iter_chunks,
+        load_template
+    )
+
+    template = load_template(TEMPLATES[params['template']])
+    entries = make_entries(params['rows'], LENGTHS[params['length']])
+    # Construction du PDF unique hors mesure, comme _write_single_file
+    writer = PdfWriter()
+    shared_recto = None
+    for batch in iter_chunks(entries, VERSO_BATCH_SIZE):
+        verso_pages = create_verso_pages(template.page_width, template.page_height, batch)
+        for verso_page in verso_pages:
+            shared_recto = add_shared_page(writer, template.pages[0], shared_recto)
+            writer.add_page(verso_page)
+        forget_imported_objects(writer, verso_pages[0].pdf)
+
+    output = io.BytesIO()
+    start = time.perf_counter()
+    writer.write(output)
+    return len(entries), time.perf_counter() - start, {'output_bytes': output.tell()}
+
+
+def stage_zip(params, work_dir):
+    from add_addresses_to_pdf import create_blank_page_with_name_and_address, load_template, write_entry_pdf
+    from app import _iter_zip_stream
+
+    template = load_template(TEMPLATES[params['template']])
+    entries = make_entries(params['rows'], LENGTHS[params['length']])
+    # Un PDF par ligne, copié du premier (même taille et même contenu à compresser)
+    name, address = entries[0]
+    first_pdf = Path(work_dir) / "rescto_with_address_1.pdf"
+    write_entry_pdf(
+        template,
+        create_blank_page_with_name_and_address(template.page_width, template.page_height, name, address),
+        first_pdf
+    )
+    pdf_paths = [first_pdf]
+    for row_num in range(2, len(entries) + 1):
+        pdf_path = Path(work_dir) / f"rescto_with_address_{row_num}.pdf"
+        shutil.copyfile(first_pdf, pdf_path)
+        pdf_paths.append(pdf_path)
+
+    start = time.perf_counter()
+    output_bytes = sum(len(chunk) for chunk in _iter_zip_stream(pdf_paths))
+    return len(entries), time.perf_counter() - start, {'output_bytes': output_bytes}
+
+
+def stage_end_to_end(params, work_dir):
+    from add_addresses_to_pdf import process_csv_and_pdf
+
+    output_dir = Path(work_dir) / 'output'
+    start = time.perf_counter()
+    process_csv_and_pdf(
+        [params['csv_path']], TEMPLATES[params['template']], output_dir,
+        single_file=params['mode'].startswith('single'), log=_quiet,
+        overlay=params['mode'].endswith('_overlay')
+    )
+    elapsed = time.perf_counter() - start
+    output_bytes = sum(path.stat().st_size for path in output_dir.iterdir())
+    return params['rows'], elapsed, {'output_bytes': output_bytes}
+
+
+STAGE_FUNCTIONS = {
+    'read_csv': stage_read_csv,
+    'read_csv_parallel': stage_read_csv_parallel,
+    'layout': stage_layout,
+    'render_verso': stage_render_verso,
+    'render_verso_batch': stage_render_verso_batch,
+    'render_verso_direct': stage_render_verso_direct,
+    'pdf_write': stage_pdf_write,
+    'zip': stage_zip,
+    'end_to_end': stage_end_to_end,
+}
+
+
+def build_scenarios(sizes, stages, per_file_max_rows, data_dir):
+    """
+    Liste des scénarios (identifiant, étape, paramètres), dans l'ordre d'exécution.
+    Les CSV nécessaires sont écrits dans data_dir.
+    """
+    csv_paths = {}
+
+    def csv_path(size, length, delimiter_name='comma'):
+        key = (size, length, delimiter_name)
+        if key not in csv_paths:
+            csv_paths[key] = str(write_csv(
+                Path(data_dir) / f"data_{size}_{length}_{delimiter_name}.csv", size,
+                DELIMITERS[delimiter_name], LENGTHS[length]
+            ))
+        return csv_paths[key]
+
+    scenarios = []
+
+    def add(stage, params, *id_parts):
+        if stage in stages:
+            scenario_id = '/'.join([stage] + [str(part) for part in id_parts])
+            scenarios.append((scenario_id, stage, params))
+
+    for size in sizes:
+        for length in LENGTHS:
+            if 'read_csv' in stages:
+                for delimiter_name in DELIMITERS:
+                    add('read_csv', {'rows': size, 'csv_path': csv_path(size, length, delimiter_name)},
+                        size, length, delimiter_name)
+            for workers in PARALLEL_READ_WORKERS:
+                add('read_csv_parallel', {'rows': size, 'workers': workers, 'csv_path': csv_path(size, length)},
+                    size, length, f'{workers}w')
+            add('layout', {'rows': size, 'length': length}, size, length)
+            add('render_verso', {'rows': size, 'length': length, 'template': 'rescto'}, size, length)
+            add('render_verso_batch', {'rows': size, 'length': length, 'template': 'rescto'}, size, length)
+            add('render_verso_direct', {'rows': size, 'length': length, 'template': 'rescto'}, size, length)
+            for template in TEMPLATES:
+                add('pdf_write', {'rows': size, 'length': length, 'template': template}, size, length, template)
+                if size <= per_file_max_rows:
+                    add('zip', {'rows': size, 'length': length, 'template': template}, size, length, template)
+                for mode in MODES:
+                    if mode.startswith('per_row') and size > per_file_max_rows:
+                        continue
+                    if 'end_to_end' in stages:
+                        add('end_to_end', {
+                            'rows': size, 'length': length, 'template': template, 'mode': mode,
+                            'csv_path': csv_path(size, length)
+                        }, mode, size, length, template)
+    return scenarios
+
+
+def _run_scenario_process(stage, params, work_dir, queue):
+    sys.path.insert(0, str(ROOT_DIR))
+    rows, seconds, extra = STAGE_FUNCTIONS[stage](params, work_dir)
+    # ru_maxrss est en kilo-octets sous Linux
+    queue.put((rows, seconds, extra, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def run_scenario(stage, params, temp_dir):
+    """Exécute un scénario dans un processus séparé et retourne son résultat."""
+    work_dir = tempfile.mkdtemp(dir=temp_dir)
+    context = get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_scenario_process, args=(stage, params, work_dir, queue))
+    process.start()
+    try:
+        rows, seconds, extra, peak_kb = queue.get()
+    finally:
+        process.join()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    result = {
+        'stage': stage,
+        'rows': rows,
+        'seconds': round(seconds, 6),
+        'rows_per_sec': round(rows_per_sec(rows, seconds), 1),
+        'peak_rss_mb': round(peak_kb / 1024, 1),
+    }
+    result.update({key: value for key, value in params.items() if key not in ('rows', 'csv_path')})
+    result.update(extra)
+    return result
+
+
+def _git_revision():
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def command_run(args):
+    sizes = [int(size) for size in args.sizes.split(',')]
+    stages = args.stages.split(',') if args.stages else list(STAGES)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        sys.exit(f"Étape(s) inconnue(s): {', '.join(sorted(unknown))} (disponibles: {', '.join(STAGES)})")
+
+    report = {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'per_file_max_rows': args.per_file_max_rows,
+        },
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as temp_dir:
+        scenarios = build_scenarios(sizes, stages, args.per_file_max_rows, temp_dir)
+        for index, (scenario_id, stage, params) in enumerate(scenarios, start=1):
+            result = run_scenario(stage, params, temp_dir)
+            report['results'][scenario_id] = result
+            print(f"[{index}/{len(scenarios)}] {scenario_id:<45} {result['rows_per_sec']:>10.0f} lignes/s "
+                  f"{result['seconds']:>8.2f}s pic RSS {result['peak_rss_mb']:>7.1f} Mo", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+        print(f"Résultats écrits dans {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+def compare_reports(baseline, current, threshold):
+    """
+    Compare deux rapports de command_run.
+
+    Un scénario régresse si son débit baisse, ou si son pic RSS augmente, de plus
+    de threshold (fraction) par rapport à la référence.
+
+    Returns:
+        Liste de tuples (identifiant, résultat de référence, résultat actuel, régressions)
+    """
+    comparisons = []
+    for scenario_id, old in baseline['results'].items():
+        new = current['results'].get(scenario_id)
+        if new is None:
+            continue
+        regressions = []
+        if old['rows_per_sec'] and new['rows_per_sec'] < old['rows_per_sec'] * (1 - threshold):
+            regressions.append('débit')
+        if old['peak_rss_mb'] and new['peak_rss_mb'] > old['peak_rss_mb'] * (1 + threshold):
+            regressions.append('mémoire')
+        comparisons.append((scenario_id, old, new, regressions))
+    return comparisons
+
+
+def command_compare(args):
+    baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+    current = json.loads(Path(args.current).read_text(encoding='utf-8'))
+    comparisons = compare_reports(baseline, current, args.threshold)
+
+    def change(old, new):
+        return f"{(new - old) / old * 100:+6.1f}%" if old else '   n/a'
+
+    print(f"{'scénario':<45} {'réf. l/s':>10} {'actuel l/s':>10} {'débit':>7} {'RSS':>7}")
+    for scenario_id, old, new, regressions in comparisons:
+        flag = f"  RÉGRESSION ({', '.join(regressions)})" if regressions else ''
+        print(f"{scenario_id:<45} {old['rows_per_sec']:>10.0f} {new['rows_per_sec']:>10.0f} "
+              f"{change(old['rows_per_sec'], new['rows_per_sec'])} "
+              f"{change(old['peak_rss_mb'], new['peak_rss_mb'])}{flag}")
+
+    missing = sorted(set(baseline['results']) - set(current['results']))
+    if missing:
+        print(f"\n{len(missing)} scénario(s) de la référence absent(s) des résultats actuels.")
+
+    regressed = [scenario_id for scenario_id, _, _, regressions in comparisons if regressions]
+    print(f"\n{len(comparisons)} scénario(s) comparé(s), {len(regressed)} régression(s) "
+          f"(seuil {args.threshold:.0%}).")
+    return 1 if regressed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Exécute les benchmarks et écrit les résultats en JSON")
+    run_parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Nombres de lignes (séparés par des virgules)")
+    run_parser.add_argument('--stages', help=f"Étapes à mesurer parmi: {', '.join(STAGES)} (par défaut: toutes)")
+    run_parser.add_argument('--per-file-max-rows', type=int, default=DEFAULT_PER_FILE_MAX_ROWS,
+                            help="Nombre maximal de lignes des scénarios écrivant un PDF par ligne")
+    run_parser.add_argument('--output', help="Fichier JSON des résultats (par défaut: sortie standard)")
+
+    compare_parser = subparsers.add_parser('compare', help="Compare des résultats à une référence")
+    compare_parser.add_argument('baseline', help="Résultats de référence (JSON)")
+    compare_parser.add_argument('current', help="Résultats à comparer (JSON)")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="Écart toléré avant de signaler une régression (0.10 = 10%%)")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        command_run(args)
+    else:
+        sys.exit(command_compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Mesure le temps d'un run complet en mode un PDF par entrée, puis d'un run --resume sans
+changement et d'un run --delta après la modification d'une ligne du CSV (voir
+run_manifest.py): seuls les PDFs à regénérer doivent coûter du temps.
+
+Usage: python benchmarks/bench_resume.py [nombre_de_lignes ...]
+"""
+
+import contextlib
+import csv
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import TEMPLATES, rows_per_sec, write_csv
+
+
+def timed_run(csv_path, template_path, output_dir, **options):
+    from add_addresses_to_pdf import generate_pdfs
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        written = sum(1 for _ in generate_pdfs([csv_path], template_path, output_dir, **options))
+    return time.perf_counter() - start, written
+
+
+def change_one_row(csv_path):
+    with open(csv_path, 'r', encoding='utf-8', newline='') as csvfile:
+        rows = list(csv.reader(csvfile))
+    rows[len(rows) // 2][0] += " (corrigé)"
+    with open(csv_path, 'w', encoding='utf-8', newline='') as csvfile:
+        csv.writer(csvfile).writerows(rows)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 5000]
+    template_path = TEMPLATES['rescto']
+
+    print(f"{'lignes':>7} {'run':>10} {'PDFs écrits':>12} {'durée (s)':>10} {'lignes/s':>9}")
+    with tempfile.TemporaryDirectory(prefix='bench_resume_') as temp_dir:
+        for size in sizes:
+            csv_path = write_csv(Path(temp_dir) / f"data_{size}.csv", size)
+            output_dir = Path(temp_dir) / f"out_{size}"
+            runs = [('complet', {'run_manifest': True}), ('resume', {'resume': True})]
+            for label, options in runs:
+                elapsed, written = timed_run(csv_path, template_path, output_dir, **options)
+                print(f"{size:>7} {label:>10} {written:>12} {elapsed:>10.2f} {rows_per_sec(size, elapsed):>9.0f}")
+            change_one_row(csv_path)
+            elapsed, written = timed_run(csv_path, template_path, output_dir, delta=True)
+            print(f"{size:>7} {'delta':>10} {written:>12} {elapsed:>10.2f} {rows_per_sec(size, elapsed):>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Mesure le pic mémoire (RSS) et le débit du PDF unique, écrit d'un bloc ou découpé en
+morceaux (shard_size, voir parse_shard_size). Découpé, le pic doit rester stable quand
+le nombre de lignes augmente.
+
+Chaque mesure est faite dans un processus séparé pour que les pics ne s'additionnent pas.
+
+Usage: python benchmarks/bench_shards.py [nombre_de_lignes ...]
+"""
+
+import contextlib
+import io
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from _common import TEMPLATES, rows_per_sec, write_csv
+
+# Tailles de morceau comparées (None: PDF unique d'un bloc)
+SHARD_SIZES = (None, '1000', '2MB')
+
+
+def run_and_measure(csv_path, template_path, output_dir, shard_size, queue):
+    from add_addresses_to_pdf import process_csv_and_pdf
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_csv_and_pdf([csv_path], template_path, output_dir, single_file=True, shard_size=shard_size)
+    elapsed = time.perf_counter() - start
+    files = sum(1 for _ in Path(output_dir).glob('*.pdf'))
+    # ru_maxrss est en kilo-octets sous Linux
+    queue.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, elapsed, files))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2000, 8000, 20000]
+    template_path = TEMPLATES['rescto']
+    context = get_context('spawn')
+
+    print(f"{'lignes':>7} {'morceaux':>9} {'fichiers':>9} {'pic RSS (Mo)':>13} {'lignes/s':>9}")
+    with tempfile.TemporaryDirectory(prefix='bench_shards_') as temp_dir:
+        for size in sizes:
+            csv_path = write_csv(Path(temp_dir) / f"data_{size}.csv", size)
+            for shard_size in SHARD_SIZES:
+                output_dir = Path(temp_dir) / f"out_{size}_{shard_size}"
+                queue = context.Queue()
+                process = context.Process(
+                    target=run_and_measure, args=(csv_path, template_path, output_dir, shard_size, queue)
+                )
+                process.start()
+                peak_kb, elapsed, files = queue.get()
+                process.join()
+                print(f"{size:>7} {shard_size or '-':>9} {files:>9} {peak_kb / 1024:>13.1f} "
+                      f"{rows_per_sec(size, elapsed):>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Mesure le pic mémoire (RSS) de process_csv_and_pdf en mode un PDF par entrée.
+Avec le pipeline paresseux, le pic doit rester stable quand le nombre de lignes augmente.
+
+Chaque mesure est faite dans un processus séparé pour que les pics ne s'additionnent pas.
+
+Usage: python benchmarks/bench_streaming_memory.py [nombre_de_lignes ...]
+"""
+
+import contextlib
+import io
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from _common import TEMPLATES, rows_per_sec, write_csv
+
+
+def run_and_measure(csv_path, template_path, output_dir, queue):
+    from add_addresses_to_pdf import process_csv_and_pdf
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_csv_and_pdf([csv_path], template_path, output_dir, single_file=False)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss est en kilo-octets sous Linux
+    queue.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, elapsed))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [500, 2000, 8000]
+    template_path = TEMPLATES['rescto']
+    context = get_context('spawn')
+
+    with tempfile.TemporaryDirectory(prefix='bench_streaming_') as temp_dir:
+        for size in sizes:
+            csv_path = write_csv(Path(temp_dir) / f"data_{size}.csv", size)
+            output_dir = Path(temp_dir) / f"out_{size}"
+            queue = context.Queue()
+            process = context.Process(
+                target=run_and_measure, args=(csv_path, template_path, output_dir, queue)
+            )
+            process.start()
+            peak_kb, elapsed = queue.get()
+            process.join()
+            print(f"{size:>7} lignes: pic RSS {peak_kb / 1024:>6.1f} Mo, "
+                  f"{rows_per_sec(size, elapsed):>6.0f} lignes/s")
+
+
+if __name__ == "__main__":
+    main()
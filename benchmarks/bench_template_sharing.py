@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Vérifie que le PDF unique (single_file=True) ne grossit que des versos:
+le recto du template doit être stocké une seule fois, quel que soit le nombre de lignes.
+Vérifié aussi avec toutes les pages du template reprises (page_map="all").
+
+Usage: python benchmarks/bench_template_sharing.py [nombre_de_lignes ...]
+Code de sortie 1 si la croissance par ligne dépasse une fraction du template.
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import TEMPLATES, timed, write_csv
+
+from add_addresses_to_pdf import process_csv_and_pdf
+
+# Croissance maximale tolérée par ligne, en fraction de la taille du template
+MAX_GROWTH_RATIO = 0.05
+
+
+# Variantes mesurées: pages du template reprises (voir entry_page_plan)
+PAGE_MAPS = {'recto': None, 'toutes': 'all'}
+
+
+def output_size(csv_path, template_path, output_dir, page_map=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_csv_and_pdf([csv_path], template_path, output_dir, single_file=True, page_map=page_map)
+    return (Path(output_dir) / "rescto_all_entries.pdf").stat().st_size
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    failed = False
+    
+    with tempfile.TemporaryDirectory(prefix='bench_sharing_') as temp_dir:
+        for template_label, template_path in TEMPLATES.items():
+            template_size = template_path.stat().st_size
+            for pages_label, page_map in PAGE_MAPS.items():
+                label = f"{template_label}/{pages_label}"
+                results = []
+                for size in sizes:
+                    csv_path = write_csv(Path(temp_dir) / f"data_{size}.csv", size)
+                    output_dir = Path(temp_dir) / f"{template_label}_{pages_label}_{size}"
+                    pdf_size, elapsed = timed(output_size, csv_path, template_path, output_dir, page_map)
+                    results.append((size, pdf_size))
+                    print(f"{label:>14} {size:>7} lignes: {pdf_size:>10} octets ({elapsed:.2f}s)")
+                
+                (first_rows, first_size), (last_rows, last_size) = results[0], results[-1]
+                growth_per_row = (last_size - first_size) / max(last_rows - first_rows, 1)
+                ratio = growth_per_row / template_size
+                status = "OK" if ratio <= MAX_GROWTH_RATIO else "ÉCHEC"
+                print(f"{label:>14} croissance: {growth_per_row:.0f} octets/ligne "
+                      f"({ratio:.2%} du template) -> {status}")
+                failed = failed or ratio > MAX_GROWTH_RATIO
+    
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Mesure le débit de la validation à blanc (validate_entries_layout: mise en page seule,
+sans PDF) comparé au rendu des versos (create_verso_pages, rendu direct), sur une page A4
+(zones par défaut dans la page) pour des adresses courtes et longues.
+
+Usage: python benchmarks/bench_validate.py [nombre_de_lignes ...]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import make_entries, rows_per_sec, timed
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from add_addresses_to_pdf import VERSO_BATCH_SIZE, create_verso_pages, iter_chunks, validate_entries_layout
+
+
+def make_a4_template(path):
+    can = canvas.Canvas(str(path), pagesize=A4)
+    can.drawString(100, 700, "Recto")
+    can.showPage()
+    can.save()
+    return path
+
+
+def render_versos(entries):
+    width, height = A4
+    for batch in iter_chunks(entries, VERSO_BATCH_SIZE):
+        create_verso_pages(width, height, batch, verso_backend='direct')
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    print(f"{'adresses':>9} {'lignes':>7} {'validation (l/s)':>17} {'rendu (l/s)':>12} {'débordements':>13}")
+    with tempfile.TemporaryDirectory(prefix='bench_validate_') as temp_dir:
+        template_path = make_a4_template(Path(temp_dir) / 'a4.pdf')
+        for long_addresses in (False, True):
+            label = 'longues' if long_addresses else 'courtes'
+            for size in sizes:
+                entries = make_entries(size, long_addresses)
+                rows = [{'name': name, 'address': address} for name, address in entries]
+                report, validate_time = timed(validate_entries_layout, rows, template_path, log=lambda message: None)
+                # Le rendu n'est mesuré que sur un échantillon (il est bien plus lent)
+                sample = entries[:min(size, 5000)]
+                _, render_time = timed(render_versos, sample)
+                print(f"{label:>9} {size:>7} {rows_per_sec(size, validate_time):>17.0f} "
+                      f"{rows_per_sec(len(sample), render_time):>12.0f} {report['rowsWithOverflow']:>13}")
+
+
+if __name__ == "__main__":
+    main()
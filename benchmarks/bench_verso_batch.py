@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Compare le rendu des versos page par page (un canvas + une relecture par ligne)
+au rendu par lot (un canvas pour tout le lot, une seule relecture) et au rendu
+direct (flux de contenu écrit sans ReportLab, voir render_verso_content).
+
+Usage: python benchmarks/bench_verso_batch.py [nombre_de_lignes ...]
+"""
+
+import sys
+
+from _common import TEMPLATES, make_entries, rows_per_sec, timed
+
+from PyPDF2 import PdfReader
+from add_addresses_to_pdf import create_blank_page_with_name_and_address, create_verso_pages
+
+
+def render_per_row(page_width, page_height, entries):
+    return [
+        create_blank_page_with_name_and_address(page_width, page_height, name, address)
+        for name, address in entries
+    ]
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+    
+    template_page = PdfReader(TEMPLATES['rescto']).pages[0]
+    page_width = float(template_page.mediabox.width)
+    page_height = float(template_page.mediabox.height)
+    
+    print(f"{'lignes':>8} {'par ligne (l/s)':>16} {'par lot (l/s)':>14} {'gain':>6} {'direct (l/s)':>13} {'gain':>6}")
+    for size in sizes:
+        entries = make_entries(size)
+        _, per_row_time = timed(render_per_row, page_width, page_height, entries)
+        _, batch_time = timed(create_verso_pages, page_width, page_height, entries, verso_backend='reportlab')
+        _, direct_time = timed(create_verso_pages, page_width, page_height, entries, verso_backend='direct')
+        per_row_rate = rows_per_sec(size, per_row_time)
+        batch_rate = rows_per_sec(size, batch_time)
+        direct_rate = rows_per_sec(size, direct_time)
+        print(f"{size:>8} {per_row_rate:>16.0f} {batch_rate:>14.0f} {batch_rate / per_row_rate:>5.1f}x "
+              f"{direct_rate:>13.0f} {direct_rate / per_row_rate:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ import tempfile
 import shutil
 from pathlib import Path
 from add_addresses_to_pdf import process_csv_and_pdf
+from verso_cache import verso_cache_from_env
 
 def choose_file(title, file_types=None):
     """Ouvre un dialogue de sélection de fichier natif macOS"""
@@ -157,7 +158,8 @@ def main():
         print(f"   Dossier temporaire: {temp_dir}")
         
         # Traiter le CSV et créer les PDFs
-        process_csv_and_pdf(str(csv_file), str(pdf_file), temp_dir, single_file=False)
+        process_csv_and_pdf(str(csv_file), str(pdf_file), temp_dir, single_file=False,
+                            verso_cache=verso_cache_from_env())
         
         # Compter les fichiers PDF créés
         pdf_files = list(Path(temp_dir).glob("*.pdf"))
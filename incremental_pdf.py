@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Écriture incrémentale d'un PDF, pour le PDF unique des gros envois (option incremental).
+
+PdfWriter (PyPDF2) garde tout le document en mémoire jusqu'à write(): un PDF unique de
+100 000 destinataires demande une mémoire proportionnelle au document entier.
+IncrementalPdfWriter écrit chaque objet dans le fichier dès qu'il est ajouté; seuls l'arbre
+des pages, la table xref et le trailer sont écrits à la fin. Il ne garde en mémoire que la
+position de chaque objet et le numéro de chaque page (quelques octets par page).
+
+Les objets importés d'une source (reader du template, lot de versos, conteneur des Form
+XObjects) ne sont écrits qu'une fois: leurs numéros sont mémorisés par source jusqu'à
+forget_imported_objects. Une page peut être recopiée (add_shared_page) sans réécrire
+son contenu ni ses ressources, comme add_shared_page de add_addresses_to_pdf.
+"""
+
+from array import array
+from io import BytesIO
+from pathlib import Path
+
+from PyPDF2.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, EncodedStreamObject, IndirectObject, NameObject,
+    StreamObject
+)
+
+PDF_HEADER = b"%PDF-1.3\n%\xe2\xe3\xcf\xd3\n"
+
+# Producteur indiqué dans le dictionnaire /Info (comme PdfWriter)
+PDF_PRODUCER = b"PyPDF2"
+
+# Catalogue, dictionnaire /Info, en-têtes de l'arbre des pages et trailer (closed_size)
+CLOSE_OVERHEAD_BYTES = 256
+
+# Nombre d'entrées écrites à la fois dans le tableau /Kids et dans la table xref
+WRITE_BATCH_SIZE = 4096
+
+
+class IncrementalPdfWriter:
+    """
+    PDF écrit au fil de l'eau dans path (ouvert au premier objet écrit).
+
+    Les pages sont ajoutées par add_page ou add_shared_page, qui retournent un descripteur
+    (le dictionnaire de page sérialisé) à repasser à add_shared_page pour une copie de la
+    page. close() termine le fichier; abort() le supprime.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self._position = 0
+        # Position de chaque objet (index: numéro - 1) et numéros des pages, dans l'ordre
+        self._offsets = array('Q')
+        self._page_ids = array('Q')
+        # id(source) -> (source, {(numéro, génération) dans la source: numéro écrit})
+        self._imported = {}
+        self._pages_ref = self._reserve()
+
+    @property
+    def page_count(self):
+        return len(self._page_ids)
+
+    def tell(self):
+        """Nombre d'octets déjà écrits."""
+        return self._position
+
+    def closed_size(self):
+        """
+        Taille du fichier s'il était fermé maintenant (close): octets déjà écrits, plus
+        l'arbre des pages, la table xref (20 octets par objet) et le trailer.
+        """
+        kids = len(b" %d 0 R" % self._page_ids[-1]) * len(self._page_ids) if self._page_ids else 0
+        return self._position + kids + 20 * (len(self._offsets) + 3) + CLOSE_OVERHEAD_BYTES
+
+    def add_object(self, obj):
+        """
+        Écrit obj (objet direct, ex: flux de contenu) et ses références non encore
+        importées.
+
+        Returns:
+            La référence (IndirectObject) de l'objet écrit
+        """
+        reference = self._reserve()
+        self._write_object(reference.idnum, self._import(obj))
+        return reference
+
+    def add_page(self, page):
+        """
+        Écrit une page. Ses /Contents et /Resources directs sont écrits comme objets
+        séparés: une copie de la page (add_shared_page) ne réécrit que son dictionnaire.
+
+        Returns:
+            Le descripteur de la page, à repasser à add_shared_page
+        """
+        reference = self._reserve()
+        original = getattr(page, 'indirect_reference', None)
+        if original is not None and original.pdf is not self:
+            # Les références à la page d'origine (ex: /P des annotations) désignent celle-ci
+            self._source_map(original.pdf).setdefault((original.idnum, original.generation), reference.idnum)
+
+        page_dict = DictionaryObject()
+        for key, value in page.items():
+            if key == '/Parent':
+                continue
+            if key in ('/Contents', '/Resources') and not isinstance(value, IndirectObject):
+                page_dict[NameObject(key)] = self.add_object(value)
+            else:
+                page_dict[NameObject(key)] = self._import(value)
+        page_dict[NameObject('/Type')] = NameObject('/Page')
+        page_dict[NameObject('/Parent')] = self._pages_ref
+
+        body = BytesIO()
+        page_dict.write_to_stream(body, None)
+        body = body.getvalue()
+        self._write_page(reference.idnum, body)
+        return body
+
+    def add_shared_page(self, page, shared_page=None):
+        """
+        Comme add_shared_page de add_addresses_to_pdf: au premier appel (shared_page=None)
+        la page est écrite, ensuite seul son dictionnaire est recopié.
+
+        Returns:
+            Le descripteur de la page partagée
+        """
+        if shared_page is None:
+            return self.add_page(page)
+        self._write_page(self._reserve().idnum, shared_page)
+        return shared_page
+
+    def forget_imported_objects(self, source):
+        """
+        Oublie les objets déjà importés depuis source (ex: lot de versos entièrement
+        ajouté): la mémoire ne grandit pas avec le nombre de lots.
+        """
+        self._imported.pop(id(source), None)
+
+    def close(self):
+        """Écrit l'arbre des pages, le catalogue, la table xref et le trailer, puis ferme le fichier."""
+        pages_id = self._pages_ref.idnum
+        self._start_object(pages_id)
+        self._emit(b"<<\n/Type /Pages\n/Count %d\n/Kids [" % len(self._page_ids))
+        for start in range(0, len(self._page_ids), WRITE_BATCH_SIZE):
+            self._emit(b"".join(b" %d 0 R" % page_id for page_id in self._page_ids[start:start + WRITE_BATCH_SIZE]))
+        self._emit(b" ]\n>>\nendobj\n")
+
+        root_id = self._reserve().idnum
+        self._write_raw(root_id, b"<<\n/Type /Catalog\n/Pages %d 0 R\n>>" % pages_id)
+        info_id = self._reserve().idnum
+        self._write_raw(info_id, b"<<\n/Producer (" + PDF_PRODUCER + b")\n>>")
+
+        xref_position = self._position
+        self._emit(b"xref\n0 %d\n0000000000 65535 f \n" % (len(self._offsets) + 1))
+        for start in range(0, len(self._offsets), WRITE_BATCH_SIZE):
+            self._emit(b"".join(b"%010d 00000 n \n" % offset for offset in self._offsets[start:start + WRITE_BATCH_SIZE]))
+        self._emit(b"trailer\n<<\n/Size %d\n/Root %d 0 R\n/Info %d 0 R\n>>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(self._offsets) + 1, root_id, info_id, xref_position
+        ))
+        self._file.close()
+        self._file = None
+        self._imported.clear()
+
+    def abort(self):
+        """Abandonne le PDF: le fichier partiel est fermé et supprimé."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.path.unlink(missing_ok=True)
+        self._imported.clear()
+
+    def _reserve(self):
+        self._offsets.append(0)
+        return IndirectObject(len(self._offsets), 0, self)
+
+    def _source_map(self, source):
+        imported = self._imported.get(id(source))
+        if imported is None:
+            # La source est gardée avec ses numéros: son adresse n'est pas réutilisée entre-temps
+            imported = self._imported[id(source)] = (source, {})
+        return imported[1]
+
+    def _import(self, obj):
+        # Copie obj en remplaçant les références d'une source par celles des objets écrits
+        if isinstance(obj, IndirectObject):
+            return self._import_reference(obj)
+        if isinstance(obj, StreamObject):
+            copy = EncodedStreamObject() if isinstance(obj, EncodedStreamObject) else DecodedStreamObject()
+            copy._data = obj._data
+        elif isinstance(obj, DictionaryObject):
+            copy = DictionaryObject()
+        elif isinstance(obj, ArrayObject):
+            return ArrayObject(self._import(value) for value in obj)
+        else:
+            return obj
+        for key, value in obj.items():
+            # /Length d'un flux est recalculée à l'écriture (write_to_stream)
+            if key != '/Length' or not isinstance(obj, StreamObject):
+                copy[NameObject(key)] = self._import(value)
+        return copy
+
+    def _import_reference(self, reference):
+        if reference.pdf is self:
+            return reference
+        references = self._source_map(reference.pdf)
+        key = (reference.idnum, reference.generation)
+        idnum = references.get(key)
+        if idnum is None:
+            idnum = references[key] = self._reserve().idnum
+            self._write_object(idnum, self._import(reference.get_object()))
+        return IndirectObject(idnum, 0, self)
+
+    def _write_object(self, idnum, obj):
+        body = BytesIO()
+        obj.write_to_stream(body, None)
+        self._write_raw(idnum, body.getvalue())
+
+    def _write_page(self, idnum, body):
+        self._write_raw(idnum, body)
+        self._page_ids.append(idnum)
+
+    def _write_raw(self, idnum, body):
+        self._start_object(idnum)
+        self._emit(body)
+        self._emit(b"\nendobj\n")
+
+    def _start_object(self, idnum):
+        if self._file is None:
+            self._file = open(self.path, 'wb')
+            self._emit(PDF_HEADER)
+        self._offsets[idnum - 1] = self._position
+        self._emit(b"%d 0 obj\n" % idnum)
+
+    def _emit(self, data):
+        self._file.write(data)
+        self._position += len(data)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Exécution en arrière-plan des générations longues (API /api/jobs).
+
+Chaque job tourne dans un pool de threads borné: la requête HTTP qui le crée
+répond immédiatement avec l'identifiant du job, puis le client suit son état
+et télécharge le résultat une fois terminé. Les résultats sont supprimés du
+disque après un délai (TTL).
+"""
+
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_ERROR = 'error'
+
+# Nombre de messages de génération gardés par job
+JOB_LOG_SIZE = 200
+
+
+class JobQueueFullError(Exception):
+    """Levée quand trop de jobs sont déjà en attente ou en cours."""
+
+
+class Job:
+    """
+    État d'une génération en arrière-plan.
+
+    La fonction du job reçoit cet objet: elle met à jour progress au fur et à
+    mesure, ajoute ses messages à log et retourne (result_path, download_name, mimetype).
+    """
+
+    def __init__(self, temp_dir):
+        self.id = uuid.uuid4().hex
+        self.temp_dir = temp_dir
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = {}
+        self.log = deque(maxlen=JOB_LOG_SIZE)
+        self.error = None
+        self.result_path = None
+        self.download_name = None
+        self.mimetype = None
+
+    def to_dict(self):
+        return {
+            'jobId': self.id,
+            'status': self.status,
+            'createdAt': self.created_at,
+            'startedAt': self.started_at,
+            'finishedAt': self.finished_at,
+            'progress': dict(self.progress),
+            'error': self.error,
+            'log': list(self.log)
+        }
+
+
+class JobManager:
+    """
+    Pool borné de jobs en arrière-plan.
+
+    Au plus max_concurrent jobs tournent à la fois; au-delà, les jobs attendent
+    leur tour, dans la limite de max_pending jobs non terminés. Un job terminé
+    (et son dossier temporaire) est oublié result_ttl secondes après sa fin.
+    """
+
+    def __init__(self, max_concurrent=2, max_pending=100, result_ttl=3600):
+        self.max_concurrent = max_concurrent
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='pdf_job')
+
+    def submit(self, func, temp_dir):
+        """
+        Crée un job qui exécutera func(job) en arrière-plan.
+
+        Args:
+            func: Fonction de génération, voir Job
+            temp_dir: Dossier temporaire du job, supprimé à son expiration
+
+        Returns:
+            Le Job créé
+
+        Raises:
+            JobQueueFullError: Si max_pending jobs sont déjà en attente ou en cours
+        """
+        self.cleanup_expired()
+        job = Job(temp_dir)
+        with self._lock:
+            unfinished = sum(1 for other in self._jobs.values() if other.finished_at is None)
+            if unfinished >= self.max_pending:
+                raise JobQueueFullError(
+                    f"Trop de jobs en cours ({unfinished}), réessayez plus tard."
+                )
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job, func):
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        try:
+            job.result_path, job.download_name, job.mimetype = func(job)
+            job.status = JOB_DONE
+        except Exception as exc:  # pylint: disable=broad-except
+            job.error = str(exc)
+            job.status = JOB_ERROR
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        """Retourne le job job_id, ou None s'il n'existe pas ou a expiré."""
+        self.cleanup_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cleanup_expired(self):
+        """Oublie les jobs terminés depuis plus de result_ttl secondes et supprime leurs fichiers."""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.finished_at is not None and now - job.finished_at > self.result_ttl
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            shutil.rmtree(job.temp_dir, ignore_errors=True)
+
+    def stats(self):
+        """Nombre de jobs connus par état."""
+        with self._lock:
+            counts = {status: 0 for status in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_ERROR)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        counts['maxConcurrent'] = self.max_concurrent
+        return counts
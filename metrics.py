@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Métriques du service au format texte Prometheus (endpoint /metrics).
+
+Registre minimal (compteurs, jauges, histogrammes avec labels), sans dépendance:
+les métriques sont mises à jour par la génération (lignes, pages, octets produits,
+temps par étape) et par app.py (durée des requêtes, requêtes en cours, disque temporaire).
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bornes (secondes) des histogrammes de durée
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Libellé "endpoint" des générations lancées hors du service web (ligne de commande, GUI)
+LOCAL_ENDPOINT = 'local'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + '}'
+
+
+class Registry:
+    """Ensemble des métriques exposées par /metrics."""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Texte de toutes les métriques au format d'exposition Prometheus."""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels attendus {self.labelnames}, reçus {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key):
+        return list(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    """Compteur croissant (ex: lignes générées)."""
+
+    type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in values]
+
+
+class Gauge(_Metric):
+    """
+    Valeur instantanée (ex: requêtes en cours). Une jauge sans label peut aussi être
+    calculée à chaque lecture de /metrics (set_function).
+    """
+
+    type = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = defaultdict(float)
+        self._function = None
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function):
+        self._function = function
+
+    def samples(self):
+        if self._function is not None:
+            return [(self.name, [], self._function())]
+        with self._lock:
+            values = sorted(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in values]
+
+
+class Histogram(_Metric):
+    """Distribution de valeurs (ex: durées), par intervalles cumulés."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts = {}
+        self._sums = defaultdict(float)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] += value
+
+    def samples(self):
+        with self._lock:
+            series = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        samples = []
+        for key, counts, total in series:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", labels + [('le', _format_value(bound))], cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+GENERATED_ROWS = Counter(
+    'pdf_generated_rows_total', "Entrées (lignes) pour lesquelles un PDF a été produit.", ['endpoint']
+)
+GENERATED_PAGES = Counter(
+    'pdf_generated_pages_total', "Pages (recto et verso) écrites dans les PDFs produits.", ['endpoint']
+)
+OUTPUT_BYTES = Counter(
+    'pdf_output_bytes_total', "Taille cumulée des PDFs produits, en octets.", ['endpoint']
+)
+STAGE_SECONDS = Histogram(
+    'pdf_generation_stage_seconds',
+    "Temps passé par génération dans chaque étape (parse: lecture des entrées, "
+    "render: rendu des versos, write: écriture des PDFs, zip: empaquetage).",
+    ['endpoint', 'stage']
+)
+
+
+class GenerationMetrics:
+    """
+    Métriques d'une génération: compteurs mis à jour au fil de l'eau, et temps par étape
+    enregistrés dans STAGE_SECONDS par observe(), une fois la génération terminée.
+
+    Le temps d'une étape est exclusif: pendant une étape imbriquée (ex: lecture du CSV
+    déclenchée par le rendu d'un lot), l'étape englobante est suspendue.
+    """
+
+    def __init__(self, endpoint=LOCAL_ENDPOINT):
+        self.endpoint = endpoint
+        self._totals = defaultdict(float)
+        self._stack = []
+        self._mark = None
+
+    def _switch(self):
+        # Attribue le temps écoulé depuis le dernier changement à l'étape en cours
+        now = time.perf_counter()
+        if self._stack:
+            self._totals[self._stack[-1]] += now - self._mark
+        self._mark = now
+
+    @contextmanager
+    def stage(self, name):
+        """Chronomètre un bloc de code dans l'étape name."""
+        self._switch()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._switch()
+            self._stack.pop()
+
+    def iterate(self, iterable, name):
+        """
+        Parcourt iterable en comptant le temps de production de chaque élément dans
+        l'étape name (le temps passé par le consommateur entre deux éléments n'est pas compté).
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def add_entry(self, pages):
+        """Compte une entrée produite et ses pages."""
+        GENERATED_ROWS.inc(endpoint=self.endpoint)
+        GENERATED_PAGES.inc(pages, endpoint=self.endpoint)
+
+    def add_output_bytes(self, size):
+        OUTPUT_BYTES.inc(size, endpoint=self.endpoint)
+
+    def observe(self):
+        """Enregistre les temps par étape de la génération (puis les remet à zéro)."""
+        totals, self._totals = self._totals, defaultdict(float)
+        for stage_name, seconds in totals.items():
+            STAGE_SECONDS.observe(seconds, endpoint=self.endpoint, stage=stage_name)
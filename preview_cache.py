@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Prévisualisation paginée des CSV uploadés (endpoint /preview).
+
+Les CSV d'un upload ne sont lus que jusqu'à la dernière ligne demandée: la première
+page ne parse que le début des fichiers, et les colonnes sont détectées sur leur en-tête.
+Le nombre total de lignes est estimé d'après la taille des fichiers et les octets déjà
+lus; il n'est compté exactement qu'à la demande (ou une fois les fichiers lus en entier).
+
+Les uploads analysés sont gardés quelques minutes dans un cache borné, indexé par le
+hash SHA-256 de leur contenu: les pages suivantes sont servies sans renvoyer les fichiers
+(paramètre uploadId), et un même upload renvoyé n'est ni réécrit ni relu.
+"""
+
+import csv
+import hashlib
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+
+from add_addresses_to_pdf import ADDRESS_COLUMNS, NAME_COLUMNS, detect_column, detect_csv_delimiter
+
+# Nombre maximal d'uploads gardés en cache, et durée (secondes) de conservation après le dernier accès
+PREVIEW_CACHE_SIZE = 8
+PREVIEW_CACHE_TTL = 600
+
+# Taille des morceaux lus lors de l'enregistrement d'un upload
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class _CountingLines:
+    """
+    Lignes décodées d'un fichier ouvert en binaire, en comptant les octets lus
+    (base de l'estimation du nombre total de lignes).
+    """
+
+    def __init__(self, raw, encoding='utf-8'):
+        self.raw = raw
+        self.encoding = encoding
+        self.bytes_read = 0
+
+    def __iter__(self):
+        for line in self.raw:
+            self.bytes_read += len(line)
+            yield line.decode(self.encoding)
+
+
+class PreviewUpload:
+    """
+    CSV d'un upload, parsés paresseusement dans l'ordre des fichiers.
+
+    Les lignes déjà lues sont gardées (rows) pour servir les pages suivantes;
+    les fichiers ne sont relus qu'au-delà de la dernière ligne parsée.
+    """
+
+    def __init__(self, upload_id, temp_dir, csv_paths):
+        self.id = upload_id
+        self.temp_dir = temp_dir
+        self.csv_paths = [Path(csv_path) for csv_path in csv_paths]
+        self.total_bytes = sum(csv_path.stat().st_size for csv_path in self.csv_paths)
+        self.rows = []
+        self.name_column = None
+        self.address_column = None
+        self.exhausted = False
+        self.exact_total = None
+        self.last_access = time.time()
+        self._bytes_done = 0
+        self._lines = None
+        self._lock = threading.Lock()
+        self._iterator = self._iter_rows()
+
+    def _iter_rows(self):
+        for csv_path in self.csv_paths:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as csvfile:
+                delimiter = detect_csv_delimiter(csvfile)
+            with open(csv_path, 'rb') as raw:
+                self._lines = _CountingLines(raw)
+                reader = csv.DictReader(self._lines, delimiter=delimiter)
+
+                # Détecter les colonnes name et address pour CE CSV (comme iter_csv_files)
+                name_col = detect_column(reader.fieldnames, NAME_COLUMNS)
+                address_col = detect_column(reader.fieldnames, ADDRESS_COLUMNS)
+                if self.name_column is None:
+                    self.name_column = name_col
+                if self.address_column is None:
+                    self.address_column = address_col
+
+                for row in reader:
+                    yield {
+                        'name': row.get(name_col, '') if name_col else '',
+                        'address': row.get(address_col, '') if address_col else ''
+                    }
+            self._bytes_done += csv_path.stat().st_size
+            self._lines = None
+
+    def _parse_until(self, count):
+        while not self.exhausted and len(self.rows) < count:
+            row = next(self._iterator, None)
+            if row is None:
+                self.exhausted = True
+                self.exact_total = len(self.rows)
+            else:
+                self.rows.append(row)
+
+    def _bytes_read(self):
+        return self._bytes_done + (self._lines.bytes_read if self._lines is not None else 0)
+
+    def _count_all(self):
+        # Relecture complète des fichiers, sans garder les lignes en mémoire
+        total = 0
+        for csv_path in self.csv_paths:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as csvfile:
+                total += sum(1 for _ in csv.DictReader(csvfile, delimiter=detect_csv_delimiter(csvfile)))
+        return total
+
+    def page(self, offset, limit, exact_total=False):
+        """
+        Lignes [offset, offset + limit) des CSV, parsées si nécessaire.
+
+        Args:
+            offset: Index (0-based) de la première ligne
+            limit: Nombre maximal de lignes
+            exact_total: Si vrai, compte toutes les lignes des fichiers pour un total exact
+
+        Returns:
+            Dictionnaire: rows (liste de lignes normalisées), total, totalExact, hasMore
+        """
+        with self._lock:
+            self.last_access = time.time()
+            self._parse_until(offset + limit + 1)
+            rows = self.rows[offset:offset + limit]
+            has_more = len(self.rows) > offset + limit
+            if exact_total and self.exact_total is None:
+                self.exact_total = self._count_all()
+
+            if self.exact_total is not None:
+                total = self.exact_total
+            else:
+                bytes_read = self._bytes_read()
+                total = round(len(self.rows) * self.total_bytes / bytes_read) if bytes_read else 0
+                total = max(total, len(self.rows))
+            return {
+                'rows': rows,
+                'total': total,
+                'totalExact': self.exact_total is not None,
+                'hasMore': has_more
+            }
+
+
+class PreviewCache:
+    """
+    Cache LRU des uploads de prévisualisation, indexé par le hash de leur contenu.
+
+    Borné en nombre d'uploads; un upload non consulté depuis ttl secondes est oublié
+    et son dossier temporaire supprimé.
+    """
+
+    def __init__(self, max_entries=PREVIEW_CACHE_SIZE, ttl=PREVIEW_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._uploads = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, upload_id):
+        """Retourne l'upload upload_id, ou None s'il n'existe pas ou a expiré."""
+        self.cleanup_expired()
+        with self._lock:
+            upload = self._uploads.get(upload_id)
+            if upload is not None:
+                self._uploads.move_to_end(upload_id)
+                self.hits += 1
+            return upload
+
+    def add(self, files, temp_dir, filename_for):
+        """
+        Enregistre les fichiers d'un upload dans temp_dir en calculant leur hash.
+        Si le même contenu est déjà en cache, temp_dir est supprimé et l'upload existant
+        est retourné; sinon le nouvel upload est mis en cache (le cache devient
+        propriétaire de temp_dir).
+
+        Args:
+            files: Fichiers uploadés (objets avec un attribut stream)
+            temp_dir: Dossier temporaire où enregistrer les fichiers
+            filename_for: Fonction (index, fichier) -> nom du fichier dans temp_dir
+
+        Returns:
+            Le PreviewUpload de ce contenu
+        """
+        digest = hashlib.sha256()
+        csv_paths = []
+        for i, upload_file in enumerate(files):
+            csv_path = Path(temp_dir) / filename_for(i, upload_file)
+            file_digest = hashlib.sha256()
+            with open(csv_path, 'wb') as output:
+                for chunk in iter(partial(upload_file.stream.read, UPLOAD_CHUNK_SIZE), b''):
+                    file_digest.update(chunk)
+                    output.write(chunk)
+            # Le hash de l'upload dépend du contenu et de l'ordre des fichiers
+            digest.update(file_digest.digest())
+            csv_paths.append(csv_path)
+        upload_id = digest.hexdigest()
+
+        existing = self.get(upload_id)
+        if existing is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return existing
+
+        upload = PreviewUpload(upload_id, temp_dir, csv_paths)
+        with self._lock:
+            self.misses += 1
+            evicted = []
+            previous = self._uploads.pop(upload_id, None)
+            if previous is not None:
+                evicted.append(previous)
+            self._uploads[upload_id] = upload
+            while len(self._uploads) > self.max_entries:
+                evicted.append(self._uploads.popitem(last=False)[1])
+        for old in evicted:
+            shutil.rmtree(old.temp_dir, ignore_errors=True)
+        return upload
+
+    def cleanup_expired(self):
+        """Oublie les uploads non consultés depuis plus de ttl secondes et supprime leurs fichiers."""
+        now = time.time()
+        with self._lock:
+            expired = [upload for upload in self._uploads.values() if now - upload.last_access > self.ttl]
+            for upload in expired:
+                del self._uploads[upload.id]
+        for upload in expired:
+            shutil.rmtree(upload.temp_dir, ignore_errors=True)
+
+    def stats(self):
+        """Statistiques du cache (pour /api/status)."""
+        with self._lock:
+            return {
+                'entries': len(self._uploads),
+                'maxEntries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Manifeste d'un run en mode un PDF par entrée, pour reprendre un run interrompu
+(--resume) ou ne regénérer que les lignes modifiées (--delta).
+
+Le manifeste (rescto_run_manifest.jsonl, dans le dossier de sortie) reçoit une ligne JSON
+par PDF écrit, dès son écriture: numéro de ligne, hash de l'entrée (nom et adresse
+normalisés), hash des réglages (template, positions, pages, rendu), nom et taille du PDF.
+Un run interrompu laisse donc un manifeste valide jusqu'au dernier PDF écrit.
+
+Au run suivant, une ligne est « à jour » si son entrée et les réglages ont le même hash
+et si son PDF existe avec la taille enregistrée: elle n'est ni rendue ni réécrite.
+En fin de run, le manifeste est compacté (une ligne par entrée); en mode delta, les PDFs
+des lignes qui n'existent plus dans les données sont supprimés.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+RUN_MANIFEST_NAME = "rescto_run_manifest.jsonl"
+
+# Longueur (en caractères hexadécimaux) des hashes enregistrés
+RUN_HASH_LENGTH = 32
+
+
+def run_hash(parts):
+    """Hash (tronqué) de la représentation JSON de parts."""
+    data = json.dumps(parts, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:RUN_HASH_LENGTH]
+
+
+def read_run_manifest(path):
+    """
+    Lit un manifeste: la dernière ligne de chaque entrée l'emporte, une ligne
+    incomplète (run interrompu pendant son écriture) est ignorée.
+
+    Returns:
+        Dictionnaire {numéro de ligne: enregistrement}
+    """
+    records = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as manifest_file:
+            for line in manifest_file:
+                try:
+                    record = json.loads(line)
+                    records[int(record['row'])] = record
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+class RunManifest:
+    """
+    Manifeste du run en cours dans output_dir.
+
+    Sans reuse, le manifeste précédent est remplacé. Avec reuse (--resume ou --delta),
+    ses enregistrements servent à reconnaître les lignes à jour (is_current), et les
+    nouveaux PDFs y sont ajoutés.
+    """
+
+    def __init__(self, output_dir, settings_hash, reuse=False):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / RUN_MANIFEST_NAME
+        self.settings_hash = settings_hash
+        self.reuse = reuse
+        self.skipped = 0
+        # Enregistrements du run précédent pas encore rencontrés dans ce run
+        self._previous = read_run_manifest(self.path) if reuse else {}
+        self._file = open(self.path, 'a' if reuse else 'w', encoding='utf-8')
+
+    def input_hash(self, name, address):
+        return run_hash([name, address])
+
+    def is_current(self, row_num, name, address):
+        """
+        True si le PDF de la ligne row_num, écrit par un run précédent, est à jour:
+        même entrée, mêmes réglages, fichier présent avec la taille enregistrée.
+        """
+        record = self._previous.pop(row_num, None)
+        if record is None:
+            return False
+        if record.get('input') != self.input_hash(name, address) or record.get('settings') != self.settings_hash:
+            return False
+        try:
+            current = (self.output_dir / record['output']).stat().st_size == record['bytes']
+        except (OSError, KeyError):
+            return False
+        if current:
+            self.skipped += 1
+        return current
+
+    def record(self, row_num, name, address, output_path):
+        """Enregistre le PDF écrit pour la ligne row_num (écrit immédiatement dans le manifeste)."""
+        output_path = Path(output_path)
+        self._file.write(json.dumps({
+            'row': row_num,
+            'input': self.input_hash(name, address),
+            'settings': self.settings_hash,
+            'output': output_path.name,
+            'bytes': output_path.stat().st_size
+        }, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def finish(self, remove_stale=False):
+        """
+        Termine le run: compacte le manifeste et, avec remove_stale, supprime les PDFs
+        des lignes du run précédent absentes de ce run.
+
+        Returns:
+            Nombre de PDFs supprimés
+        """
+        self.close()
+        stale = self._previous if remove_stale else {}
+        removed = 0
+        for record in stale.values():
+            try:
+                (self.output_dir / record['output']).unlink()
+                removed += 1
+            except (OSError, KeyError):
+                pass
+
+        if self.reuse:
+            records = read_run_manifest(self.path)
+            # Écriture atomique: un run interrompu ici garde l'ancien manifeste
+            fd, temp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as manifest_file:
+                for row_num in sorted(records):
+                    if row_num not in stale:
+                        manifest_file.write(json.dumps(records[row_num], ensure_ascii=False) + '\n')
+            os.replace(temp_path, self.path)
+        self._previous = {}
+        return removed
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Mise en page du texte (nom, adresse) pour les pages verso et les overlays.
+Découpe les lignes trop longues et calcule la position de chaque ligne, sans dessiner.
+
+La largeur de chaque mot n'est mesurée qu'une fois (mémoïsée par police) et la largeur
+d'une ligne est la somme des largeurs de ses mots: le découpage est linéaire en nombre
+de mots, et les largeurs obtenues sont exactement celles de stringWidth sur la ligne.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+DEFAULT_FONT = "Helvetica"
+
+# Nombre maximal de mots dont la largeur est mémorisée par police (measure_line)
+WORD_UNITS_CACHE_SIZE = 65536
+
+# Ligne positionnée: texte, position x/y en points et largeur en points
+PositionedLine = namedtuple('PositionedLine', ['text', 'x', 'y', 'width'])
+
+
+@lru_cache(maxsize=65536)
+def _text_units(text, font_name):
+    """
+    Largeur de text en millièmes de cadratin (entier pour les polices Type 1 standard).
+    stringWidth calcule somme_des_largeurs * 0.001 * taille: à la taille 1000 on retrouve
+    la somme entière, ce qui rend les largeurs additives sans erreur d'arrondi.
+    """
+    return round(stringWidth(text, font_name, 1000))
+
+
+def _units_to_points(units, font_size):
+    # Même ordre d'opérations que stringWidth pour obtenir exactement la même valeur
+    return units * 0.001 * font_size
+
+
+def wrap_line(line, max_width, font_name=DEFAULT_FONT, font_size=10):
+    """
+    Découpe une ligne en sous-lignes dont la largeur ne dépasse pas max_width
+    (un mot plus large que max_width reste seul sur sa sous-ligne).
+
+    Args:
+        line: Texte d'une ligne (sans retour à la ligne)
+        max_width: Largeur maximale en points
+        font_name: Nom de la police
+        font_size: Taille de la police
+
+    Returns:
+        Liste de tuples (texte, largeur en points)
+    """
+    space_units = _text_units(' ', font_name)
+    sub_lines = []
+    current_words = []
+    current_units = 0
+
+    for word in line.split():
+        word_units = _text_units(word, font_name)
+        if current_words:
+            test_units = current_units + space_units + word_units
+            if _units_to_points(test_units, font_size) > max_width:
+                sub_lines.append((' '.join(current_words), _units_to_points(current_units, font_size)))
+                current_words = [word]
+                current_units = word_units
+            else:
+                current_words.append(word)
+                current_units = test_units
+        else:
+            current_words.append(word)
+            current_units = word_units
+
+    if current_words:
+        sub_lines.append((' '.join(current_words), _units_to_points(current_units, font_size)))
+
+    return sub_lines
+
+
+class _WordUnits(dict):
+    # Largeur de chaque mot (voir _text_units), mesurée au premier accès; vidé au-delà
+    # de WORD_UNITS_CACHE_SIZE mots
+    def __init__(self, font_name):
+        super().__init__()
+        self.font_name = font_name
+
+    def __missing__(self, word):
+        if len(self) >= WORD_UNITS_CACHE_SIZE:
+            self.clear()
+        units = self[word] = _text_units(word, self.font_name)
+        return units
+
+
+@lru_cache(maxsize=None)
+def _word_units(font_name):
+    return _WordUnits(font_name)
+
+
+@lru_cache(maxsize=256)
+def _max_units(max_width, font_size):
+    """Plus grande largeur (en millièmes de cadratin) qui ne dépasse pas max_width points."""
+    units = int(max_width / (0.001 * font_size))
+    while _units_to_points(units + 1, font_size) <= max_width:
+        units += 1
+    while units > 0 and _units_to_points(units, font_size) > max_width:
+        units -= 1
+    return units
+
+
+def measure_line(line, max_width, font_name=DEFAULT_FONT, font_size=10):
+    """
+    Nombre de sous-lignes et largeur de la plus large de wrap_line(line, ...), sans
+    construire le texte des sous-lignes (validation de la mise en page).
+
+    Les largeurs sont comparées en millièmes de cadratin (_max_units), et une ligne
+    qui tient entière dans max_width est mesurée sans être découpée.
+
+    Returns:
+        Tuple (nombre de sous-lignes, largeur maximale en points)
+    """
+    word_units = _word_units(font_name)
+    units = list(map(word_units.__getitem__, line.split()))
+    if not units:
+        return 0, 0
+    space_units = word_units[' ']
+    max_units = _max_units(max_width, font_size)
+    line_units = sum(units) + space_units * (len(units) - 1)
+    if line_units <= max_units:
+        return 1, _units_to_points(line_units, font_size)
+
+    line_count = 1
+    widest_units = 0
+    current_units = units[0]
+    for unit in units[1:]:
+        test_units = current_units + space_units + unit
+        if test_units > max_units:
+            line_count += 1
+            widest_units = max(widest_units, current_units)
+            current_units = unit
+        else:
+            current_units = test_units
+
+    return line_count, _units_to_points(max(widest_units, current_units), font_size)
+
+
+def layout_text(text, max_width, start_y, line_height, left_x, right_x=None,
+                font_name=DEFAULT_FONT, font_size=10, reverse=False):
+    """
+    Découpe text (lignes séparées par '\\n') et positionne chaque ligne obtenue.
+
+    Les lignes sont empilées vers le haut à partir de start_y. Si right_x est fourni,
+    chaque ligne est alignée à droite sur right_x sans dépasser left_x à gauche;
+    sinon elle commence à left_x.
+
+    Args:
+        text: Texte à mettre en page
+        max_width: Largeur maximale d'une ligne en points
+        start_y: Position y de la ligne du bas en points
+        line_height: Interligne en points
+        left_x: Position x de gauche (ou limite gauche si aligné à droite) en points
+        right_x: Position x de droite pour l'alignement à droite (optionnel)
+        font_name: Nom de la police
+        font_size: Taille de la police
+        reverse: Si False, la première ligne du texte est en bas (verso);
+                 si True, la dernière ligne du texte est en bas (overlay)
+
+    Returns:
+        Liste de PositionedLine, dans l'ordre de dessin (de bas en haut)
+    """
+    sub_lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line:
+            sub_lines.extend(wrap_line(line, max_width, font_name, font_size))
+
+    if reverse:
+        sub_lines.reverse()
+
+    positioned = []
+    y = start_y
+    for line_text, width in sub_lines:
+        if right_x is None:
+            x = left_x
+        else:
+            x = right_x - width
+            if x < left_x:
+                x = left_x
+        positioned.append(PositionedLine(line_text, x, y, width))
+        y += line_height
+
+    return positioned
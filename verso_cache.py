@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Cache disque des pages verso rendues, partagé entre les exécutions.
+
+Chaque verso est stocké sous une clé (hash du nom, de l'adresse, des positions, du
+format de page, de la police et de la version du rendu) dans une base SQLite.
+Le cache est borné en taille: au-delà de max_bytes, les versos les moins récemment
+utilisés sont supprimés. Les compteurs de hits et de misses sont enregistrés dans la
+base, pour que les processus de rendu (workers > 1) y contribuent aussi.
+
+Le cache est optionnel: il est activé par la variable d'environnement VERSO_CACHE_PATH
+(chemin du fichier SQLite) ou par l'option --verso-cache de la ligne de commande.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+# Taille maximale par défaut du cache (en octets de versos stockés)
+VERSO_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Les accès concurrents (threads Flask, processus de rendu) attendent au plus ce délai
+SQLITE_TIMEOUT = 30
+
+
+class VersoCache:
+    """
+    Cache LRU persistant (SQLite) de versos sérialisés, indexés par une clé texte.
+
+    Utilisable depuis plusieurs threads (connexion protégée par un verrou) et depuis
+    plusieurs processus (chaque processus ouvre sa propre connexion; l'objet peut
+    être transmis à un processus de rendu, il s'y rouvre à la première utilisation).
+    """
+
+    def __init__(self, path, max_bytes=VERSO_CACHE_MAX_BYTES):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def __getstate__(self):
+        return {'path': self.path, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['max_bytes'])
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS versos ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS versos_last_used ON versos (last_used)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0), ('misses', 0)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, keys):
+        """
+        Cherche plusieurs versos à la fois et met à jour leur date d'utilisation.
+
+        Returns:
+            Dictionnaire {clé: données} des versos trouvés
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                found.update(connection.execute(
+                    f"SELECT key, data FROM versos WHERE key IN ({placeholders})", batch
+                ))
+            now = time.time()
+            connection.executemany(
+                "UPDATE versos SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            self._add_counters(connection, hits=len(found), misses=len(keys) - len(found))
+            connection.commit()
+        return found
+
+    def put_many(self, items):
+        """
+        Enregistre des versos (liste de tuples (clé, données)), puis évince les
+        versos les moins récemment utilisés si la taille maximale est dépassée.
+        """
+        items = list(items)
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                "INSERT OR REPLACE INTO versos (key, data, size, last_used) VALUES (?, ?, ?, ?)",
+                [(key, data, len(data), now) for key, data in items]
+            )
+            self._evict(connection)
+            connection.commit()
+
+    def _evict(self, connection):
+        total_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM versos").fetchone()[0]
+        if total_bytes <= self.max_bytes:
+            return
+        to_delete = []
+        for key, size in connection.execute("SELECT key, size FROM versos ORDER BY last_used"):
+            if total_bytes <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total_bytes -= size
+        connection.executemany("DELETE FROM versos WHERE key = ?", to_delete)
+
+    @staticmethod
+    def _add_counters(connection, hits, misses):
+        connection.executemany(
+            "UPDATE counters SET value = value + ? WHERE name = ?",
+            [(hits, 'hits'), (misses, 'misses')]
+        )
+
+    def clear(self):
+        """Supprime tous les versos et remet les compteurs à zéro."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM versos")
+            connection.execute("UPDATE counters SET value = 0")
+            connection.commit()
+
+    def stats(self):
+        """Statistiques du cache (pour le diagnostic)."""
+        with self._lock:
+            connection = self._connect()
+            entries, total_bytes = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM versos"
+            ).fetchone()
+            counters = dict(connection.execute("SELECT name, value FROM counters"))
+        return {
+            'path': self.path,
+            'entries': entries,
+            'bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': counters.get('hits', 0),
+            'misses': counters.get('misses', 0),
+        }
+
+
+def verso_cache_from_env():
+    """
+    Cache configuré par l'environnement: VERSO_CACHE_PATH (fichier SQLite) et
+    VERSO_CACHE_MAX_MB (taille maximale en Mo). Retourne None si le cache n'est pas activé.
+    """
+    path = os.environ.get('VERSO_CACHE_PATH')
+    if not path:
+        return None
+    max_mb = os.environ.get('VERSO_CACHE_MAX_MB')
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else VERSO_CACHE_MAX_BYTES
+    return VersoCache(path, max_bytes)